@@ -1,4 +1,7 @@
+from typing import NamedTuple, Optional
+
 from pydantic import NonNegativeInt
+from azulsim.bots import Bot, ISMCTSBot, Ponderer
 from azulsim.core import (
     Game,
     new_game,
@@ -7,9 +10,30 @@ from azulsim.core import (
     WallTiling,
     GameEnd,
 )
+from azulsim.search import (
+    Deadline,
+    Position,
+    Supply,
+    TimeManager,
+    play_move,
+)
 from azulsim.shell import terminal
 
 
+class _Seat(NamedTuple):
+    name: str
+    bot: Optional[Bot] = None
+    clock: Optional[TimeManager] = None
+    ponderer: Optional[Ponderer] = None
+
+
+def _ismcts_seat(name: str, board_index: int, clock: float) -> _Seat:
+    bot = ISMCTSBot(iterations=None)
+    time_manager = TimeManager(clock)
+    ponderer = Ponderer(bot.search, board_index, time_manager.budget)
+    return _Seat(name, bot, time_manager, ponderer)
+
+
 def _run_round_setup(game: RoundSetup) -> FactoryOffer | GameEnd:
     print(" ROUND SETUP ".center(40, "═"))
 
@@ -24,16 +48,29 @@ def _run_round_setup(game: RoundSetup) -> FactoryOffer | GameEnd:
 
 def _run_factory_offer(
     game: FactoryOffer,
-    board_to_player: dict[NonNegativeInt, str],
+    board_to_seat: dict[NonNegativeInt, _Seat],
 ) -> WallTiling:
     print(" FACTORY OFFER ".center(40, "═"))
 
     next_game: Game = game
     while isinstance(next_game, FactoryOffer):
         board_index: int = game.next_board_index()
-        print(f" NOW SERVING {board_to_player[board_index]} ".center(40, "-"))
+        seat = board_to_seat[board_index]
+        print(f" NOW SERVING {seat.name} ".center(40, "-"))
         print(terminal.format_board(game.state.boards[board_index]))
 
+        if seat.bot is not None:
+            next_game = _play_bot_move(next_game, seat)
+            print(terminal.format_board(next_game.state.boards[board_index]))
+            continue
+
+        # Bots search their replies to likely moves while the human thinks.
+        position = Position.from_game(next_game)
+        supply = Supply.from_state(next_game.state)
+        for other_seat in board_to_seat.values():
+            if other_seat.ponderer is not None:
+                other_seat.ponderer.start(position, supply)
+
         print(" POOL SELECTION ".center(40, "─"))
 
         print("Select a tile pool:")
@@ -84,11 +121,12 @@ def _run_factory_offer(
         ).split("\n")
         for num, line in enumerate(pattern_line_strs):
             print(f"{num}: {line}")
+        print(f"{len(pattern_line_strs)}: Floor line")
 
         selected_line_index = int(input("Selection: "))
         if (
             selected_line_index < 0
-            or len(board.pattern_lines.lines) + 1 < selected_line_index
+            or len(board.pattern_lines.lines) < selected_line_index
         ):
             print("Invalid selection.")
             continue
@@ -101,12 +139,49 @@ def _run_factory_offer(
             continue
         next_game = maybe_next_game
 
+        for other_seat in board_to_seat.values():
+            if other_seat.ponderer is not None:
+                other_seat.ponderer.stop()
+
         print(terminal.format_board(next_game.state.boards[board_index]))
 
     assert isinstance(next_game, WallTiling)
     return next_game
 
 
+def _play_bot_move(
+    game: FactoryOffer, seat: _Seat
+) -> FactoryOffer | WallTiling:
+    assert seat.bot is not None
+    clock = seat.clock
+    position = Position.from_game(game)
+    deadline = None
+    if clock is not None:
+        deadline = clock.start(position)
+
+    move = None
+    if seat.ponderer is not None and deadline is not None:
+        # A pondered reply is played at once if it was searched for as long
+        # as the bot could search now. Otherwise the bot searches for the
+        # rest of that time, continuing from the pondered tree.
+        pondered = seat.ponderer.reply(position)
+        if pondered is not None:
+            owed = deadline.remaining() - pondered.seconds
+            print(f"Pondered move found after {pondered.seconds:.2f}s.")
+            if owed <= 0.0:
+                move = pondered.move
+            else:
+                deadline = Deadline.after(owed)
+    if move is None:
+        move = seat.bot.select_move(game, deadline)
+
+    if clock is not None:
+        elapsed = clock.stop()
+        print(f"Move selected in {elapsed:.2f}s, {clock.remaining:.1f}s left.")
+
+    return play_move(game, move)
+
+
 def _run_wall_tiling(game: WallTiling) -> RoundSetup | GameEnd:
     print(" WALL TILING ".center(40, "═"))
 
@@ -128,16 +203,16 @@ def _run_game_end(game: GameEnd) -> None:
 
 def main() -> None:
     game = new_game(player_count=3, seed=42)
-    board_to_player = {
-        0: "Player1",
-        1: "Player2",
-        2: "Player3",
+    board_to_seat = {
+        0: _Seat("Player1"),
+        1: _ismcts_seat("Player2", 1, 60.0),
+        2: _ismcts_seat("Player3", 2, 60.0),
     }
 
     while not isinstance(game, GameEnd):
         match game:
             case FactoryOffer():
-                game = _run_factory_offer(game, board_to_player)
+                game = _run_factory_offer(game, board_to_seat)
             case WallTiling():
                 game = _run_wall_tiling(game)
             case RoundSetup():
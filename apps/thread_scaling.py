@@ -0,0 +1,59 @@
+"""Measures how the threaded game runner scales with the number of threads.
+
+Run with the free-threaded build of Python (python3.13t) to check whether
+the games spread over several cores; with the global interpreter lock the
+rate stays flat. The free-threading workflow of the repository runs it on
+python3.13t with --min-speedup, which fails the run unless the games are
+played faster with more threads.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from azulsim.bots import GreedyBot
+from azulsim.sim import gil_enabled, run_games
+
+
+def _greedy(seed: int) -> GreedyBot:
+    return GreedyBot(temperature=0.5, seed=seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--min-speedup",
+        type=float,
+        default=None,
+        help="exit with an error if no thread count reaches this speedup",
+    )
+    args = parser.parse_args()
+
+    print(f"GIL enabled: {gil_enabled()}")
+    seeds = list(range(args.games))
+    factories = [_greedy] * args.players
+    baseline = 0.0
+    speedup = 1.0
+    threads = 1
+    while threads <= args.max_threads:
+        start = time.perf_counter()
+        run_games(seeds, factories, threads=threads)
+        rate = args.games / (time.perf_counter() - start)
+        baseline = baseline or rate
+        speedup = max(speedup, rate / baseline)
+        print(
+            f"{threads:3d} threads: {rate:8.1f} games/s"
+            f"  ({rate / baseline:4.2f}x)"
+        )
+        threads *= 2
+
+    if args.min_speedup is not None and speedup < args.min_speedup:
+        sys.exit(f"Best speedup {speedup:.2f}x is below {args.min_speedup}x.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Simulation of many games at once with array operations."""
+
+from .features import *  # noqa: F403
+from .game import *  # noqa: F403
+from .packing import *  # noqa: F403
+from .walls import *  # noqa: F403
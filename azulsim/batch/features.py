@@ -0,0 +1,172 @@
+"""Defines a fixed-shape float32 encoding of games for learning-based
+players.
+
+Games are encoded from the point of view of the board to move: boards are
+ordered starting with the board to move, then the boards after it in turn
+order. Factory displays are encoded in the order the actions of
+azulsim.batch.game index them, so observation slot k shows the factory
+display the actions of pool k take from. Only public information is encoded;
+the tile counts of the bag can be deduced from the tiles seen so far, but
+not the order of its tiles.
+
+The features of each game are laid out as follows, where P is the number of
+players and F = P + 1 the number of factory displays:
+
+- For each board, 58 features: the 25 wall spaces, the fill fraction of the
+  5 pattern lines, the color of the 5 pattern lines one-hot, the number of
+  tiles in the floor line over 7, capped at 1 since the floor penalty does
+  not grow past seven tiles, whether it holds the starting player marker
+  and the score track over 100.
+- The color counts of the F factory displays over 4, in pool order.
+- The color counts of the table center over 4, and whether it holds the
+  starting player marker.
+- The color counts of the bag and of the discard over 20.
+"""
+
+from __future__ import annotations
+from typing import Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.core.game import State
+from azulsim.search.position import COLORS, Position, histogram
+from azulsim.search.rounds import Supply
+
+from .game import BatchGame
+
+FloatArray = npt.NDArray[np.float32]
+
+_COLOR_COUNT = len(COLORS)
+_LINE_COUNT = 5
+_BOARD_FEATURES = (
+    _LINE_COUNT * _LINE_COUNT + _LINE_COUNT + _LINE_COUNT * _COLOR_COUNT + 3
+)
+_FLOOR_SCALE = 7.0
+_SCORE_SCALE = 100.0
+_POOL_SCALE = 4.0
+_SUPPLY_SCALE = 20.0
+
+_CAPACITIES = np.arange(1, _LINE_COUNT + 1, dtype=np.float32)
+
+
+def feature_count(player_count: int) -> int:
+    """Returns the number of features of a game with the given number of
+    players."""
+    factory_count = player_count + 1
+    return (
+        player_count * _BOARD_FEATURES
+        + (factory_count + 1) * _COLOR_COUNT
+        + 1
+        + 2 * _COLOR_COUNT
+    )
+
+
+def _output(
+    game_count: int, player_count: int, out: Optional[FloatArray]
+) -> FloatArray:
+    shape = (game_count, feature_count(player_count))
+    if out is None:
+        return np.empty(shape, dtype=np.float32)
+    if out.shape != shape or out.dtype != np.float32:
+        raise ValueError(f"Output buffer must be float32 of shape {shape}.")
+    return out
+
+
+def encode_batch(
+    batch: BatchGame, out: Optional[FloatArray] = None
+) -> FloatArray:
+    """Encodes every game of a batch.
+
+    Args:
+        batch: Games to encode.
+        out: Optional buffer of shape (N, feature_count(P)) and dtype
+            float32 to write the features into.
+
+    Returns:
+        Features of each game, written into out if it was given.
+
+    Raises:
+        ValueError: If out has the wrong shape or dtype.
+    """
+    game_count, player_count = len(batch), batch.player_count
+    out = _output(game_count, player_count, out)
+
+    # Boards in turn order starting with the board to move.
+    games = np.arange(game_count)[:, None]
+    order = (batch.to_move[:, None] + np.arange(player_count)) % player_count
+    line_counts = batch.line_counts[games, order]
+    line_colors = batch.line_colors[games, order]
+
+    boards = out[:, : player_count * _BOARD_FEATURES].reshape(
+        game_count, player_count, _BOARD_FEATURES
+    )
+    offset = 0
+    for features, values in (
+        (_LINE_COUNT * _LINE_COUNT, batch.walls[games, order]),
+        (_LINE_COUNT, line_counts / _CAPACITIES),
+        (
+            _LINE_COUNT * _COLOR_COUNT,
+            line_colors[..., None] == np.arange(_COLOR_COUNT),
+        ),
+    ):
+        boards[:, :, offset : offset + features] = values.reshape(
+            game_count, player_count, features
+        )
+        offset += features
+    floor_counts = batch.floors.sum(2) + batch.markers
+    boards[:, :, offset] = (
+        np.minimum(floor_counts[games, order], _FLOOR_SCALE) / _FLOOR_SCALE
+    )
+    boards[:, :, offset + 1] = batch.markers[games, order]
+    boards[:, :, offset + 2] = batch.scores[games, order] / _SCORE_SCALE
+
+    offset = player_count * _BOARD_FEATURES
+    features = batch.factory_count * _COLOR_COUNT
+    out[:, offset : offset + features] = (
+        batch.factories.reshape(game_count, features) / _POOL_SCALE
+    )
+    offset += features
+
+    out[:, offset : offset + _COLOR_COUNT] = batch.center / _POOL_SCALE
+    out[:, offset + _COLOR_COUNT] = batch.center_marker
+    offset += _COLOR_COUNT + 1
+    out[:, offset : offset + _COLOR_COUNT] = batch.bag / _SUPPLY_SCALE
+    offset += _COLOR_COUNT
+    out[:, offset : offset + _COLOR_COUNT] = batch.discard / _SUPPLY_SCALE
+
+    return out
+
+
+def encode_states(
+    states: Sequence[State],
+    to_move: Sequence[int],
+    out: Optional[FloatArray] = None,
+) -> FloatArray:
+    """Encodes game states in the factory offer phase, with their factory
+    displays in the order of the states like BatchGame.load_game.
+
+    Args:
+        states: Game states to encode, with the same number of players.
+        to_move: Index of the board to move in each state.
+        out: Optional buffer of shape (N, feature_count(P)) and dtype
+            float32 to write the features into.
+
+    Returns:
+        Features of each state, written into out if it was given.
+
+    Raises:
+        ValueError: If the states differ in their number of players, or if
+            out has the wrong shape or dtype.
+    """
+    batch = BatchGame.from_positions(
+        [
+            Position.from_state(state, index)
+            for state, index in zip(states, to_move)
+        ],
+        [Supply.from_state(state) for state in states],
+    )
+    for index, state in enumerate(states):
+        for factory_index, factory in enumerate(state.factory_displays):
+            batch.factories[index, factory_index] = histogram(factory.tiles)
+    return encode_batch(batch, out)
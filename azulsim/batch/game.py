@@ -0,0 +1,488 @@
+"""Defines a simulator advancing many games in lockstep with NumPy.
+
+The games of a batch are held as struct-of-arrays: every part of the game
+state is an array whose first axis indexes the games, so one step applies an
+action to every game with a handful of array operations instead of a Python
+loop over game objects. The kernels follow the same rules as the compact
+positions of azulsim.search, which in turn follow the factory_offer,
+wall_tiling, round_setup and end_of_game phase functions.
+
+An action is an integer encoding a pool, a color and a line, where the pool
+index equal to the number of factory displays is the table center and the
+line index 5 is the floor line. Like in the game engine, picked factory
+displays are removed and the factory displays left keep their order, so the
+pool index of a factory display is its index among the factory displays of
+the game's state. A step plays one action in every unfinished
+game. Games whose factory offer phase ends are tiled, scored and set up for
+the next round in the same step, so every game is always waiting for the
+action of its board to move until it ends.
+"""
+
+from __future__ import annotations
+from typing import Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.core.game import FactoryOffer
+from azulsim.search.position import (
+    CENTER,
+    COLORS,
+    FLOOR_LINE,
+    BoardPosition,
+    Move,
+    Position,
+    histogram,
+)
+from azulsim.search.rounds import Supply
+
+from .walls import game_end, score_bonuses, tile_boards
+
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+_COLOR_COUNT = len(COLORS)
+_LINE_COUNT = 5
+_LINE_CHOICES = _LINE_COUNT + 1
+_FACTORY_SIZE = 4
+_TILES_PER_COLOR = 20
+
+_CAPACITIES = np.arange(1, _LINE_COUNT + 1)
+
+
+def action_count(player_count: int) -> int:
+    """Returns the number of distinct actions in a game with the given number
+    of players."""
+    return (player_count + 2) * _COLOR_COUNT * _LINE_CHOICES
+
+
+def encode_action(pool: int, color: int, line: int) -> int:
+    """Returns the action taking a color from a pool to a line."""
+    return (pool * _COLOR_COUNT + color) * _LINE_CHOICES + line
+
+
+def decode_action(action: int) -> tuple[int, int, int]:
+    """Returns the pool, color and line of an action."""
+    pool_color, line = divmod(action, _LINE_CHOICES)
+    pool, color = divmod(pool_color, _COLOR_COUNT)
+    return pool, color, line
+
+
+class BatchGame:
+    """Many games with the same number of players, advanced in lockstep.
+
+    All attributes are arrays whose first axis indexes the games. They can
+    be read freely, but should only be written through the methods of the
+    batch.
+
+    Attributes:
+        bag: Number of tiles of each color in the tile bag, shape (N, 5).
+        discard: Number of tiles of each color in the discard, shape (N, 5).
+        factories: Color counts of each factory display, shape (N, F, 5).
+            The factory displays left to pick from come first, in their
+            order of the game's state, and the others hold no tiles.
+        center: Color counts of the table center, shape (N, 5).
+        center_marker: Whether the table center holds the starting player
+            marker, shape (N,).
+        line_counts: Tile count of each pattern line, shape (N, P, 5).
+        line_colors: Color of each pattern line, or -1 if it is empty, shape
+            (N, P, 5).
+        walls: Populated wall spaces by line and column, shape (N, P, 5, 5).
+        floors: Number of tiles of each color in each floor line, shape
+            (N, P, 5).
+        markers: Whether each floor line holds the starting player marker,
+            shape (N, P).
+        scores: Value of each score track, shape (N, P). Includes the
+            end-of-game bonuses once a game has ended.
+        to_move: Index of the board to move, shape (N,).
+        done: Whether each game has ended, shape (N,).
+    """
+
+    def __init__(
+        self, game_count: int, player_count: int, seed: Optional[int] = None
+    ) -> None:
+        shape = (game_count, player_count)
+        self.player_count = player_count
+        self.bag = np.zeros((game_count, _COLOR_COUNT), dtype=np.int64)
+        self.discard = np.zeros((game_count, _COLOR_COUNT), dtype=np.int64)
+        self.factories = np.zeros(
+            (game_count, player_count + 1, _COLOR_COUNT), dtype=np.int64
+        )
+        self.center = np.zeros((game_count, _COLOR_COUNT), dtype=np.int64)
+        self.center_marker = np.zeros(game_count, dtype=np.bool_)
+        self.line_counts = np.zeros((*shape, _LINE_COUNT), dtype=np.int64)
+        self.line_colors = np.full((*shape, _LINE_COUNT), -1, dtype=np.int64)
+        self.walls = np.zeros(
+            (*shape, _LINE_COUNT, _LINE_COUNT), dtype=np.bool_
+        )
+        self.floors = np.zeros((*shape, _COLOR_COUNT), dtype=np.int64)
+        self.markers = np.zeros(shape, dtype=np.bool_)
+        self.scores = np.zeros(shape, dtype=np.int64)
+        self.to_move = np.zeros(game_count, dtype=np.int64)
+        self.done = np.zeros(game_count, dtype=np.bool_)
+        self._rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def new(
+        game_count: int, player_count: int, seed: Optional[int] = None
+    ) -> BatchGame:
+        """Returns a batch of new games, set up for their first round.
+
+        Args:
+            game_count: Number of games in the batch.
+            player_count: Number of players in every game.
+            seed: Seed of the batch's random number generator.
+        """
+        batch = BatchGame(game_count, player_count, seed)
+        batch.reset(np.ones(game_count, dtype=np.bool_))
+        return batch
+
+    @staticmethod
+    def from_positions(
+        positions: Sequence[Position],
+        supplies: Sequence[Supply],
+        seed: Optional[int] = None,
+    ) -> BatchGame:
+        """Returns a batch holding compact positions in the factory offer
+        phase.
+
+        Raises:
+            ValueError: If the positions differ in their number of boards.
+        """
+        player_counts = {len(position.boards) for position in positions}
+        if len(player_counts) != 1:
+            raise ValueError("Positions must have the same number of boards.")
+
+        batch = BatchGame(len(positions), player_counts.pop(), seed)
+        for index, (position, supply) in enumerate(zip(positions, supplies)):
+            batch.load(index, position, supply)
+
+        return batch
+
+    @staticmethod
+    def from_games(
+        games: Sequence[FactoryOffer], seed: Optional[int] = None
+    ) -> BatchGame:
+        """Returns a batch holding games of the engine in the factory offer
+        phase, with their factory displays in the same order.
+
+        Raises:
+            ValueError: If the games differ in their number of players.
+        """
+        player_counts = {len(game.state.boards.boards) for game in games}
+        if len(player_counts) != 1:
+            raise ValueError("Games must have the same number of players.")
+
+        batch = BatchGame(len(games), player_counts.pop(), seed)
+        for index, game in enumerate(games):
+            batch.load_game(index, game)
+
+        return batch
+
+    def load_game(self, index: int, game: FactoryOffer) -> None:
+        """Replaces a game of the batch with a game of the engine in the
+        factory offer phase, so that the actions of pool k take from the
+        k-th factory display of its state.
+
+        Args:
+            index: Index of the game to replace.
+            game: Game with the same number of players as the batch.
+        """
+        state = game.state
+        self.load(index, Position.from_game(game), Supply.from_state(state))
+        self.factories[index] = 0
+        for factory_index, factory in enumerate(state.factory_displays):
+            self.factories[index, factory_index] = histogram(factory.tiles)
+
+    def load(self, index: int, position: Position, supply: Supply) -> None:
+        """Replaces a game of the batch with a compact position in the factory
+        offer phase, without reallocating any array.
+
+        Args:
+            index: Index of the game to replace.
+            position: Position with the same number of boards as the batch.
+            supply: Tiles in the bag and discard of the position.
+        """
+        self.bag[index] = supply.bag
+        self.discard[index] = supply.discard
+        self.factories[index] = 0
+        for factory_index, factory in enumerate(position.factories):
+            self.factories[index, factory_index] = factory
+        self.center[index] = position.center
+        self.center_marker[index] = position.center_marker
+        self.to_move[index] = position.to_move
+        self.done[index] = False
+        for board_index, board in enumerate(position.boards):
+            for line_index, (count, color) in enumerate(board.lines):
+                self.line_counts[index, board_index, line_index] = count
+                self.line_colors[index, board_index, line_index] = color
+            bits = (board.wall >> np.arange(_LINE_COUNT**2)) & 1
+            self.walls[index, board_index] = bits.reshape(
+                _LINE_COUNT, _LINE_COUNT
+            )
+            self.floors[index, board_index] = board.floor
+            self.markers[index, board_index] = board.marker
+            self.scores[index, board_index] = board.score
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    @property
+    def factory_count(self) -> int:
+        """Returns the number of factory displays of every game."""
+        return self.player_count + 1
+
+    def reset(self, games: BoolArray) -> None:
+        """Starts new games in place of the selected games, set up for their
+        first round.
+
+        Args:
+            games: Mask of the games to restart, shape (N,).
+        """
+        indices = np.flatnonzero(games)
+        self.bag[indices] = _TILES_PER_COLOR
+        self.discard[indices] = 0
+        self.line_counts[indices] = 0
+        self.line_colors[indices] = -1
+        self.walls[indices] = False
+        self.floors[indices] = 0
+        self.markers[indices] = False
+        self.scores[indices] = 0
+        self.to_move[indices] = 0
+        self.done[indices] = False
+        self._setup_round(indices)
+
+    def legal_mask(self) -> BoolArray:
+        """Returns the mask of the legal actions of each game, shape (N, A).
+        Games which have ended have no legal actions."""
+        games = np.arange(len(self))
+        pools = self._pools()
+        lines = self.line_counts[games, self.to_move]
+        colors = self.line_colors[games, self.to_move]
+
+        # Lines which accept each color, followed by the floor line.
+        color_range = np.arange(_COLOR_COUNT)
+        accepts = (lines[:, None, :] == 0) | (
+            colors[:, None, :] == color_range[None, :, None]
+        )
+        accepts = np.concatenate(
+            (accepts, np.ones((len(self), _COLOR_COUNT, 1), dtype=np.bool_)),
+            axis=2,
+        )
+
+        mask = (pools[:, :, :, None] > 0) & accepts[:, None, :, :]
+        mask &= ~self.done[:, None, None, None]
+        return mask.reshape(len(self), -1)
+
+    def step(self, actions: IntArray) -> BoolArray:
+        """Plays an action in every unfinished game.
+
+        Games whose factory offer phase ends are tiled and either scored with
+        the end-of-game bonuses or set up for their next round.
+
+        Args:
+            actions: Action of each game, shape (N,). Ignored for games which
+                have ended.
+
+        Returns:
+            Mask of the games which ended with this step.
+
+        Raises:
+            ValueError: If an action is not legal in its game.
+        """
+        games = np.flatnonzero(~self.done)
+        actions = np.asarray(actions)[games]
+        pool_colors, lines = np.divmod(actions, _LINE_CHOICES)
+        pool_indices, colors = np.divmod(pool_colors, _COLOR_COUNT)
+        players = self.to_move[games]
+
+        counts = self._pools()[games, pool_indices, colors]
+        line_index = np.minimum(lines, _LINE_COUNT - 1)
+        to_floor = lines == FLOOR_LINE
+        fill = self.line_counts[games, players, line_index]
+        line_color = self.line_colors[games, players, line_index]
+        if not np.all(
+            (counts > 0) & (to_floor | (fill == 0) | (line_color == colors))
+        ):
+            raise ValueError("Actions must be legal in their games.")
+
+        from_center = pool_indices == self.factory_count
+        factory_games = games[~from_center]
+        factory_indices = pool_indices[~from_center]
+        leftover = self.factories[factory_games, factory_indices]
+        leftover[np.arange(len(factory_games)), colors[~from_center]] = 0
+        self.center[factory_games] += leftover
+        self.factories[factory_games, factory_indices] = 0
+        remaining = self.factories[factory_games]
+        order = np.argsort(~remaining.any(2), axis=1, kind="stable")
+        self.factories[factory_games] = np.take_along_axis(
+            remaining, order[..., None], axis=1
+        )
+
+        center_games = games[from_center]
+        self.center[center_games, colors[from_center]] = 0
+        marker = np.zeros(len(games), dtype=np.bool_)
+        marker[from_center] = self.center_marker[center_games]
+        self.center_marker[center_games] = False
+
+        placed = np.where(
+            to_floor, 0, np.minimum(_CAPACITIES[line_index] - fill, counts)
+        )
+        on_line = games[~to_floor]
+        self.line_counts[
+            on_line, players[~to_floor], line_index[~to_floor]
+        ] += placed[~to_floor]
+        self.line_colors[
+            on_line, players[~to_floor], line_index[~to_floor]
+        ] = colors[~to_floor]
+        self.floors[games, players, colors] += counts - placed
+        self.markers[games, players] |= marker
+        self.to_move[games] = (players + 1) % self.player_count
+
+        pools_empty = (
+            self.factories[games].sum(axis=(1, 2)) + self.center[games].sum(1)
+        ) == 0
+        return self._end_round(games[pools_empty])
+
+    def position(self, index: int) -> Position:
+        """Returns the compact position of a game in the factory offer
+        phase."""
+        return Position(
+            factories=tuple(
+                sorted(
+                    tuple(int(count) for count in factory)
+                    for factory in self.factories[index]
+                    if factory.any()
+                )
+            ),
+            center=tuple(int(count) for count in self.center[index]),
+            center_marker=bool(self.center_marker[index]),
+            boards=tuple(
+                self.board(index, board_index)
+                for board_index in range(self.player_count)
+            ),
+            to_move=int(self.to_move[index]),
+        )
+
+    def board(self, index: int, board_index: int) -> BoardPosition:
+        """Returns the compact board of a player in a game."""
+        wall = self.walls[index, board_index].reshape(-1).astype(np.int64)
+        return BoardPosition(
+            lines=tuple(
+                (int(count), int(color))
+                for count, color in zip(
+                    self.line_counts[index, board_index],
+                    self.line_colors[index, board_index],
+                )
+            ),
+            wall=int(np.sum(wall << np.arange(wall.size))),
+            floor=tuple(
+                int(count) for count in self.floors[index, board_index]
+            ),
+            marker=bool(self.markers[index, board_index]),
+            score=int(self.scores[index, board_index]),
+        )
+
+    def supply(self, index: int) -> Supply:
+        """Returns the tile counts of the bag and discard of a game."""
+        return Supply(
+            bag=tuple(int(count) for count in self.bag[index]),
+            discard=tuple(int(count) for count in self.discard[index]),
+        )
+
+    def move(self, index: int, action: int) -> Move:
+        """Returns the move of the compact position of a game which is
+        equivalent to an action."""
+        pool, color, line = decode_action(action)
+        if pool == self.factory_count:
+            return Move(CENTER, color, line)
+
+        factory = tuple(int(count) for count in self.factories[index, pool])
+        return Move(self.position(index).factories.index(factory), color, line)
+
+    def action(self, index: int, move: Move) -> int:
+        """Returns the action of a game which is equivalent to a move of its
+        compact position."""
+        if move.pool == CENTER:
+            return encode_action(self.factory_count, move.color, move.line)
+
+        factory = self.position(index).factories[move.pool]
+        pool = next(
+            pool
+            for pool, counts in enumerate(self.factories[index])
+            if tuple(counts) == factory
+        )
+        return encode_action(pool, move.color, move.line)
+
+    def _pools(self) -> IntArray:
+        # Color counts of every pool, the table center last.
+        return np.concatenate((self.factories, self.center[:, None]), axis=1)
+
+    def _end_round(self, games: IntArray) -> BoolArray:
+        ended = np.zeros(len(self), dtype=np.bool_)
+        if len(games) == 0:
+            return ended
+
+        # The board holding the starting player marker starts the next
+        # round. If no board took it, the board to move keeps the first turn.
+        markers = self.markers[games]
+        starting = np.where(
+            markers.any(1), markers.argmax(1), self.to_move[games]
+        )
+        self._tile(games)
+        self.to_move[games] = starting
+
+        complete_rows = game_end(self.walls[games]).any(1)
+        final = games[complete_rows]
+        self.scores[final] += score_bonuses(self.walls[final])
+        self.done[final] = True
+        ended[final] = True
+
+        self._setup_round(games[~complete_rows])
+        return ended
+
+    def _tile(self, games: IntArray) -> None:
+        result = tile_boards(
+            self.walls[games],
+            self.line_counts[games],
+            self.line_colors[games],
+            self.floors[games],
+            self.markers[games],
+        )
+        self.walls[games] = result.walls
+        self.line_counts[games] = result.line_counts
+        self.line_colors[games] = result.line_colors
+        self.floors[games] = 0
+        self.markers[games] = False
+        self.scores[games] = np.maximum(
+            self.scores[games] + result.score_deltas, 0
+        )
+        self.discard[games] += result.discard.sum(1)
+
+    def _setup_round(self, games: IntArray) -> None:
+        bag = self.bag[games]
+        discard = self.discard[games]
+        factories = np.zeros(
+            (len(games), self.factory_count, _COLOR_COUNT), dtype=np.int64
+        )
+        rows = np.arange(len(games))
+        for factory_index in range(self.factory_count):
+            for _ in range(_FACTORY_SIZE):
+                # When the bag runs out of tiles the discard is emptied into
+                # it. If both are empty the factory display is left short.
+                refill = bag.sum(1) == 0
+                bag[refill] = discard[refill]
+                discard[refill] = 0
+
+                totals = bag.sum(1)
+                picks = (self._rng.random(len(games)) * totals).astype(np.int64)
+                drawn = (np.cumsum(bag, axis=1) > picks[:, None]).argmax(1)
+                has_tile = totals > 0
+                bag[rows[has_tile], drawn[has_tile]] -= 1
+                factories[rows[has_tile], factory_index, drawn[has_tile]] += 1
+
+        self.bag[games] = bag
+        self.discard[games] = discard
+        self.factories[games] = factories
+        self.center[games] = 0
+        self.center_marker[games] = True
@@ -0,0 +1,108 @@
+"""Defines a packed fixed-size record of the games of a batch.
+
+A packed game holds every array of a BatchGame row in the smallest integer
+type which fits its values, with walls stored as bits, so a game of two
+players takes 77 bytes. Packed games are NumPy structured arrays, which can
+be stored in preallocated or memory-mapped arrays and unpacked back into a
+batch with one array assignment per field.
+"""
+
+from __future__ import annotations
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.search.position import COLORS
+
+from .game import BatchGame
+
+_COLOR_COUNT = len(COLORS)
+_LINE_COUNT = 5
+_WALL_BYTES = 4
+
+# Fields copied as they are; walls are packed into bits separately.
+_FIELDS = (
+    "bag",
+    "discard",
+    "factories",
+    "center",
+    "center_marker",
+    "to_move",
+    "done",
+    "line_counts",
+    "line_colors",
+    "floors",
+    "markers",
+    "scores",
+)
+
+
+def packed_dtype(player_count: int) -> np.dtype[Any]:
+    """Returns the structured dtype of a packed game with the given number
+    of players."""
+    boards = (player_count, _LINE_COUNT)
+    return np.dtype(
+        [
+            ("bag", np.uint8, _COLOR_COUNT),
+            ("discard", np.uint8, _COLOR_COUNT),
+            ("factories", np.uint8, (player_count + 1, _COLOR_COUNT)),
+            ("center", np.uint8, _COLOR_COUNT),
+            ("center_marker", np.bool_),
+            ("to_move", np.uint8),
+            ("done", np.bool_),
+            ("line_counts", np.uint8, boards),
+            ("line_colors", np.int8, boards),
+            ("walls", np.uint8, (player_count, _WALL_BYTES)),
+            ("floors", np.uint8, (player_count, _COLOR_COUNT)),
+            ("markers", np.bool_, player_count),
+            ("scores", np.uint16, player_count),
+        ]
+    )
+
+
+def pack_games(
+    batch: BatchGame, out: Optional[npt.NDArray[np.void]] = None
+) -> npt.NDArray[np.void]:
+    """Packs every game of a batch.
+
+    Args:
+        batch: Games to pack.
+        out: Optional array of shape (N,) and dtype
+            packed_dtype(batch.player_count) to write the packed games into.
+
+    Returns:
+        Packed games, written into out if it was given.
+
+    Raises:
+        ValueError: If out has the wrong shape or dtype.
+    """
+    dtype = packed_dtype(batch.player_count)
+    if out is None:
+        out = np.empty(len(batch), dtype=dtype)
+    elif out.shape != (len(batch),) or out.dtype != dtype:
+        raise ValueError(f"Output must have shape {(len(batch),)} and {dtype}.")
+
+    for field in _FIELDS:
+        out[field] = getattr(batch, field)
+    walls = batch.walls.reshape(len(batch), batch.player_count, -1)
+    out["walls"] = np.packbits(walls, axis=-1)
+    return out
+
+
+def unpack_games(
+    packed: npt.NDArray[np.void], seed: Optional[int] = None
+) -> BatchGame:
+    """Returns a batch holding packed games.
+
+    Args:
+        packed: Packed games of the same number of players, shape (N,).
+        seed: Seed of the batch's random number generator.
+    """
+    player_count = packed.dtype["markers"].shape[0]
+    batch = BatchGame(len(packed), player_count, seed)
+    for field in _FIELDS:
+        getattr(batch, field)[:] = packed[field]
+    bits = np.unpackbits(packed["walls"], axis=-1, count=_LINE_COUNT**2)
+    batch.walls[:] = bits.reshape(batch.walls.shape).astype(np.bool_)
+    return batch
@@ -0,0 +1,171 @@
+"""Defines the wall tiling and end of game scoring of many boards as array
+functions.
+
+The functions follow the same rules as the wall_tiling and end_of_game phase
+functions, but take the walls and pattern lines of any number of boards as
+arrays with arbitrary leading axes, so whole batches of games, archived
+boards or leaf positions of a search can be scored with a few array
+operations. Walls are boolean arrays of populated spaces, indexed by wall
+line and column.
+"""
+
+from __future__ import annotations
+from typing import NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.search.position import COLORS, wall_column
+from azulsim.search.rounds import FLOOR_PENALTIES
+
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+_COLOR_COUNT = len(COLORS)
+_LINE_COUNT = 5
+
+"""Wall column of each color in each wall line."""
+WALL_COLUMNS: IntArray = np.array(
+    [
+        [wall_column(line, color) for color in range(_COLOR_COUNT)]
+        for line in range(_LINE_COUNT)
+    ]
+)
+
+_FLOOR_PENALTIES = np.array(FLOOR_PENALTIES)
+
+_BIT_VALUES = 1 << np.arange(_LINE_COUNT)
+
+
+def _run_lengths() -> IntArray:
+    # Length of the run of populated spaces through each index of each
+    # 5-bit line mask, counting the index itself as populated.
+    lengths = np.zeros((1 << _LINE_COUNT, _LINE_COUNT), dtype=np.int64)
+    for mask in range(1 << _LINE_COUNT):
+        for index in range(_LINE_COUNT):
+            populated = mask | (1 << index)
+            start = index
+            while start > 0 and populated & (1 << (start - 1)):
+                start -= 1
+            end = index
+            while end < _LINE_COUNT - 1 and populated & (1 << (end + 1)):
+                end += 1
+            lengths[mask, index] = end - start + 1
+    return lengths
+
+
+_RUN_LENGTHS = _run_lengths()
+
+
+class TilingResult(NamedTuple):
+    """Boards after the wall tiling phase.
+
+    Attributes:
+        walls: Populated wall spaces, shape (..., 5, 5).
+        line_counts: Tile count of each pattern line, shape (..., 5).
+        line_colors: Color of each pattern line, or -1 if it is empty, shape
+            (..., 5).
+        score_deltas: Points earned by the tiled spaces plus the floor line
+            penalty, shape (...). The score track can not drop below zero,
+            so scores should be clipped at zero after adding the deltas.
+        discard: Number of tiles of each color sent to the discard, shape
+            (..., 5).
+        game_end: Whether each wall has a complete line, shape (...).
+    """
+
+    walls: BoolArray
+    line_counts: IntArray
+    line_colors: IntArray
+    score_deltas: IntArray
+    discard: IntArray
+    game_end: BoolArray
+
+
+def tile_boards(
+    walls: BoolArray,
+    line_counts: IntArray,
+    line_colors: IntArray,
+    floors: Optional[IntArray] = None,
+    markers: Optional[BoolArray] = None,
+) -> TilingResult:
+    """Moves tiles from completed pattern lines to the walls of many boards
+    and scores them. The arguments are not modified.
+
+    Args:
+        walls: Populated wall spaces, shape (..., 5, 5).
+        line_counts: Tile count of each pattern line, shape (..., 5).
+        line_colors: Color of each pattern line, or -1 if it is empty, shape
+            (..., 5).
+        floors: Number of tiles of each color in each floor line, shape
+            (..., 5). Defaults to empty floor lines.
+        markers: Whether each floor line holds the starting player marker,
+            shape (...). Defaults to no markers.
+
+    Returns:
+        Tiled boards, with emptied floor lines.
+    """
+    shape = walls.shape[:-2]
+    walls = walls.reshape(-1, _LINE_COUNT, _LINE_COUNT).copy()
+    counts = line_counts.reshape(-1, _LINE_COUNT).copy()
+    colors = line_colors.reshape(-1, _LINE_COUNT).copy()
+    boards = np.arange(len(walls))
+
+    discard = np.zeros((len(walls), _COLOR_COUNT), dtype=np.int64)
+    if floors is not None:
+        discard += floors.reshape(-1, _COLOR_COUNT)
+    floor_counts = discard.sum(1)
+    if markers is not None:
+        floor_counts += markers.reshape(-1)
+
+    # Lines are tiled top-down, so each tile is scored against the wall
+    # spaces populated by the lines above it.
+    earned = np.zeros(len(walls), dtype=np.int64)
+    for line_index in range(_LINE_COUNT):
+        count = counts[:, line_index]
+        color = colors[:, line_index]
+        complete = count == line_index + 1
+        column = WALL_COLUMNS[line_index, np.maximum(color, 0)]
+        new = complete & ~walls[boards, line_index, column]
+        walls[boards[new], line_index, column[new]] = True
+
+        horizontal = _RUN_LENGTHS[walls[:, line_index] @ _BIT_VALUES, column]
+        vertical = _RUN_LENGTHS[
+            walls[boards, :, column] @ _BIT_VALUES, line_index
+        ]
+        points = np.maximum(
+            np.where(horizontal > 1, horizontal, 0)
+            + np.where(vertical > 1, vertical, 0),
+            1,
+        )
+        earned += np.where(new, points, 0)
+
+        discard[boards[complete], color[complete]] += (
+            count[complete] - new[complete]
+        )
+        count[complete] = 0
+        color[complete] = -1
+
+    return TilingResult(
+        walls=walls.reshape(*shape, _LINE_COUNT, _LINE_COUNT),
+        line_counts=counts.reshape(*shape, _LINE_COUNT),
+        line_colors=colors.reshape(*shape, _LINE_COUNT),
+        score_deltas=(earned + _FLOOR_PENALTIES[floor_counts]).reshape(shape),
+        discard=discard.reshape(*shape, _COLOR_COUNT),
+        game_end=game_end(walls).reshape(shape),
+    )
+
+
+def game_end(walls: BoolArray) -> BoolArray:
+    """Returns whether each wall of shape (..., 5, 5) has a complete line,
+    which ends the game."""
+    return np.any(walls.all(axis=-1), axis=-1)
+
+
+def score_bonuses(walls: BoolArray) -> IntArray:
+    """Returns the end-of-game bonus points of each wall of shape
+    (..., 5, 5)."""
+    rows = walls.all(axis=-1).sum(-1)
+    columns = walls.all(axis=-2).sum(-1)
+    color_spaces = walls[..., np.arange(_LINE_COUNT)[:, None], WALL_COLUMNS]
+    colors = color_spaces.all(axis=-2).sum(-1)
+    return rows * 2 + columns * 7 + colors * 10
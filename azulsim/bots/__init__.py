@@ -0,0 +1,9 @@
+"""Automated players which select moves in the factory offer phase."""
+
+from .alphabeta import *  # noqa: F403
+from .book import *  # noqa: F403
+from .bot import *  # noqa: F403
+from .greedy import *  # noqa: F403
+from .ismcts import *  # noqa: F403
+from .policy import *  # noqa: F403
+from .ponder import *  # noqa: F403
@@ -0,0 +1,62 @@
+"""Defines a player searching the factory offer phase with alpha-beta."""
+
+from __future__ import annotations
+from typing import Any, Optional
+
+from azulsim.core.game import FactoryOffer
+from azulsim.search.alphabeta import AlphaBetaSearcher, Evaluator, SearchMode
+from azulsim.search.cache import EvaluationCache
+from azulsim.search.canonical import state_hash
+from azulsim.search.position import Move, Position
+from azulsim.search.timing import Deadline
+
+
+class AlphaBetaBot:
+    """Player selecting the best move of a depth-limited alpha-beta search.
+
+    Args:
+        depth: Maximum search depth, in moves.
+        evaluator: Static evaluator of the searched positions. Defaults to
+            the projected round-end scores.
+        mode: Extension of minimax to more than two boards.
+        cache: Optional persistent cache of search results, keyed by the
+            canonical state. It should only be shared by players with the
+            same evaluator and mode.
+    """
+
+    def __init__(
+        self,
+        depth: int = 4,
+        evaluator: Optional[Evaluator[Any]] = None,
+        mode: SearchMode = SearchMode.PARANOID,
+        cache: Optional[EvaluationCache] = None,
+    ) -> None:
+        self._depth = depth
+        self._searcher = AlphaBetaSearcher(evaluator, mode)
+        self._cache = cache
+
+    def select_move(
+        self, game: FactoryOffer, deadline: Optional[Deadline] = None
+    ) -> Move:
+        """Returns the best move of the deepest search completed before the
+        deadline, or the cached move of the game if it was searched at least
+        as deep before, or to the end of the round."""
+        position = Position.from_game(game)
+        if self._cache is None:
+            return self._searcher.search(position, self._depth, deadline).move
+
+        key = state_hash(game.state, position.to_move)
+        entry = self._cache.lookup(key)
+        # Searches stop deepening at the end of the round, which is at most
+        # as many moves away as there are tiles left in the pools.
+        depth = min(self._depth, position.tile_count())
+        if (
+            entry is not None
+            and entry.move is not None
+            and entry.depth >= depth
+        ):
+            return entry.move
+
+        result = self._searcher.search(position, self._depth, deadline)
+        self._cache.store(key, result.values, result.depth, result.move)
+        return result.move
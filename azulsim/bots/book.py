@@ -0,0 +1,37 @@
+"""Defines a player which plays the first move of a game from an opening
+book."""
+
+from __future__ import annotations
+from typing import Optional
+
+from azulsim.core.game import FactoryOffer
+from azulsim.search.book import OpeningBook
+from azulsim.search.position import Move, Position
+from azulsim.search.timing import Deadline
+
+from .bot import Bot
+
+
+class BookBot:
+    """Player selecting book moves when available and delegating every other
+    move to a fallback player.
+
+    Args:
+        book: Opening book to probe.
+        fallback: Player selecting moves which are not in the book.
+    """
+
+    def __init__(self, book: OpeningBook, fallback: Bot) -> None:
+        self._book = book
+        self._fallback = fallback
+
+    def select_move(
+        self, game: FactoryOffer, deadline: Optional[Deadline] = None
+    ) -> Move:
+        """Returns the book move of the game, or the fallback player's move if
+        the game is not in the book."""
+        move = self._book.probe(Position.from_game(game))
+        if move is not None:
+            return move
+
+        return self._fallback.select_move(game, deadline)
@@ -0,0 +1,55 @@
+"""Defines the interface shared by automated players."""
+
+from __future__ import annotations
+import random
+from typing import Callable, Optional, Protocol
+
+from azulsim.core.game import FactoryOffer
+from azulsim.search.position import Move, Position, legal_moves
+from azulsim.search.timing import Deadline
+
+
+class Bot(Protocol):
+    """An automated player."""
+
+    def select_move(
+        self, game: FactoryOffer, deadline: Optional[Deadline] = None
+    ) -> Move:
+        """Returns the move to play for the board to move in a factory offer
+        phase. The move can be played with azulsim.search.play_move.
+
+        Args:
+            game: Factory offer phase to select a move for.
+            deadline: Optional deadline by which the move must be returned.
+
+        Raises:
+            ValueError: If the board to move has no legal moves.
+        """
+        ...
+
+
+"""Returns a player given a seed, such as a bot class taking a seed as its
+first argument. Lets every game of a parallel run build its own players, so
+players are never shared between threads or processes."""
+BotFactory = Callable[[int], Bot]
+
+
+class RandomBot:
+    """A player selecting uniformly among the legal moves.
+
+    Args:
+        seed: Seed of the player's random number generator.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._rng = random.Random(seed)
+
+    def select_move(
+        self, game: FactoryOffer, deadline: Optional[Deadline] = None
+    ) -> Move:
+        """Returns a legal move selected uniformly at random."""
+        moves = legal_moves(Position.from_game(game))
+        if not moves:
+            raise ValueError("Board to move has no legal moves.")
+
+        return self._rng.choice(moves)
@@ -0,0 +1,167 @@
+"""Defines a greedy player scoring all legal moves in one vectorized pass.
+
+The player looks one move ahead. Every legal move of the board to move is
+described by a few features which are computed for all moves at once with
+NumPy, and the move with the highest weighted sum is played, or a move is
+sampled from a softmax over the sums. It is fast enough to serve as the
+rollout policy of a search and as a baseline opponent.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.core.game import FactoryOffer
+from azulsim.search.position import (
+    COLORS,
+    Move,
+    Position,
+    legal_moves,
+    wall_bit,
+    wall_column,
+)
+from azulsim.search.rounds import FLOOR_PENALTIES, score_tile
+from azulsim.search.timing import Deadline
+
+
+_LINE_COUNT = 5
+
+_FLOOR_PENALTIES = np.array(FLOOR_PENALTIES)
+
+# Capacity of each pattern line, followed by the floor line.
+_CAPACITIES = np.array([*range(1, _LINE_COUNT + 1), 0])
+
+
+class GreedyWeights(NamedTuple):
+    """Weights of the move features of a greedy player.
+
+    Attributes:
+        completion: Weight of the wall points earned by a pattern line the
+            move completes.
+        progress: Weight of the wall points of a pattern line the move adds
+            to without completing it, scaled by the fraction of the line the
+            move fills.
+        floor: Weight of the change in floor line penalty.
+        marker: Weight of taking the starting player marker, on top of its
+            floor line penalty.
+    """
+
+    completion: float = 1.0
+    progress: float = 0.4
+    floor: float = 1.0
+    marker: float = 0.0
+
+
+@lru_cache(maxsize=4096)
+def _wall_points(wall: int) -> npt.NDArray[np.float64]:
+    # Points of tiling each color in each wall line, with a row of zeros for
+    # the floor line.
+    points = np.zeros((_LINE_COUNT + 1, len(COLORS)))
+    for line_index in range(_LINE_COUNT):
+        for color in range(len(COLORS)):
+            bit = wall_bit(line_index, color)
+            if not wall & bit:
+                points[line_index, color] = score_tile(
+                    wall | bit, line_index, wall_column(line_index, color)
+                )
+
+    # Cached arrays are shared by every caller, including other threads.
+    points.flags.writeable = False
+    return points
+
+
+def move_scores(
+    position: Position,
+    moves: list[Move],
+    weights: GreedyWeights = GreedyWeights(),
+) -> npt.NDArray[np.float64]:
+    """Returns the weighted feature sum of each move for the board to move.
+
+    Args:
+        position: Position the moves were generated for.
+        moves: Legal moves of the position.
+        weights: Weights of the move features.
+    """
+    board = position.boards[position.to_move]
+    encoded = np.array(moves, dtype=np.int64).reshape(-1, 3)
+    pools, colors, lines = encoded[:, 0], encoded[:, 1], encoded[:, 2]
+
+    # The table center is last, so the center index -1 selects it.
+    pool_counts = np.array([*position.factories, position.center])
+    counts = pool_counts[pools, colors]
+
+    fill = np.array([count for count, _ in board.lines] + [0])[lines]
+    capacity = _CAPACITIES[lines]
+    placed = np.minimum(capacity - fill, counts)
+    marker = (pools == -1) & position.center_marker
+    overflow = counts - placed + marker
+
+    points = _wall_points(board.wall)[lines, colors]
+    complete = (fill + placed == capacity) & (placed > 0)
+    progress = np.divide(
+        placed,
+        capacity,
+        out=np.zeros(len(moves)),
+        where=~complete & (capacity > 0),
+    )
+
+    floor_count = board.floor_count()
+    penalty = (
+        _FLOOR_PENALTIES[floor_count + overflow] - _FLOOR_PENALTIES[floor_count]
+    )
+
+    return (
+        weights.completion * complete * points
+        + weights.progress * ~complete * progress * points
+        + weights.floor * penalty
+        + weights.marker * marker
+    )
+
+
+class GreedyBot:
+    """Player selecting the move with the best immediate feature score.
+
+    Args:
+        weights: Weights of the move features.
+        temperature: Softmax temperature of the move selection. Zero selects
+            the best move, breaking ties by move order.
+        seed: Seed of the player's random number generator.
+    """
+
+    def __init__(
+        self,
+        weights: GreedyWeights = GreedyWeights(),
+        temperature: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._weights = weights
+        self._temperature = temperature
+        self._rng = np.random.default_rng(seed)
+
+    def select_move(
+        self, game: FactoryOffer, deadline: Optional[Deadline] = None
+    ) -> Move:
+        """Returns the move selected for the board to move."""
+        return self.choose(Position.from_game(game))
+
+    def choose(self, position: Position) -> Move:
+        """Returns the move selected for the board to move in a position.
+
+        Raises:
+            ValueError: If the board to move has no legal moves.
+        """
+        moves = legal_moves(position)
+        if not moves:
+            raise ValueError("Board to move has no legal moves.")
+
+        scores = move_scores(position, moves, self._weights)
+        if self._temperature <= 0.0:
+            return moves[int(np.argmax(scores))]
+
+        logits = (scores - scores.max()) / self._temperature
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum()
+        return moves[int(self._rng.choice(len(moves), p=probabilities))]
@@ -0,0 +1,237 @@
+"""Defines an information set Monte Carlo tree search player.
+
+The order of the tiles in the bag, and with it the contents of the factory
+displays in later rounds, is hidden from the players. The player only uses the
+tile counts of the bag and discard, which any player can reconstruct from the
+tiles seen so far. Every iteration samples a determinization of the hidden
+draws while descending a single tree shared by all determinizations, whose
+nodes are keyed by the moves played. Moves which are not legal in the sampled
+determinization are skipped, and each node counts the iterations in which it
+was available to balance exploration (single-observer ISMCTS).
+
+The tree continues past the end of the round through chance nodes. The
+factory displays drawn for the next round are public as soon as they are
+drawn, so the outcomes of a chance node are keyed by the drawn color counts,
+and the moves below an outcome are keyed by the moves played on those
+displays. Determinizations which draw the same displays therefore descend
+through the same nodes, and no node mixes moves on displays which only some
+determinizations drew.
+
+The search is anytime: it can be given a deadline instead of, or in addition
+to, a number of iterations, and returns the most visited move found so far
+once the deadline expires. The trees of the most recent searches are kept, so
+searching a position again, for example after pondering it, continues its
+tree rather than starting over.
+"""
+
+from __future__ import annotations
+import math
+import random
+from typing import Optional
+
+from azulsim.core.game import FactoryOffer
+from azulsim.search.position import Move, Position, apply_move, legal_moves
+from azulsim.search.rounds import (
+    Supply,
+    final_scores,
+    game_end,
+    setup_round,
+    tile_boards,
+)
+from azulsim.search.timing import Deadline
+
+
+# Score margin at which a reward is about 0.88 of the way to a certain win.
+_REWARD_SCALE = 10.0
+
+# Number of search trees kept to be continued by later searches.
+_KEPT_TREES = 4
+
+
+_Factories = tuple[tuple[int, ...], ...]
+
+
+class _Node:
+    __slots__ = (
+        "player",
+        "visits",
+        "availability",
+        "reward",
+        "children",
+        "outcomes",
+    )
+
+    def __init__(self, player: int) -> None:
+        self.player = player
+        self.visits = 0
+        self.availability = 0
+        self.reward = 0.0
+        self.children: dict[Move, _Node] = {}
+        # Nodes of the next round below a move ending the round, keyed by
+        # the color counts of the factory displays drawn for it.
+        self.outcomes: dict[_Factories, _Node] = {}
+
+
+def _rewards(scores: tuple[int, ...]) -> tuple[float, ...]:
+    rewards: list[float] = []
+    for player, score in enumerate(scores):
+        opponents = scores[:player] + scores[player + 1 :]
+        margin = score - max(opponents, default=0)
+        rewards.append(0.5 + 0.5 * math.tanh(margin / _REWARD_SCALE))
+
+    return tuple(rewards)
+
+
+class ISMCTSBot:
+    """Information set Monte Carlo tree search player.
+
+    Args:
+        iterations: Maximum number of search iterations per move, or None to
+            search until the deadline of the move.
+        rounds: Number of round ends to simulate, including the end of the
+            current round. Rewards are based on the scores after the last
+            simulated round, or the final scores if the game ends first.
+        exploration: Exploration constant of the UCB selection.
+        seed: Seed of the player's random number generator.
+
+    Attributes:
+        nodes: Number of tree nodes below the root built by the last search,
+            including the outcomes of chance nodes.
+    """
+
+    def __init__(
+        self,
+        iterations: Optional[int] = 1000,
+        rounds: int = 2,
+        exploration: float = 0.7,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._iterations = iterations
+        self._rounds = rounds
+        self._exploration = exploration
+        self._rng = random.Random(seed)
+        self._trees: dict[tuple[Position, Supply], _Node] = {}
+        self.nodes = 0
+
+    def select_move(
+        self, game: FactoryOffer, deadline: Optional[Deadline] = None
+    ) -> Move:
+        """Returns the most visited move after searching the game."""
+        return self.search(
+            Position.from_game(game), Supply.from_state(game.state), deadline
+        )
+
+    def search(
+        self,
+        position: Position,
+        supply: Supply,
+        deadline: Optional[Deadline] = None,
+    ) -> Move:
+        """Returns the most visited move after searching a position.
+
+        The search runs until the maximum number of iterations is reached or
+        the deadline expires, whichever comes first. If the deadline expires
+        before the first iteration, the first legal move is returned. If the
+        position and supply were among the last ones searched, their tree is
+        searched further.
+
+        Raises:
+            ValueError: If the board to move has no legal moves, or if the
+                search has neither an iteration limit nor a deadline.
+        """
+        moves = legal_moves(position)
+        if not moves:
+            raise ValueError("Board to move has no legal moves.")
+        if self._iterations is None and deadline is None:
+            raise ValueError("Search must have an iteration limit or deadline.")
+
+        key = (position, supply)
+        root = self._trees.pop(key, None) or _Node(player=-1)
+        self._trees[key] = root
+        while len(self._trees) > _KEPT_TREES:
+            del self._trees[next(iter(self._trees))]
+
+        iteration = 0
+        while self._iterations is None or iteration < self._iterations:
+            if deadline is not None and deadline.expired():
+                break
+            self._iterate(root, position, supply)
+            iteration += 1
+
+        self.nodes = self._count_nodes(root) - 1
+        if not root.children:
+            return moves[0]
+        return max(root.children, key=lambda move: root.children[move].visits)
+
+    def _iterate(self, root: _Node, position: Position, supply: Supply) -> None:
+        path: list[_Node] = []
+        node = root
+        in_tree = True
+        rounds_left = self._rounds
+        while True:
+            moves = legal_moves(position)
+            if not moves:
+                boards, supply, starting = tile_boards(position, supply)
+                rounds_left -= 1
+                if game_end(boards):
+                    scores = final_scores(boards)
+                    break
+                if rounds_left == 0:
+                    scores = tuple(board.score for board in boards)
+                    break
+                position, supply = setup_round(
+                    boards, starting, supply, self._rng
+                )
+                if in_tree:
+                    outcome = node.outcomes.get(position.factories)
+                    if outcome is None:
+                        outcome = _Node(player=-1)
+                        node.outcomes[position.factories] = outcome
+                    node = outcome
+                continue
+
+            if in_tree:
+                move, node, in_tree = self._select(node, moves, position)
+                path.append(node)
+            else:
+                move = self._rng.choice(moves)
+            position = apply_move(position, move)
+
+        rewards = _rewards(scores)
+        for node in path:
+            node.visits += 1
+            node.reward += rewards[node.player]
+
+    def _count_nodes(self, node: _Node) -> int:
+        return (
+            1
+            + sum(self._count_nodes(child) for child in node.children.values())
+            + sum(self._count_nodes(child) for child in node.outcomes.values())
+        )
+
+    def _select(
+        self, node: _Node, moves: list[Move], position: Position
+    ) -> tuple[Move, _Node, bool]:
+        unexplored: list[Move] = []
+        for move in moves:
+            child = node.children.get(move)
+            if child is None:
+                unexplored.append(move)
+            else:
+                child.availability += 1
+
+        if unexplored:
+            move = self._rng.choice(unexplored)
+            child = _Node(player=position.to_move)
+            child.availability = 1
+            node.children[move] = child
+            return move, child, False
+
+        def upper_bound(move: Move) -> float:
+            child = node.children[move]
+            return child.reward / child.visits + self._exploration * math.sqrt(
+                math.log(child.availability) / child.visits
+            )
+
+        move = max(moves, key=upper_bound)
+        return move, node.children[move], True
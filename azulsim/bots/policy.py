@@ -0,0 +1,78 @@
+"""Defines a player selecting moves with a policy model."""
+
+from __future__ import annotations
+from typing import Optional
+
+import numpy as np
+
+from azulsim.batch.features import encode_batch
+from azulsim.batch.game import BatchGame
+from azulsim.core.game import FactoryOffer
+from azulsim.learn.batching import BatchEvaluator
+from azulsim.search.position import Move
+from azulsim.search.timing import Deadline
+
+
+class PolicyBot:
+    """Player selecting moves with the action logits of a policy model.
+
+    The model is evaluated through a batch evaluator, so many players in
+    concurrent games share the model calls. Games are loaded with
+    azulsim.batch.BatchGame.from_games, which keeps the factory displays in
+    the order of the game state like azulsim.env.AzulEnv, so the model sees
+    the observations of the environment. The first outputs of the model for
+    an observation are the logits of the actions, as encoded by
+    azulsim.batch.encode_action with the pool indices of the environment,
+    so a model trained in the environment plays the actions it learned.
+
+    Args:
+        evaluator: Evaluator of the policy model, taking observations encoded
+            by azulsim.batch.encode_batch.
+        temperature: Softmax temperature of the move selection. Zero selects
+            the legal action with the highest logit.
+        seed: Seed of the player's random number generator.
+    """
+
+    def __init__(
+        self,
+        evaluator: BatchEvaluator,
+        temperature: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._evaluator = evaluator
+        self._temperature = temperature
+        self._rng = np.random.default_rng(seed)
+
+    def select_move(
+        self, game: FactoryOffer, deadline: Optional[Deadline] = None
+    ) -> Move:
+        """Returns the move selected for the board to move, blocking until
+        the model has evaluated the game."""
+        batch = self._batch(game)
+        logits = self._evaluator.evaluate(encode_batch(batch)[0])
+        return self._choose(batch, logits)
+
+    async def select_move_async(self, game: FactoryOffer) -> Move:
+        """Returns the move selected for the board to move, suspending the
+        calling coroutine until the model has evaluated the game."""
+        batch = self._batch(game)
+        logits = await self._evaluator.evaluate_async(encode_batch(batch)[0])
+        return self._choose(batch, logits)
+
+    def _batch(self, game: FactoryOffer) -> BatchGame:
+        return BatchGame.from_games([game])
+
+    def _choose(self, batch: BatchGame, outputs: np.ndarray) -> Move:
+        mask = batch.legal_mask()[0]
+        if not mask.any():
+            raise ValueError("Board to move has no legal moves.")
+
+        logits = np.where(mask, outputs[: len(mask)], -np.inf)
+        if self._temperature <= 0.0:
+            return batch.move(0, int(np.argmax(logits)))
+
+        logits = (logits - logits.max()) / self._temperature
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum()
+        action = int(self._rng.choice(len(mask), p=probabilities))
+        return batch.move(0, action)
@@ -0,0 +1,185 @@
+"""Defines pondering: searching a player's reply while another player thinks.
+
+While a human player considers their move, the computer sits idle. A
+ponderer predicts the moves the thinking player is most likely to play with
+the greedy move features, and searches the reply of the next board to each
+of them in a background thread, most likely first. The search time of one
+reply is split between the predicted moves, so pondering takes as long as
+the board's own search would. Once the actual move is played the ponderer
+is stopped, and if the move was predicted, the reply found so far is
+available at once, along with the time spent finding it. A reply searched
+for less than the board's own search time should only be played after
+searching for the rest of that time; searches which keep their trees, such
+as ISMCTSBot.search, then continue from the pondered tree.
+"""
+
+from __future__ import annotations
+import threading
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from azulsim.search.position import (
+    Move,
+    Position,
+    apply_move,
+    legal_moves,
+    phase_end,
+)
+from azulsim.search.rounds import Supply
+from azulsim.search.timing import Deadline
+
+from .greedy import GreedyWeights, move_scores
+
+
+PositionSearch = Callable[[Position, Supply, Optional[Deadline]], Move]
+"""Search selecting the move of the board to move in a position, such as
+ISMCTSBot.search."""
+
+
+class PonderedReply(NamedTuple):
+    """Reply found by pondering.
+
+    Attributes:
+        move: Best reply found by the search.
+        seconds: Number of seconds the reply was searched.
+        complete: Whether the search ran to its end rather than being
+            stopped by the actual move.
+    """
+
+    move: Move
+    seconds: float
+    complete: bool
+
+
+class _StoppableDeadline(Deadline):
+    def __init__(self, seconds: float, stop: threading.Event) -> None:
+        deadline = Deadline.after(seconds)
+        super().__init__(deadline.end, deadline.start)
+        self._stop = stop
+
+    def expired(self) -> bool:
+        return self._stop.is_set() or super().expired()
+
+
+def predicted_moves(
+    position: Position,
+    count: int,
+    weights: GreedyWeights = GreedyWeights(),
+) -> list[Move]:
+    """Returns the moves the board to move is most likely to play, most
+    likely first, as ranked by the greedy move features."""
+    moves = legal_moves(position)
+    if not moves:
+        return []
+
+    scores = move_scores(position, moves, weights)
+    order = np.argsort(-scores, kind="stable")
+    return [moves[index] for index in order[:count]]
+
+
+class Ponderer:
+    """Searches the replies of a board to the predicted moves of the board
+    before it, in a background thread.
+
+    Args:
+        search: Search selecting the reply of the board.
+        board_index: Index of the board whose replies are searched.
+        budget: Function returning the number of seconds to search the
+            reply in a position, typically TimeManager.budget. It is split
+            evenly between the predicted moves.
+        candidates: Number of predicted moves to search the reply to.
+        weights: Weights of the greedy move features predicting the moves.
+    """
+
+    def __init__(
+        self,
+        search: PositionSearch,
+        board_index: int,
+        budget: Callable[[Position], float],
+        candidates: int = 4,
+        weights: GreedyWeights = GreedyWeights(),
+    ) -> None:
+        self._search = search
+        self._board_index = board_index
+        self._budget = budget
+        self._candidates = candidates
+        self._weights = weights
+        self._replies: dict[Position, PonderedReply] = {}
+        self._position: Optional[Position] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, position: Position, supply: Supply) -> None:
+        """Starts searching the replies to the predicted moves of the board
+        to move in a position. Does nothing if the ponderer is already
+        searching the position.
+
+        Args:
+            position: Position in which another board is thinking.
+            supply: Tiles in the bag and discard.
+        """
+        if self._thread is not None and position == self._position:
+            return
+
+        self.stop()
+        self._replies.clear()
+        self._position = position
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._ponder, args=(position, supply), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops searching and waits for the background thread to return.
+        Does nothing if the ponderer is not searching."""
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits for the replies to every predicted move to be searched.
+
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait until
+                every reply is searched.
+
+        Returns:
+            Boolean indicating whether every reply was searched.
+        """
+        if self._thread is None:
+            return True
+
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def reply(self, position: Position) -> Optional[PonderedReply]:
+        """Stops searching and returns the reply found for a position, whether
+        its search completed or was stopped, or None if the position was not
+        predicted or its search had not started."""
+        self.stop()
+        return self._replies.get(position)
+
+    def _ponder(self, position: Position, supply: Supply) -> None:
+        children = [
+            child
+            for move in predicted_moves(
+                position, self._candidates, self._weights
+            )
+            if not phase_end(child := apply_move(position, move))
+            and child.to_move == self._board_index
+        ]
+        for child in children:
+            if self._stop.is_set():
+                return
+
+            seconds = self._budget(child) / len(children)
+            deadline = _StoppableDeadline(seconds, self._stop)
+            move = self._search(child, supply, deadline)
+            self._replies[child] = PonderedReply(
+                move, deadline.elapsed(), not self._stop.is_set()
+            )
@@ -36,6 +36,11 @@ class FloorLine:
         """Returns the number of spaces in a floor line."""
         return 7
 
+    @staticmethod
+    def space_penalties() -> tuple[NegativeInt, ...]:
+        """Returns the penalty of each space in a floor line, in order."""
+        return (-1, -1, -2, -2, -2, -3, -3)
+
     def add(self, tiles: Sequence[Tile]) -> FloorLine:
         """Resurns the floor line with the provided tiles added."""
         tiles = self.tiles + tuple(tiles)
@@ -44,5 +49,5 @@ class FloorLine:
 
 def calculate_floor_penalty(floor_line: FloorLine) -> NegativeInt:
     """Returns the calculated penalty for the contents of a floor line."""
-    penalties = (-1, -1, -2, -2, -2, -3, -3)
+    penalties = FloorLine.space_penalties()
     return sum(islice(penalties, len(floor_line.tiles)))
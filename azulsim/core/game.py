@@ -5,7 +5,7 @@ from annotated_types import Ge, Le
 import random
 from typing import Annotated, Optional, Self, TypeAlias, Generator
 
-from pydantic import NonNegativeInt, PositiveInt
+from pydantic import ConfigDict, NonNegativeInt, PositiveInt
 from pydantic.dataclasses import dataclass
 
 from .board import Board, Boards, PatternLines
@@ -25,16 +25,28 @@ class State:
     discard: TileDiscard
 
 
-@dataclass(kw_only=True)
+# Phases which lead to a round setup carry the random number generator of
+# their game, so concurrent games never share random state.
+_PHASE_CONFIG = ConfigDict(arbitrary_types_allowed=True)
+
+
+@dataclass(kw_only=True, config=_PHASE_CONFIG)
 class RoundSetup:
     """Round setup gameplay phase."""
 
     _state: State
+    _rng: random.Random
 
     @staticmethod
-    def new(state: State) -> RoundSetup:
-        """Returns an initialized RoundSetup object with the given state."""
-        return RoundSetup(_state=state)
+    def new(state: State, rng: Optional[random.Random] = None) -> RoundSetup:
+        """Returns an initialized RoundSetup object with the given state.
+
+        Args:
+            state: State of the game.
+            rng: Random number generator drawing the tiles of the round.
+                Defaults to a generator seeded by the operating system.
+        """
+        return RoundSetup(_state=state, _rng=rng or random.Random())
 
     @property
     def state(self) -> State:
@@ -51,33 +63,42 @@ class RoundSetup:
             self._state.boards.count(),
             self._state.bag,
             self._state.discard,
-            lambda x: random.sample(x, 1)[0],
+            lambda x: self._rng.sample(x, 1)[0],
         )
         self._state.factory_displays = tile_pools_result.factory_displays
         self._state.table_center = tile_pools_result.table_center
         self._state.bag = tile_pools_result.bag
         self._state.discard = tile_pools_result.discard
 
-        return FactoryOffer.new(self._state)
+        return FactoryOffer.new(self._state, self._rng)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, config=_PHASE_CONFIG)
 class FactoryOffer:
     """Factory offer gameplay phase."""
 
     _state: State
     _next_board_index: NonNegativeInt
     _next_board_gen: Generator[NonNegativeInt, None, None]
+    _rng: random.Random
 
     @staticmethod
-    def new(state: State) -> FactoryOffer:
-        """Returns an initialized FactoryOffer object with the given state."""
+    def new(state: State, rng: Optional[random.Random] = None) -> FactoryOffer:
+        """Returns an initialized FactoryOffer object with the given state.
+
+        Args:
+            state: State of the game.
+            rng: Random number generator drawing the tiles of the next
+                rounds. Defaults to a generator seeded by the operating
+                system.
+        """
         next_board_gen = state.boards.turn_order()
         next_board_index = next(next_board_gen)
         return FactoryOffer(
             _state=state,
             _next_board_index=next_board_index,
             _next_board_gen=next_board_gen,
+            _rng=rng or random.Random(),
         )
 
     @property
@@ -143,21 +164,29 @@ class FactoryOffer:
         if factory_offer.phase_end(
             self._state.factory_displays, self._state.table_center
         ):
-            next_state = WallTiling.new(self._state)
+            next_state = WallTiling.new(self._state, self._rng)
 
         return next_state
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, config=_PHASE_CONFIG)
 class WallTiling:
     """Wall-tiling gameplay phase."""
 
     _state: State
+    _rng: random.Random
 
     @staticmethod
-    def new(state: State) -> WallTiling:
-        """Returns an initialized WallTiling object with the given state."""
-        return WallTiling(_state=state)
+    def new(state: State, rng: Optional[random.Random] = None) -> WallTiling:
+        """Returns an initialized WallTiling object with the given state.
+
+        Args:
+            state: State of the game.
+            rng: Random number generator drawing the tiles of the next
+                rounds. Defaults to a generator seeded by the operating
+                system.
+        """
+        return WallTiling(_state=state, _rng=rng or random.Random())
 
     @property
     def state(self) -> State:
@@ -188,7 +217,7 @@ class WallTiling:
         if wall_tiling.game_end((board.wall for board in self._state.boards)):
             return GameEnd.new(self._state)
 
-        return RoundSetup.new(self._state)
+        return RoundSetup.new(self._state, self._rng)
 
 
 @dataclass(kw_only=True)
@@ -248,14 +277,14 @@ def new_game(player_count: PositiveInt, seed: NonNegativeInt) -> FactoryOffer:
     Returns:
         A constructed game object.
     """
-    random.seed(seed)
+    rng = random.Random(seed)
 
     boards = Boards.with_defaulted(player_count)
     result = round_setup.reset_tile_pools(
         player_count,
         TileBag.default(),
         TileDiscard.default(),
-        selection_strategy=lambda x: random.sample(x, 1)[0],
+        selection_strategy=lambda x: rng.sample(x, 1)[0],
     )
 
     state = State(
@@ -266,4 +295,4 @@ def new_game(player_count: PositiveInt, seed: NonNegativeInt) -> FactoryOffer:
         discard=result.discard,
     )
 
-    return FactoryOffer.new(state)
+    return FactoryOffer.new(state, rng)
@@ -90,12 +90,13 @@ def place_tiles(
     at a given line index. Pattern line must be either empty or have tiles of
     the same color as the new tiles. Any tiles that cannot be placed on the
     pattern line are moved to the floor line and will count as a deduction for
-    end-of-round scoring.
+    end-of-round scoring. A line index equal to the number of pattern lines
+    places all tiles directly on the floor line.
 
     Args:
         board: Board owning the destination pattern line.
         line_index: Zero-based index of the pattern line. Must be in range
-            [0, # pattern lines]
+            [0, # pattern lines], where # pattern lines is the floor line.
         tiles: Tiles to place. All colored tiles must be the same color.
 
     Returns:
@@ -110,10 +111,15 @@ def place_tiles(
     if not all(tile == color for tile in colored_tiles):
         return None
 
-    result = board.pattern_lines.try_add(line_index, len(colored_tiles), color)
-    if result is None:
-        return None
-    pattern_lines, remainder = result
+    if line_index == PatternLines.line_count():
+        pattern_lines, remainder = board.pattern_lines, len(colored_tiles)
+    else:
+        result = board.pattern_lines.try_add(
+            line_index, len(colored_tiles), color
+        )
+        if result is None:
+            return None
+        pattern_lines, remainder = result
 
     new_tiles: list[Tile] = [color] * remainder
     if any((isinstance(tile, StartingPlayerMarker) for tile in tiles)):
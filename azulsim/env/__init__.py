@@ -0,0 +1,4 @@
+"""Environments exposing games of Azul to reinforcement learning code."""
+
+from .env import *  # noqa: F403
+from .vector import *  # noqa: F403
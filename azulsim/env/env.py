@@ -0,0 +1,361 @@
+"""Defines a single-game environment for reinforcement learning.
+
+The environment exposes games of Azul behind integer actions and NumPy
+arrays. Only the factory offer phase asks for actions; the wall tiling,
+round setup and end of game phases are advanced automatically after the
+move which ends a factory offer phase.
+
+Building the pydantic objects of the game phases validates every field of
+every object a move replaces, which would cap an environment at a couple of
+thousand steps per second. The environment instead plays the moves of a
+factory offer phase on the compact positions of azulsim.search, whose
+functions follow the rules of the game phases, keeping the factory displays
+in the order of the game state. At the end of each round, the boards are
+written back into the game state and the WallTiling, RoundSetup and GameEnd
+phases are run on it with the random number generator of the game, so a game
+reset with a seed draws the same tiles as new_game with that seed. The game
+phase object of the current position is only built when it is asked for,
+such as by a bot selecting a move. Observations and legal actions are
+computed by a one-game azulsim.batch.BatchGame loaded with the position, and
+the arrays of a timestep are written into buffers allocated once per
+environment.
+"""
+
+from __future__ import annotations
+import random
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.batch.features import encode_batch, feature_count
+from azulsim.batch.game import (
+    BatchGame,
+    action_count,
+    decode_action,
+)
+from azulsim.core.board import (
+    Board,
+    Boards,
+    EmptyPatternLine,
+    FloorLine,
+    PatternLines,
+    PopulatedPatternLine,
+)
+from azulsim.core.factory import (
+    FactoryDisplay,
+    FactoryDisplays,
+    PickableTilePool,
+    PickedTableCenter,
+    UnpickedTableCenter,
+)
+from azulsim.core.game import (
+    FactoryOffer,
+    GameEnd,
+    RoundSetup,
+    State,
+    WallTiling,
+)
+from azulsim.core.tiles import (
+    ColoredTile,
+    StartingPlayerMarker,
+    Tile,
+    TileBag,
+    TileDiscard,
+)
+from azulsim.search.position import (
+    CENTER,
+    COLORS,
+    Move,
+    Position,
+    apply_move,
+    histogram,
+    phase_end,
+)
+from azulsim.search.rounds import Supply
+
+FloatArray = npt.NDArray[np.float32]
+BoolArray = npt.NDArray[np.bool_]
+
+
+class Timestep(NamedTuple):
+    """Result of resetting or stepping an environment.
+
+    The arrays are buffers owned by the environment and are overwritten by
+    its next reset or step, so they should be copied to be kept.
+
+    Attributes:
+        observation: Features of the game from the point of view of the
+            board to move, as encoded by azulsim.batch.encode_batch.
+        rewards: Points each board earned with the step, including the
+            end-of-game bonuses. Rewards sum to the final scores over a game.
+        done: Whether the game has ended.
+        legal_mask: Mask of the legal actions of the board to move. Empty
+            once the game has ended.
+        to_move: Index of the board to move.
+    """
+
+    observation: FloatArray
+    rewards: FloatArray
+    done: bool
+    legal_mask: BoolArray
+    to_move: int
+
+
+def _tiles(counts: Sequence[int]) -> list[ColoredTile]:
+    # Tiles of a histogram of colors.
+    return [color for color, count in zip(COLORS, counts) for _ in range(count)]
+
+
+class AzulEnv:
+    """Environment playing one game at a time with integer actions.
+
+    Actions are encoded as by azulsim.batch.encode_action, where the pool
+    index of a factory display is its index among the factory displays left
+    in the game state, as in azulsim.batch.BatchGame.load_game, and the pool
+    index equal to the number of factory displays of a round is the table
+    center.
+
+    Args:
+        player_count: Number of players in every game.
+    """
+
+    def __init__(self, player_count: int = 2) -> None:
+        self.player_count = player_count
+        self._state: Optional[State] = None
+        self._factories: list[FactoryDisplay] = []
+        self._floors: list[list[Tile]] = []
+        self._position: Optional[Position] = None
+        self._supply = Supply(
+            bag=(0,) * len(COLORS), discard=(0,) * len(COLORS)
+        )
+        self._done = False
+        self._game: Optional[FactoryOffer | GameEnd] = None
+        self._rng = random.Random()
+        self._batch = BatchGame(1, player_count)
+        self._scores = np.zeros(player_count, dtype=np.int64)
+        self._observation = np.zeros(
+            (1, feature_count(player_count)), dtype=np.float32
+        )
+        self._rewards = np.zeros(player_count, dtype=np.float32)
+        self._legal_mask = np.zeros(action_count(player_count), dtype=np.bool_)
+
+    @property
+    def observation_size(self) -> int:
+        """Returns the number of features of an observation."""
+        return self._observation.shape[1]
+
+    @property
+    def action_count(self) -> int:
+        """Returns the number of distinct actions."""
+        return len(self._legal_mask)
+
+    @property
+    def game(self) -> FactoryOffer | GameEnd:
+        """Returns the game phase of the current position, awaiting the move
+        of the board to move or ended with its end-of-game bonuses scored.
+
+        The phase is built on the first call after each step, with a copy
+        of the random number generator of the environment.
+
+        Raises:
+            ValueError: If the environment has not been reset.
+        """
+        if self._game is None:
+            self._game = self._build_game()
+        return self._game
+
+    def engine_move(
+        self, action: int
+    ) -> tuple[PickableTilePool, ColoredTile, int]:
+        """Returns the arguments of FactoryOffer.factory_offer for an action
+        in the current position.
+
+        Raises:
+            ValueError: If the environment has not been reset.
+        """
+        pool_index, color, line = decode_action(action)
+        state = self.game.state
+        pool: PickableTilePool
+        if pool_index == self.player_count + 1:
+            pool = state.table_center
+        else:
+            pool = state.factory_displays.factories[pool_index]
+        return pool, COLORS[color], line
+
+    def action(self, move: Move) -> int:
+        """Returns the action equivalent to a move of the compact position of
+        the game, such as a move selected by a bot.
+
+        Raises:
+            ValueError: If the environment has not been reset.
+        """
+        self._started()
+        return self._batch.action(0, move)
+
+    def reset(self, seed: Optional[int] = None) -> Timestep:
+        """Starts a new game.
+
+        Args:
+            seed: Seed of the game's tile draws, which are the same as those
+                of new_game with the same seed. Defaults to a random seed.
+        """
+        if seed is None:
+            seed = int(np.random.default_rng().integers(1 << 31))
+        self._rng.seed(seed)
+        state = State(
+            boards=Boards.with_defaulted(self.player_count),
+            factory_displays=FactoryDisplays.new(()),
+            table_center=UnpickedTableCenter.default(),
+            bag=TileBag.default(),
+            discard=TileDiscard.default(),
+        )
+        self._done = False
+        self._scores[:] = 0
+        self._start_round(RoundSetup.new(state, self._rng).round_setup())
+        return self._timestep()
+
+    def step(self, action: int) -> Timestep:
+        """Plays an action for the board to move.
+
+        When the game ends, the timestep holds the observation of its final
+        position, with the end-of-game bonuses scored, and no legal action.
+
+        Raises:
+            ValueError: If the environment has not been reset, if the game
+                has ended, or if the action is not legal.
+        """
+        position = self._started()
+        if self._done:
+            raise ValueError("Game has ended and must be reset.")
+        if not self._legal_mask[action]:
+            raise ValueError(f"Action {action} is not legal.")
+
+        pool, color, line = decode_action(action)
+        if pool == self.player_count + 1:
+            pool = CENTER
+        else:
+            del self._factories[pool]
+        player = position.to_move
+        board = position.boards[player]
+        position = apply_move(position, Move(pool, color, line))
+
+        # The floor line keeps its tiles in the order they were placed, which
+        # decides the order in which wall tiling discards them.
+        placed = position.boards[player]
+        floor = self._floors[player]
+        floor.extend([COLORS[color]] * (sum(placed.floor) - sum(board.floor)))
+        if placed.marker and not board.marker:
+            floor.append(StartingPlayerMarker())
+
+        self._position = position
+        if phase_end(position):
+            self._end_round(position)
+        return self._timestep()
+
+    def _started(self) -> Position:
+        if self._position is None:
+            raise ValueError("Environment must be reset first.")
+        return self._position
+
+    def _start_round(self, game: FactoryOffer) -> None:
+        state = game.state
+        self._state = state
+        self._factories = list(state.factory_displays)
+        self._floors = [[] for _ in range(self.player_count)]
+        self._position = Position.from_game(game)._replace(
+            factories=tuple(
+                histogram(factory.tiles) for factory in self._factories
+            )
+        )
+        self._supply = Supply.from_state(state)
+
+    def _end_round(self, position: Position) -> None:
+        state = self._state
+        assert state is not None, "Round must have been set up."
+        state.boards = Boards.new(
+            self._boards(position), state.boards.starting_board_index
+        )
+        state.factory_displays = FactoryDisplays.new(())
+        state.table_center = PickedTableCenter.default()
+
+        match WallTiling.new(state, self._rng).tile_boards():
+            case RoundSetup() as round_setup:
+                self._start_round(round_setup.round_setup())
+            case GameEnd() as game_end:
+                state = game_end.score_bonuses()
+                self._state = state
+                self._done = True
+                self._position = Position.from_state(
+                    state, state.boards.starting_board_index
+                )
+
+    def _boards(self, position: Position) -> list[Board]:
+        # Boards of the engine, with the floor tiles in their placed order.
+        # Walls and scores only change at the end of a round, so they are
+        # kept from the boards the round started with.
+        state = self._state
+        assert state is not None, "Round must have been set up."
+        return [
+            Board.new(
+                board.score_track,
+                PatternLines.new(
+                    [
+                        PopulatedPatternLine.new(count, COLORS[color])
+                        if count > 0
+                        else EmptyPatternLine()
+                        for count, color in compact.lines
+                    ]
+                ),
+                FloorLine.new(floor),
+                board.wall,
+            )
+            for board, compact, floor in zip(
+                state.boards.boards, position.boards, self._floors
+            )
+        ]
+
+    def _timestep(self) -> Timestep:
+        position = self._started()
+        self._game = None
+        batch = self._batch
+        batch.load(0, position, self._supply)
+        batch.done[0] = self._done
+
+        scores = batch.scores[0]
+        self._rewards[:] = scores - self._scores
+        self._scores[:] = scores
+        encode_batch(batch, self._observation)
+        self._legal_mask[:] = batch.legal_mask()[0]
+        return Timestep(
+            observation=self._observation[0],
+            rewards=self._rewards,
+            done=self._done,
+            legal_mask=self._legal_mask,
+            to_move=position.to_move,
+        )
+
+    def _build_game(self) -> FactoryOffer | GameEnd:
+        position = self._started()
+        state = self._state
+        assert state is not None, "Round must have been set up."
+        if self._done:
+            return GameEnd.new(state)
+
+        center = _tiles(position.center)
+        state = State(
+            boards=Boards.new(self._boards(position), position.to_move),
+            factory_displays=FactoryDisplays.new(self._factories),
+            table_center=(
+                UnpickedTableCenter.new(center)
+                if position.center_marker
+                else PickedTableCenter.new(center)
+            ),
+            bag=state.bag,
+            discard=state.discard,
+        )
+        # The phase draws from a copy of the generator, so building it does
+        # not change the tiles the environment draws.
+        rng = random.Random()
+        rng.setstate(self._rng.getstate())
+        return FactoryOffer.new(state, rng)
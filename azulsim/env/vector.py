@@ -0,0 +1,282 @@
+"""Defines a vector of environments stepped in worker processes.
+
+The environments are split into contiguous slices, one per worker process.
+Every timestep array of the vector lives in a single multiprocessing shared
+memory block, and each worker writes the rows of its environments into it
+in place, so only the actions of a slice and a short acknowledgement cross
+the pipe of a worker on every step.
+"""
+
+from __future__ import annotations
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+import os
+from types import TracebackType
+from typing import Any, NamedTuple, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.batch.features import feature_count
+from azulsim.batch.game import action_count
+from azulsim.shm import attach_shared_memory
+
+from .env import AzulEnv
+
+IntArray = npt.NDArray[np.int64]
+FloatArray = npt.NDArray[np.float32]
+BoolArray = npt.NDArray[np.bool_]
+
+_ALIGNMENT = 64
+
+
+class VectorTimestep(NamedTuple):
+    """Timesteps of every environment of a vector.
+
+    The arrays are views of shared memory which are overwritten by the next
+    reset or step of the vector, so they should be copied to be kept. When
+    the game of an environment ends, the step reports its final rewards and
+    done flag together with the observation, legal mask and board to move
+    of the game which replaced it.
+
+    Attributes:
+        observations: Observation of each environment, shape (N, F).
+        rewards: Points each board earned with the step, shape (N, P).
+        dones: Whether the game of each environment ended, shape (N,).
+        legal_masks: Legal actions of each environment, shape (N, A).
+        to_move: Index of the board to move in each environment, shape (N,).
+    """
+
+    observations: FloatArray
+    rewards: FloatArray
+    dones: BoolArray
+    legal_masks: BoolArray
+    to_move: IntArray
+
+
+def _layout(
+    env_count: int, player_count: int
+) -> tuple[list[tuple[tuple[int, ...], np.dtype[Any], int]], int]:
+    # Shape, dtype and byte offset of each timestep array in shared memory.
+    shapes: tuple[tuple[tuple[int, ...], np.dtype[Any]], ...] = (
+        ((env_count, feature_count(player_count)), np.dtype(np.float32)),
+        ((env_count, player_count), np.dtype(np.float32)),
+        ((env_count,), np.dtype(np.bool_)),
+        ((env_count, action_count(player_count)), np.dtype(np.bool_)),
+        ((env_count,), np.dtype(np.int64)),
+    )
+    layout: list[tuple[tuple[int, ...], np.dtype[Any], int]] = []
+    offset = 0
+    for shape, dtype in shapes:
+        layout.append((shape, dtype, offset))
+        size = int(np.prod(shape)) * dtype.itemsize
+        offset += -(-size // _ALIGNMENT) * _ALIGNMENT
+    return layout, offset
+
+
+def _timestep(
+    memory: SharedMemory, env_count: int, player_count: int
+) -> VectorTimestep:
+    layout, _ = _layout(env_count, player_count)
+    return VectorTimestep(
+        *(
+            np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)
+            for shape, dtype, offset in layout
+        )
+    )
+
+
+def _new_game(
+    env: AzulEnv, rng: np.random.Generator, timestep: VectorTimestep, row: int
+) -> None:
+    result = env.reset(int(rng.integers(1 << 31)))
+    timestep.observations[row] = result.observation
+    timestep.legal_masks[row] = result.legal_mask
+    timestep.to_move[row] = result.to_move
+
+
+def _work(
+    connection: Connection,
+    memory_name: str,
+    env_count: int,
+    player_count: int,
+    start: int,
+    seeds: Sequence[int],
+) -> None:
+    memory = attach_shared_memory(memory_name)
+    timestep = _timestep(memory, env_count, player_count)
+    envs = [AzulEnv(player_count) for _ in seeds]
+    rngs = [np.random.default_rng(seed) for seed in seeds]
+
+    try:
+        while True:
+            command, actions = connection.recv()
+            if command == "close":
+                break
+            try:
+                if command == "reset":
+                    timestep.rewards[start : start + len(envs)] = 0.0
+                    timestep.dones[start : start + len(envs)] = False
+                    for index, (env, rng) in enumerate(zip(envs, rngs)):
+                        _new_game(env, rng, timestep, start + index)
+                else:
+                    for index, env in enumerate(envs):
+                        result = env.step(int(actions[index]))
+                        row = start + index
+                        # The rewards are copied before a reset clears them.
+                        timestep.rewards[row] = result.rewards
+                        timestep.dones[row] = result.done
+                        if result.done:
+                            _new_game(env, rngs[index], timestep, row)
+                        else:
+                            timestep.observations[row] = result.observation
+                            timestep.legal_masks[row] = result.legal_mask
+                            timestep.to_move[row] = result.to_move
+            except Exception as error:
+                connection.send(error)
+            else:
+                connection.send(None)
+    finally:
+        del timestep
+        memory.close()
+        connection.close()
+
+
+class VectorEnv:
+    """Vector of environments stepped together by worker processes.
+
+    Environments reset themselves when their game ends, with a seed drawn
+    from a generator owned by the environment and seeded from the seed of
+    the vector, so the games played only depend on the seed of the vector
+    and the actions taken, not on the number of workers.
+
+    Args:
+        env_count: Number of environments.
+        player_count: Number of players in every game.
+        workers: Number of worker processes. Defaults to the number of CPUs,
+            but at most one per environment.
+        seed: Seed of the games.
+        context: Multiprocessing context of the worker processes. Defaults
+            to the default context.
+    """
+
+    def __init__(
+        self,
+        env_count: int,
+        player_count: int = 2,
+        workers: Optional[int] = None,
+        seed: int = 0,
+        context: Optional[BaseContext] = None,
+    ) -> None:
+        context = context or multiprocessing.get_context()
+        workers = min(workers or os.cpu_count() or 1, env_count)
+        self.env_count = env_count
+        self.player_count = player_count
+
+        _, size = _layout(env_count, player_count)
+        self._memory = SharedMemory(create=True, size=size)
+        self._timestep = _timestep(self._memory, env_count, player_count)
+        self._closed = False
+
+        seeds = np.random.SeedSequence(seed).generate_state(env_count).tolist()
+        bounds = np.linspace(0, env_count, workers + 1).astype(int).tolist()
+        self._slices = list(zip(bounds[:-1], bounds[1:]))
+        self._connections: list[Connection] = []
+        self._processes = []
+        for start, stop in self._slices:
+            connection, worker_connection = context.Pipe()
+            process = context.Process(  # type: ignore[attr-defined]
+                target=_work,
+                args=(
+                    worker_connection,
+                    self._memory.name,
+                    env_count,
+                    player_count,
+                    start,
+                    seeds[start:stop],
+                ),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    @property
+    def observation_size(self) -> int:
+        """Returns the number of features of an observation."""
+        return self._timestep.observations.shape[1]
+
+    @property
+    def action_count(self) -> int:
+        """Returns the number of distinct actions."""
+        return self._timestep.legal_masks.shape[1]
+
+    def reset(self) -> VectorTimestep:
+        """Starts a new game in every environment."""
+        for connection in self._connections:
+            connection.send(("reset", None))
+        self._wait()
+        return self._timestep
+
+    def step(self, actions: npt.ArrayLike) -> VectorTimestep:
+        """Plays an action in every environment.
+
+        Args:
+            actions: Action of each environment, shape (N,).
+
+        Raises:
+            ValueError: If an action is not legal.
+        """
+        actions = np.asarray(actions, dtype=np.int32)
+        if actions.shape != (self.env_count,):
+            raise ValueError(f"Expected {self.env_count} actions.")
+        for connection, (start, stop) in zip(self._connections, self._slices):
+            connection.send(("step", actions[start:stop]))
+        self._wait()
+        return self._timestep
+
+    def close(self) -> None:
+        """Stops the worker processes and frees the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        for connection in self._connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process, connection in zip(self._processes, self._connections):
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+            connection.close()
+        del self._timestep
+        try:
+            self._memory.close()
+        except BufferError:
+            # Timestep arrays returned to the caller still map the block; it
+            # is unmapped once they are released.
+            pass
+        self._memory.unlink()
+
+    def _wait(self) -> None:
+        # Every worker is waited for before raising, so the next command
+        # finds all of them idle.
+        errors = [connection.recv() for connection in self._connections]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def __enter__(self) -> VectorEnv:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,4 @@
+"""Static evaluation functions for game states and compact positions."""
+
+from .heuristic import *  # noqa: F403
+from .ntuple import *  # noqa: F403
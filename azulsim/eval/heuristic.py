@@ -0,0 +1,237 @@
+"""Defines a heuristic evaluator of game states.
+
+Each board is scored by its score track plus the projected value of its
+pattern lines, floor line and wall:
+
+- Complete pattern lines are worth the points their tiles will earn on the
+  wall, including adjacency.
+- Incomplete pattern lines are worth the same points, scaled by their
+  progress and by how many unseen tiles of their color are left.
+- The floor line costs its current penalty.
+- The projected wall is worth a share of each end-of-game bonus, growing with
+  the square of the number of spaces already filled.
+
+Tiles which are neither in a tile pool nor on a board are unseen, and any
+player can count them by color. Their counts do not change during the factory
+offer phase, and a move only changes one pattern line and the floor line of
+the board which played it, so the evaluator keeps a term per line and only
+recomputes the terms a move changes.
+"""
+
+from __future__ import annotations
+from typing import NamedTuple
+
+from azulsim.core.game import State
+from azulsim.search.position import (
+    COLORS,
+    FLOOR_LINE,
+    BoardPosition,
+    Move,
+    Position,
+    apply_move,
+    wall_bit,
+    wall_column,
+)
+from azulsim.search.rounds import (
+    COLOR_MASKS,
+    COLUMN_MASKS,
+    ROW_MASKS,
+    floor_penalty,
+    score_tile,
+)
+
+
+_TILES_PER_COLOR = 20
+_LINE_COUNT = 5
+
+
+class Weights(NamedTuple):
+    """Weights of the terms of the heuristic evaluation.
+
+    Attributes:
+        score: Weight of the score track.
+        complete_line: Weight of the points earned by complete pattern lines.
+        incomplete_line: Weight of the expected points of incomplete pattern
+            lines.
+        floor: Weight of the floor line penalty.
+        row_bonus: Weight of the progress towards complete wall lines.
+        column_bonus: Weight of the progress towards complete wall columns.
+        color_bonus: Weight of the progress towards complete wall colors.
+    """
+
+    score: float = 1.0
+    complete_line: float = 1.0
+    incomplete_line: float = 0.5
+    floor: float = 1.0
+    row_bonus: float = 2.0
+    column_bonus: float = 7.0
+    color_bonus: float = 10.0
+
+
+class BoardTerms(NamedTuple):
+    """Evaluation terms of a board.
+
+    Attributes:
+        lines: Term of each pattern line.
+        floor: Term of the floor line.
+        wall: Term of the projected wall and score track.
+        total: Sum of all terms.
+    """
+
+    lines: tuple[float, ...]
+    floor: float
+    wall: float
+    total: float
+
+
+class Accumulator(NamedTuple):
+    """Incrementally updated state of a heuristic evaluation.
+
+    Attributes:
+        unseen: Number of unseen tiles of each color.
+        boards: Evaluation terms of each board.
+    """
+
+    unseen: tuple[int, ...]
+    boards: tuple[BoardTerms, ...]
+
+
+def unseen_tiles(position: Position) -> tuple[int, ...]:
+    """Returns the number of tiles of each color which are in neither a tile
+    pool nor on a board, that is in the bag or the discard."""
+    seen = [0] * len(COLORS)
+    for factory in position.factories:
+        for color, count in enumerate(factory):
+            seen[color] += count
+    for color, count in enumerate(position.center):
+        seen[color] += count
+
+    for board in position.boards:
+        for count, color in board.lines:
+            if count > 0:
+                seen[color] += count
+        for color, count in enumerate(board.floor):
+            seen[color] += count
+        for color, mask in enumerate(COLOR_MASKS):
+            seen[color] += (board.wall & mask).bit_count()
+
+    return tuple(_TILES_PER_COLOR - count for count in seen)
+
+
+def _progress(wall: int, masks: tuple[int, ...]) -> float:
+    return sum(((wall & mask).bit_count() / 5) ** 2 for mask in masks)
+
+
+class HeuristicEvaluator:
+    """Evaluates boards with weighted heuristic terms, updated incrementally
+    as moves are played.
+
+    Implements the azulsim.search.alphabeta.Evaluator protocol, so it can be
+    used as the static evaluator of an AlphaBetaSearcher.
+
+    Args:
+        weights: Weights of the evaluation terms.
+    """
+
+    def __init__(self, weights: Weights = Weights()) -> None:
+        self.weights = weights
+
+    def evaluate(self, state: State) -> tuple[float, ...]:
+        """Returns the value of each board of a game state."""
+        position = Position.from_state(state, 0)
+        return self.value(self.root(position), position)
+
+    def root(self, position: Position) -> Accumulator:
+        """Returns the accumulator of a position, computed from scratch."""
+        unseen = unseen_tiles(position)
+        return Accumulator(
+            unseen=unseen,
+            boards=tuple(
+                self.board_terms(board, unseen) for board in position.boards
+            ),
+        )
+
+    def child(
+        self, accumulator: Accumulator, position: Position, move: Move
+    ) -> Accumulator:
+        """Returns the accumulator after a move, recomputing only the terms
+        of the pattern line and floor line it changed."""
+        player = position.to_move
+        board = apply_move(position, move).boards[player]
+        terms = accumulator.boards[player]
+
+        lines = terms.lines
+        wall = terms.wall
+        if move.line != FLOOR_LINE:
+            count = board.lines[move.line][0]
+            lines = (
+                lines[: move.line]
+                + (self._line_term(board, move.line, accumulator.unseen),)
+                + lines[move.line + 1 :]
+            )
+            if count == move.line + 1:
+                wall = self._wall_term(board)
+        floor = self.weights.floor * floor_penalty(board.floor_count())
+
+        updated = BoardTerms(lines, floor, wall, sum(lines) + floor + wall)
+        boards = accumulator.boards
+        return accumulator._replace(
+            boards=boards[:player] + (updated,) + boards[player + 1 :]
+        )
+
+    def value(
+        self, accumulator: Accumulator, position: Position
+    ) -> tuple[float, ...]:
+        """Returns the value of each board."""
+        return tuple(terms.total for terms in accumulator.boards)
+
+    def board_terms(
+        self, board: BoardPosition, unseen: tuple[int, ...]
+    ) -> BoardTerms:
+        """Returns the evaluation terms of a board, computed from scratch."""
+        lines = tuple(
+            self._line_term(board, line_index, unseen)
+            for line_index in range(_LINE_COUNT)
+        )
+        floor = self.weights.floor * floor_penalty(board.floor_count())
+        wall = self._wall_term(board)
+        return BoardTerms(lines, floor, wall, sum(lines) + floor + wall)
+
+    def _line_term(
+        self, board: BoardPosition, line_index: int, unseen: tuple[int, ...]
+    ) -> float:
+        count, color = board.lines[line_index]
+        if count == 0 or board.wall & wall_bit(line_index, color):
+            # A line whose color is already on its wall line never tiles.
+            return 0.0
+
+        column = wall_column(line_index, color)
+        points = score_tile(
+            board.wall | wall_bit(line_index, color), line_index, column
+        )
+        capacity = line_index + 1
+        if count == capacity:
+            return self.weights.complete_line * points
+
+        missing = capacity - count
+        availability = unseen[color] / (unseen[color] + missing)
+        return (
+            self.weights.incomplete_line
+            * points
+            * (count / capacity)
+            * availability
+        )
+
+    def _wall_term(self, board: BoardPosition) -> float:
+        wall = board.wall
+        for line_index, (count, color) in enumerate(board.lines):
+            if count == line_index + 1:
+                wall |= wall_bit(line_index, color)
+
+        weights = self.weights
+        return (
+            weights.score * board.score
+            + weights.row_bonus * _progress(wall, ROW_MASKS)
+            + weights.column_bonus * _progress(wall, COLUMN_MASKS)
+            + weights.color_bonus * _progress(wall, COLOR_MASKS)
+        )
@@ -0,0 +1,246 @@
+"""Defines an n-tuple network evaluator of compact positions.
+
+An n-tuple network values a board with a sum of lookup tables, each indexed
+by the contents of a small group of board cells. Each board is valued as
+its score track plus one weight from each of these tables:
+
+- Wall line with pattern line: the populated spaces of a wall line together
+  with the tile count and color of the pattern line placing tiles on it.
+- Wall column: the populated spaces of a wall column.
+- Wall color: the populated spaces holding a color.
+- Floor line: the number of tiles in the floor line.
+
+That makes 16 lookups per board, and a few dozen per position. All tables
+are stored one after another in a single flat array of weights, which can be
+saved and memory-mapped by any number of processes. The weights are trained
+by azulsim.learn.TDLearner.
+
+Walls do not change during the factory offer phase, and a move only changes
+one pattern line and the floor line of the board which played it, so the
+evaluator keeps a term per lookup group and only looks up the weights a move
+changes.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Literal, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.core.game import State
+from azulsim.search.position import (
+    COLORS,
+    FLOOR_LINE,
+    BoardPosition,
+    Move,
+    Position,
+    apply_move,
+    wall_bit,
+)
+
+FloatArray = npt.NDArray[np.float32]
+
+_LINE_COUNT = 5
+_PATTERN_COUNT = 1 << _LINE_COUNT
+
+# An empty pattern line, or one of five colors with one to five tiles.
+_LINE_STATES = 1 + len(COLORS) * _LINE_COUNT
+
+# Floor lines hold at most seven tiles.
+_FLOOR_STATES = 8
+
+_COLUMN_OFFSET = _LINE_COUNT * _PATTERN_COUNT * _LINE_STATES
+_COLOR_OFFSET = _COLUMN_OFFSET + _LINE_COUNT * _PATTERN_COUNT
+_FLOOR_OFFSET = _COLOR_OFFSET + len(COLORS) * _PATTERN_COUNT
+
+"""Number of weights of an n-tuple network."""
+WEIGHT_COUNT = _FLOOR_OFFSET + _FLOOR_STATES
+
+"""Number of weights looked up to value a board."""
+TUPLE_COUNT = 2 * _LINE_COUNT + len(COLORS) + 1
+
+_COLUMN_BITS = tuple(
+    tuple(1 << (5 * line + column) for line in range(_LINE_COUNT))
+    for column in range(5)
+)
+_COLOR_BITS = tuple(
+    tuple(wall_bit(line, color) for line in range(_LINE_COUNT))
+    for color in range(len(COLORS))
+)
+
+
+def _pattern(wall: int, bits: tuple[int, ...]) -> int:
+    pattern = 0
+    for index, bit in enumerate(bits):
+        if wall & bit:
+            pattern |= 1 << index
+    return pattern
+
+
+def _line_index(board: BoardPosition, line_index: int) -> int:
+    count, color = board.lines[line_index]
+    state = 1 + color * _LINE_COUNT + count - 1 if count > 0 else 0
+    row = (board.wall >> (5 * line_index)) & (_PATTERN_COUNT - 1)
+    return (line_index * _PATTERN_COUNT + row) * _LINE_STATES + state
+
+
+def _wall_indices(wall: int) -> tuple[int, ...]:
+    return tuple(
+        _COLUMN_OFFSET + column * _PATTERN_COUNT + _pattern(wall, bits)
+        for column, bits in enumerate(_COLUMN_BITS)
+    ) + tuple(
+        _COLOR_OFFSET + color * _PATTERN_COUNT + _pattern(wall, bits)
+        for color, bits in enumerate(_COLOR_BITS)
+    )
+
+
+def _floor_index(board: BoardPosition) -> int:
+    return _FLOOR_OFFSET + min(board.floor_count(), _FLOOR_STATES - 1)
+
+
+def board_indices(board: BoardPosition) -> tuple[int, ...]:
+    """Returns the index of every weight looked up to value a board, one for
+    each of the TUPLE_COUNT lookup groups."""
+    return (
+        tuple(_line_index(board, line) for line in range(_LINE_COUNT))
+        + _wall_indices(board.wall)
+        + (_floor_index(board),)
+    )
+
+
+class NTupleNetwork:
+    """Lookup tables of an n-tuple network, stored in one flat array.
+
+    Args:
+        weights: Weights of every lookup table, shape (WEIGHT_COUNT,).
+
+    Raises:
+        ValueError: If the weights do not have the shape of an n-tuple
+            network.
+    """
+
+    def __init__(self, weights: FloatArray) -> None:
+        if weights.shape != (WEIGHT_COUNT,):
+            raise ValueError(
+                f"Expected {WEIGHT_COUNT} weights, got shape {weights.shape}."
+            )
+        self.weights = weights
+
+    @staticmethod
+    def new() -> NTupleNetwork:
+        """Returns a network whose weights are all zero, which values every
+        board by its score track."""
+        return NTupleNetwork(np.zeros(WEIGHT_COUNT, dtype=np.float32))
+
+    @staticmethod
+    def load(
+        path: str | Path,
+        mmap_mode: Optional[Literal["r", "r+", "c"]] = "r",
+    ) -> NTupleNetwork:
+        """Returns a network saved with save.
+
+        Args:
+            path: Path of the .npy file of the weights.
+            mmap_mode: Memory-map mode of the weights, as accepted by
+                numpy.load, or None to read them into memory. Weights mapped
+                read-only are shared by every process loading the file.
+        """
+        weights = np.load(path, mmap_mode=mmap_mode)
+        return NTupleNetwork(weights.view(np.ndarray))
+
+    def save(self, path: str | Path) -> None:
+        """Saves the weights of the network to an .npy file."""
+        np.save(path, self.weights)
+
+    def board_value(self, board: BoardPosition) -> float:
+        """Returns the value of a board, computed from scratch."""
+        return board.score + float(
+            self.weights[list(board_indices(board))].sum()
+        )
+
+
+class NTupleTerms(NamedTuple):
+    """Looked up weights of a board.
+
+    Attributes:
+        lines: Weight of each wall line with its pattern line.
+        floor: Weight of the floor line.
+        wall: Weights of the wall columns and colors plus the score track.
+        total: Sum of all terms.
+    """
+
+    lines: tuple[float, ...]
+    floor: float
+    wall: float
+    total: float
+
+
+class NTupleEvaluator:
+    """Evaluates boards with an n-tuple network, looking up only the weights
+    changed by each move.
+
+    Implements the azulsim.search.alphabeta.Evaluator protocol, so it can be
+    used as the static evaluator of an AlphaBetaSearcher.
+
+    Args:
+        network: Network valuing the boards.
+    """
+
+    def __init__(self, network: NTupleNetwork) -> None:
+        self.network = network
+
+    def evaluate(self, state: State) -> tuple[float, ...]:
+        """Returns the value of each board of a game state."""
+        position = Position.from_state(state, 0)
+        return self.value(self.root(position), position)
+
+    def root(self, position: Position) -> tuple[NTupleTerms, ...]:
+        """Returns the terms of every board, computed from scratch."""
+        return tuple(self.board_terms(board) for board in position.boards)
+
+    def child(
+        self,
+        accumulator: tuple[NTupleTerms, ...],
+        position: Position,
+        move: Move,
+    ) -> tuple[NTupleTerms, ...]:
+        """Returns the terms after a move, looking up only the weights of the
+        pattern line and floor line it changed."""
+        player = position.to_move
+        board = apply_move(position, move).boards[player]
+        terms = accumulator[player]
+        weights = self.network.weights
+
+        lines = terms.lines
+        if move.line != FLOOR_LINE:
+            lines = (
+                lines[: move.line]
+                + (float(weights[_line_index(board, move.line)]),)
+                + lines[move.line + 1 :]
+            )
+        floor = float(weights[_floor_index(board)])
+
+        updated = NTupleTerms(
+            lines, floor, terms.wall, sum(lines) + floor + terms.wall
+        )
+        return accumulator[:player] + (updated,) + accumulator[player + 1 :]
+
+    def value(
+        self, accumulator: tuple[NTupleTerms, ...], position: Position
+    ) -> tuple[float, ...]:
+        """Returns the value of each board."""
+        return tuple(terms.total for terms in accumulator)
+
+    def board_terms(self, board: BoardPosition) -> NTupleTerms:
+        """Returns the terms of a board, computed from scratch."""
+        weights = self.network.weights
+        lines = tuple(
+            float(weights[_line_index(board, line)])
+            for line in range(_LINE_COUNT)
+        )
+        floor = float(weights[_floor_index(board)])
+        wall = board.score + float(
+            weights[list(_wall_indices(board.wall))].sum()
+        )
+        return NTupleTerms(lines, floor, wall, sum(lines) + floor + wall)
@@ -0,0 +1,8 @@
+"""Storage and training of learning-based players."""
+
+from .batching import *  # noqa: F403
+from .model import *  # noqa: F403
+from .replay import *  # noqa: F403
+from .selfplay import *  # noqa: F403
+from .td import *  # noqa: F403
+from .trainer import *  # noqa: F403
@@ -0,0 +1,154 @@
+"""Defines an evaluator batching model inferences across games.
+
+A NumPy model evaluating one observation at a time spends most of its time
+in per-call overhead, while a batch of observations costs little more than a
+single one. When many games run in one process, their players submit
+observations to a shared evaluator instead of calling the model. A
+background thread collects requests until the batch is full or the first
+request has waited for the maximum delay, evaluates them with one call of
+the model, and resolves the future of every request with its row of the
+outputs. Players waiting for a result either block on the future from their
+own thread or await it from a coroutine.
+"""
+
+from __future__ import annotations
+import asyncio
+from concurrent.futures import Future
+import queue
+import threading
+import time
+from types import TracebackType
+from typing import Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float32]
+
+"""Model mapping observations of shape (B, F) to outputs of shape (B, K)."""
+BatchModel = Callable[[FloatArray], FloatArray]
+
+
+class BatchEvaluator:
+    """Evaluator batching the observations submitted by many games.
+
+    Args:
+        model: Model evaluating a batch of observations.
+        observation_size: Number of features of an observation.
+        max_batch: Maximum number of observations evaluated together.
+        max_wait: Maximum delay in seconds between the first request of a
+            batch and its evaluation.
+    """
+
+    def __init__(
+        self,
+        model: BatchModel,
+        observation_size: int,
+        max_batch: int = 64,
+        max_wait: float = 0.0005,
+    ) -> None:
+        self._model = model
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._inputs = np.empty((max_batch, observation_size), np.float32)
+        self._requests: queue.SimpleQueue[
+            Optional[tuple[FloatArray, Future[FloatArray]]]
+        ] = queue.SimpleQueue()
+        self._batches = 0
+        self._evaluations = 0
+        # Guards the closed flag, so no request is queued after the request
+        # stopping the background thread.
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Returns the mean number of observations per model call."""
+        return self._evaluations / max(self._batches, 1)
+
+    def submit(self, observation: FloatArray) -> Future[FloatArray]:
+        """Requests the evaluation of an observation.
+
+        Returns:
+            Future resolved with the outputs of the model for the
+            observation, or with the exception the model raised.
+
+        Raises:
+            ValueError: If the evaluator is closed.
+        """
+        future: Future[FloatArray] = Future()
+        with self._lock:
+            if self._closed:
+                raise ValueError("Evaluator is closed.")
+            self._requests.put((observation, future))
+        return future
+
+    def evaluate(self, observation: FloatArray) -> FloatArray:
+        """Returns the outputs of the model for an observation, blocking
+        until its batch is evaluated."""
+        return self.submit(observation).result()
+
+    async def evaluate_async(self, observation: FloatArray) -> FloatArray:
+        """Returns the outputs of the model for an observation, suspending
+        the calling coroutine until its batch is evaluated."""
+        return await asyncio.wrap_future(self.submit(observation))
+
+    def close(self) -> None:
+        """Evaluates the pending requests and stops the background thread.
+        Requests submitted after the evaluator starts closing raise."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._requests.put(None)
+        self._thread.join()
+
+    def _serve(self) -> None:
+        closing = False
+        while not closing:
+            request = self._requests.get()
+            if request is None:
+                return
+            batch = [request]
+            deadline = time.perf_counter() + self._max_wait
+            while len(batch) < self._max_batch:
+                try:
+                    request = self._requests.get(
+                        timeout=max(deadline - time.perf_counter(), 0.0)
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+            self._run(batch)
+
+    def _run(self, batch: list[tuple[FloatArray, Future[FloatArray]]]) -> None:
+        inputs = self._inputs[: len(batch)]
+        for row, (observation, _) in enumerate(batch):
+            inputs[row] = observation
+        try:
+            outputs = self._model(inputs)
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        self._batches += 1
+        self._evaluations += len(batch)
+        # The model may reuse its output buffer, so each row is copied.
+        for row, (_, future) in enumerate(batch):
+            future.set_result(np.array(outputs[row]))
+
+    def __enter__(self) -> BatchEvaluator:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,152 @@
+"""Defines a small policy and value network written with NumPy.
+
+The network maps the observations of azulsim.batch.encode_batch through one
+hidden layer of rectified linear units to two heads: the logits of every
+action, as encoded by azulsim.batch.encode_action, and a value for every
+board, ordered like the boards of the observation starting with the board
+to move. Forward and backward passes are a few matrix products over a whole
+batch, so the network trains and plays on a CPU without a deep learning
+framework.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.batch.features import feature_count
+from azulsim.batch.game import action_count
+
+FloatArray = npt.NDArray[np.floating[Any]]
+Parameters = dict[str, FloatArray]
+
+
+class ModelOutputs(NamedTuple):
+    """Outputs of a forward pass.
+
+    Attributes:
+        logits: Logit of every action, shape (B, A).
+        values: Value of every board, starting with the board to move,
+            shape (B, P).
+        hidden: Activations of the hidden layer, shape (B, H), kept for the
+            backward pass.
+    """
+
+    logits: FloatArray
+    values: FloatArray
+    hidden: FloatArray
+
+
+class PolicyValueModel:
+    """Policy and value network with one hidden layer.
+
+    Calling the model returns the logits followed by the values, so it can
+    be used as the model of an azulsim.learn.BatchEvaluator and played by an
+    azulsim.bots.PolicyBot.
+
+    Args:
+        parameters: Weights and biases of the hidden layer ("hidden_w",
+            "hidden_b"), the policy head ("policy_w", "policy_b") and the
+            value head ("value_w", "value_b").
+    """
+
+    def __init__(self, parameters: Parameters) -> None:
+        self.parameters = parameters
+
+    @staticmethod
+    def new(
+        player_count: int, hidden: int = 128, seed: Optional[int] = None
+    ) -> PolicyValueModel:
+        """Returns a network with randomly initialized weights.
+
+        Args:
+            player_count: Number of players of the games it plays.
+            hidden: Number of hidden units.
+            seed: Seed of the weight initialization.
+        """
+        rng = np.random.default_rng(seed)
+        inputs = feature_count(player_count)
+
+        def weights(rows: int, columns: int, scale: float) -> FloatArray:
+            return (rng.standard_normal((rows, columns)) * scale).astype(
+                np.float32
+            )
+
+        return PolicyValueModel(
+            {
+                "hidden_w": weights(inputs, hidden, np.sqrt(2.0 / inputs)),
+                "hidden_b": np.zeros(hidden, dtype=np.float32),
+                "policy_w": weights(hidden, action_count(player_count), 0.01),
+                "policy_b": np.zeros(
+                    action_count(player_count), dtype=np.float32
+                ),
+                "value_w": weights(hidden, player_count, 0.01),
+                "value_b": np.zeros(player_count, dtype=np.float32),
+            }
+        )
+
+    @staticmethod
+    def load(path: str | Path) -> PolicyValueModel:
+        """Returns a network saved with save."""
+        with np.load(path) as arrays:
+            return PolicyValueModel(dict(arrays))
+
+    def save(self, path: str | Path) -> None:
+        """Saves the parameters of the network to an .npz file."""
+        np.savez(path, **self.parameters)  # type: ignore[arg-type]
+
+    @property
+    def player_count(self) -> int:
+        """Returns the number of players of the games the network plays."""
+        return len(self.parameters["value_b"])
+
+    def forward(self, observations: FloatArray) -> ModelOutputs:
+        """Evaluates a batch of observations of shape (B, F)."""
+        parameters = self.parameters
+        hidden = observations @ parameters["hidden_w"]
+        hidden += parameters["hidden_b"]
+        np.maximum(hidden, 0.0, out=hidden)
+        logits = hidden @ parameters["policy_w"] + parameters["policy_b"]
+        values = hidden @ parameters["value_w"] + parameters["value_b"]
+        return ModelOutputs(
+            logits.astype(observations.dtype, copy=False),
+            values.astype(observations.dtype, copy=False),
+            hidden,
+        )
+
+    def backward(
+        self,
+        observations: FloatArray,
+        outputs: ModelOutputs,
+        logit_gradients: FloatArray,
+        value_gradients: FloatArray,
+    ) -> Parameters:
+        """Returns the gradients of a loss with respect to every parameter.
+
+        Args:
+            observations: Observations of the forward pass, shape (B, F).
+            outputs: Outputs of the forward pass.
+            logit_gradients: Gradients of the loss with respect to the
+                logits, shape (B, A).
+            value_gradients: Gradients of the loss with respect to the
+                values, shape (B, P).
+        """
+        parameters = self.parameters
+        hidden = outputs.hidden
+        hidden_gradients = logit_gradients @ parameters["policy_w"].T
+        hidden_gradients += value_gradients @ parameters["value_w"].T
+        hidden_gradients *= hidden > 0.0
+        return {
+            "hidden_w": observations.T @ hidden_gradients,
+            "hidden_b": hidden_gradients.sum(0),
+            "policy_w": hidden.T @ logit_gradients,
+            "policy_b": logit_gradients.sum(0),
+            "value_w": hidden.T @ value_gradients,
+            "value_b": value_gradients.sum(0),
+        }
+
+    def __call__(self, observations: FloatArray) -> FloatArray:
+        logits, values, _ = self.forward(observations)
+        return np.concatenate((logits, values), axis=1)
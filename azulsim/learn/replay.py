@@ -0,0 +1,283 @@
+"""Defines a replay buffer of fixed-size transition records.
+
+Every transition is one record of a NumPy structured array: the packed game
+the action was taken in, the action, the legal actions as bits, the rewards
+the step earned and the outcome of the game. Records are written into a
+preallocated ring, which can be a memory-mapped .npy file so that buffers
+larger than memory are paged in by the operating system and survive the
+process. Priorities for prioritized sampling are kept in a sum tree stored
+as a flat array, so updating and sampling a batch take a few array
+operations per tree level.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.batch.game import action_count
+from azulsim.batch.packing import packed_dtype
+
+IntArray = npt.NDArray[np.int64]
+FloatArray = npt.NDArray[np.float32]
+BoolArray = npt.NDArray[np.bool_]
+PackedArray = npt.NDArray[np.void]
+
+
+def record_dtype(player_count: int) -> np.dtype[Any]:
+    """Returns the structured dtype of a transition record with the given
+    number of players."""
+    mask_bytes = -(-action_count(player_count) // 8)
+    return np.dtype(
+        [
+            ("state", packed_dtype(player_count)),
+            ("action", np.uint16),
+            ("legal_mask", np.uint8, mask_bytes),
+            ("rewards", np.float32, player_count),
+            ("outcome", np.float32, player_count),
+            ("priority", np.float32),
+            # Number of the append which wrote the record, starting at one,
+            # so the ring position can be recovered from a stored buffer.
+            ("sequence", np.uint64),
+        ]
+    )
+
+
+class Transitions(NamedTuple):
+    """Gathered transitions.
+
+    Attributes:
+        states: Packed games the actions were taken in, shape (B,). Can be
+            unpacked with azulsim.batch.unpack_games.
+        actions: Action taken in each game, shape (B,).
+        legal_masks: Legal actions of each game, shape (B, A).
+        rewards: Points each board earned with the action, shape (B, P).
+        outcomes: Outcome of each game, such as its final scores, shape
+            (B, P).
+    """
+
+    states: PackedArray
+    actions: IntArray
+    legal_masks: BoolArray
+    rewards: FloatArray
+    outcomes: FloatArray
+
+
+class ReplayBuffer:
+    """Ring buffer of transitions, overwriting the oldest transitions once
+    it is full.
+
+    Args:
+        capacity: Maximum number of transitions.
+        player_count: Number of players in the games of the transitions.
+        path: Optional .npy file to memory-map the records to. An existing
+            file with the same capacity and number of players is reopened
+            with its transitions.
+
+    Raises:
+        ValueError: If an existing file holds records of another capacity or
+            number of players.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        player_count: int = 2,
+        path: Optional[str | Path] = None,
+    ) -> None:
+        dtype = record_dtype(player_count)
+        self.player_count = player_count
+        self._records: PackedArray
+        if path is None:
+            self._records = np.zeros(capacity, dtype=dtype)
+        elif Path(path).exists():
+            self._records = np.load(path, mmap_mode="r+")
+            if self._records.shape != (capacity,) or (
+                self._records.dtype != dtype
+            ):
+                raise ValueError(
+                    f"File must hold {capacity} records of {dtype}."
+                )
+        else:
+            self._records = np.lib.format.open_memmap(
+                path, mode="w+", dtype=dtype, shape=(capacity,)
+            )
+
+        sequences = self._records["sequence"]
+        self._size = int(np.count_nonzero(sequences))
+        self._appended = int(sequences.max(initial=0))
+        self._action_count = action_count(player_count)
+
+        leaves = 1
+        while leaves < capacity:
+            leaves *= 2
+        self._leaves = leaves
+        self._tree = np.zeros(2 * leaves, dtype=np.float64)
+        self._set_priorities(
+            np.arange(capacity), self._records["priority"].astype(np.float64)
+        )
+        self._max_priority = max(
+            float(self._records["priority"].max(initial=0.0)), 1.0
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Returns the maximum number of transitions."""
+        return len(self._records)
+
+    def append(
+        self,
+        states: PackedArray,
+        actions: npt.ArrayLike,
+        legal_masks: BoolArray,
+        rewards: npt.ArrayLike,
+        outcomes: Optional[npt.ArrayLike] = None,
+        priorities: Optional[npt.ArrayLike] = None,
+    ) -> IntArray:
+        """Appends a batch of transitions.
+
+        Args:
+            states: Packed games the actions were taken in, shape (B,).
+            actions: Action taken in each game, shape (B,).
+            legal_masks: Legal actions of each game, shape (B, A).
+            rewards: Points each board earned with the action, shape (B, P).
+            outcomes: Outcome of each game, shape (B, P). Defaults to zeros,
+                to be set with set_outcomes once the games have ended.
+            priorities: Sampling priority of each transition, shape (B,).
+                Defaults to the highest priority seen so far.
+
+        Returns:
+            Indices of the records written.
+        """
+        count = len(states)
+        sequences = self._appended + 1 + np.arange(count, dtype=np.uint64)
+        indices = (sequences - 1).astype(np.int64) % self.capacity
+        if priorities is None:
+            priorities = np.full(count, self._max_priority)
+        priorities = np.asarray(priorities, dtype=np.float64)
+
+        records = self._records
+        records["state"][indices] = states
+        records["action"][indices] = actions
+        records["legal_mask"][indices] = np.packbits(legal_masks, axis=1)
+        records["rewards"][indices] = rewards
+        records["outcome"][indices] = 0.0 if outcomes is None else outcomes
+        records["priority"][indices] = priorities
+        records["sequence"][indices] = sequences
+        self._set_priorities(indices, priorities)
+
+        self._appended += count
+        self._size = min(self._size + count, self.capacity)
+        return indices
+
+    def set_outcomes(
+        self, indices: npt.ArrayLike, outcomes: npt.ArrayLike
+    ) -> None:
+        """Sets the outcome of transitions, such as the final scores of their
+        games.
+
+        Args:
+            indices: Indices of the records, shape (B,).
+            outcomes: Outcome of each transition, shape (B, P).
+        """
+        self._records["outcome"][np.asarray(indices, dtype=np.int64)] = outcomes
+
+    def update_priorities(
+        self, indices: npt.ArrayLike, priorities: npt.ArrayLike
+    ) -> None:
+        """Sets the sampling priority of transitions.
+
+        Args:
+            indices: Indices of the records, shape (B,).
+            priorities: Non-negative priority of each record, shape (B,).
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        priorities = np.asarray(priorities, dtype=np.float64)
+        self._records["priority"][indices] = priorities
+        self._set_priorities(indices, priorities)
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+
+    def sample(self, count: int, rng: np.random.Generator) -> IntArray:
+        """Returns the indices of transitions sampled uniformly with
+        replacement.
+
+        Raises:
+            ValueError: If the buffer is empty.
+        """
+        if self._size == 0:
+            raise ValueError("Can not sample from an empty buffer.")
+        return rng.integers(self._size, size=count)
+
+    def sample_prioritized(
+        self, count: int, rng: np.random.Generator
+    ) -> tuple[IntArray, FloatArray]:
+        """Samples transitions with replacement, with probabilities
+        proportional to their priorities.
+
+        Returns:
+            Indices of the sampled transitions and their sampling
+            probabilities, for importance sampling weights. Both are empty
+            if the count is zero.
+
+        Raises:
+            ValueError: If the buffer is empty or every priority is zero.
+        """
+        tree = self._tree
+        total = tree[1]
+        if self._size == 0:
+            raise ValueError("Can not sample from an empty buffer.")
+        if total <= 0.0:
+            raise ValueError("Can not sample without positive priorities.")
+        if count == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        targets = rng.random(count) * total
+        nodes = np.ones(count, dtype=np.int64)
+        while nodes[0] < self._leaves:
+            left = tree[2 * nodes]
+            right = targets >= left
+            targets -= np.where(right, left, 0.0)
+            nodes = 2 * nodes + right
+        # Rounding can only lead past the last transition with a priority.
+        indices = np.minimum(nodes - self._leaves, self._size - 1)
+        probabilities = tree[indices + self._leaves] / total
+        return indices, probabilities.astype(np.float32)
+
+    def gather(self, indices: npt.ArrayLike) -> Transitions:
+        """Returns the transitions stored at indices."""
+        records = self._records[np.asarray(indices, dtype=np.int64)]
+        legal_masks = np.unpackbits(
+            records["legal_mask"], axis=1, count=self._action_count
+        ).astype(np.bool_)
+        return Transitions(
+            states=records["state"],
+            actions=records["action"].astype(np.int64),
+            legal_masks=legal_masks,
+            rewards=records["rewards"],
+            outcomes=records["outcome"],
+        )
+
+    def flush(self) -> None:
+        """Writes the records of a memory-mapped buffer to its file."""
+        if isinstance(self._records, np.memmap):
+            self._records.flush()
+
+    def _set_priorities(
+        self, indices: IntArray, priorities: npt.NDArray[np.float64]
+    ) -> None:
+        if len(indices) == 0:
+            return
+        tree = self._tree
+        nodes = indices + self._leaves
+        tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            tree[nodes] = tree[2 * nodes] + tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
@@ -0,0 +1,220 @@
+"""Defines a parallel generator of self-play training data.
+
+Games are split into shards of a fixed number of games, and the shards are
+played by a pool of worker processes. Each worker writes every shard it
+plays to its own compressed .npz file and only reports a short summary back,
+so the memory of the generator stays flat however many games are played.
+Finished shards are listed in a JSON lines manifest as soon as they are
+written, so the shards of an interrupted run can be used, and running the
+generator again with the same arguments only plays the missing shards. A
+manifest line torn by an interruption is ignored, and cut before the
+manifest is appended to again.
+
+A shard file holds one row per move with the following arrays, where P is
+the number of players:
+
+- observations: Encoded game before the move, as by azulsim.env.AzulEnv.
+- legal_masks: Legal actions of the board to move.
+- policies: Policy target over the actions, one-hot on the action played.
+- to_move: Index of the board to move.
+- scores: Final scores of the move's game, shape (M, P).
+- games: Index of the move's game within the run.
+"""
+
+from __future__ import annotations
+import json
+import multiprocessing
+from multiprocessing.context import BaseContext
+import os
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from azulsim.bots.bot import BotFactory
+from azulsim.core.game import FactoryOffer
+from azulsim.env.env import AzulEnv
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+class ShardInfo(NamedTuple):
+    """Summary of a finished shard.
+
+    Attributes:
+        name: File name of the shard within the output directory.
+        first_game: Index of the shard's first game within the run.
+        game_count: Number of games in the shard.
+        move_count: Number of moves in the shard.
+    """
+
+    name: str
+    first_game: int
+    game_count: int
+    move_count: int
+
+
+class _ShardTask(NamedTuple):
+    directory: str
+    first_game: int
+    game_count: int
+    player_count: int
+    seed: int
+    bot_factory: BotFactory
+
+
+def _seed(seed: int, game: int, seat: int) -> int:
+    # Seat -1 seeds the tile draws of the game.
+    sequence = np.random.SeedSequence([seed, game, seat + 1])
+    return int(sequence.generate_state(1)[0] >> 1)
+
+
+def _play_shard(task: _ShardTask) -> ShardInfo:
+    env = AzulEnv(task.player_count)
+    observations: list[np.ndarray] = []
+    legal_masks: list[np.ndarray] = []
+    actions: list[int] = []
+    to_move: list[int] = []
+    scores: list[np.ndarray] = []
+    games: list[int] = []
+
+    for game_index in range(task.first_game, task.first_game + task.game_count):
+        bots = [
+            task.bot_factory(_seed(task.seed, game_index, seat))
+            for seat in range(task.player_count)
+        ]
+        timestep = env.reset(_seed(task.seed, game_index, -1))
+        totals = timestep.rewards.astype(np.int64)
+        first_move = len(actions)
+        while not timestep.done:
+            game = env.game
+            assert isinstance(game, FactoryOffer), "Game must await a move."
+            move = bots[timestep.to_move].select_move(game)
+            action = env.action(move)
+            observations.append(timestep.observation.copy())
+            legal_masks.append(timestep.legal_mask.copy())
+            actions.append(action)
+            to_move.append(timestep.to_move)
+            timestep = env.step(action)
+            totals += timestep.rewards.astype(np.int64)
+        scores.extend([totals] * (len(actions) - first_move))
+        games.extend([game_index] * (len(actions) - first_move))
+
+    move_count = len(actions)
+    policies = np.zeros((move_count, env.action_count), dtype=np.float32)
+    policies[np.arange(move_count), actions] = 1.0
+    name = f"shard-{task.first_game:08d}.npz"
+    path = Path(task.directory) / name
+    temporary = path.with_suffix(".tmp.npz")
+    np.savez_compressed(
+        temporary,
+        observations=np.array(observations, dtype=np.float32).reshape(
+            move_count, env.observation_size
+        ),
+        legal_masks=np.array(legal_masks, dtype=np.bool_).reshape(
+            move_count, env.action_count
+        ),
+        policies=policies,
+        to_move=np.array(to_move, dtype=np.int8),
+        scores=np.array(scores, dtype=np.int16).reshape(
+            move_count, task.player_count
+        ),
+        games=np.array(games, dtype=np.int64),
+    )
+    # Shards only appear under their final name once completely written.
+    os.replace(temporary, path)
+    return ShardInfo(name, task.first_game, task.game_count, move_count)
+
+
+def read_manifest(directory: str | Path) -> list[ShardInfo]:
+    """Returns the finished shards of an output directory, in the order they
+    were finished."""
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        return []
+    with path.open() as manifest:
+        # A last line without its newline was torn by an interrupted write,
+        # so its shard is played again.
+        return [
+            ShardInfo(**json.loads(line))
+            for line in manifest
+            if line.endswith("\n")
+        ]
+
+
+def _drop_torn_line(path: Path) -> None:
+    # Cuts a torn last line from a manifest, so the next shard written
+    # starts on its own line.
+    if not path.exists():
+        return
+    with path.open("rb+") as manifest:
+        manifest.truncate(manifest.read().rfind(b"\n") + 1)
+
+
+def load_shards(directory: str | Path) -> Iterator[dict[str, np.ndarray]]:
+    """Yields the arrays of every finished shard of an output directory, one
+    shard at a time."""
+    for shard in read_manifest(directory):
+        with np.load(Path(directory) / shard.name) as arrays:
+            yield dict(arrays)
+
+
+def generate_selfplay(
+    directory: str | Path,
+    game_count: int,
+    bot_factory: BotFactory,
+    player_count: int = 2,
+    workers: Optional[int] = None,
+    games_per_shard: int = 32,
+    seed: int = 0,
+    context: Optional[BaseContext] = None,
+) -> list[ShardInfo]:
+    """Plays self-play games in worker processes and writes their moves to
+    shard files.
+
+    Every game is seeded from the seed of the run and the index of the game,
+    so the games played do not depend on the number of workers, and shards
+    already listed in the manifest of the directory are not played again.
+
+    Args:
+        directory: Output directory, created if it does not exist.
+        game_count: Number of games of the run.
+        bot_factory: Returns the player of each seat of each game. Must be
+            picklable to be sent to the worker processes.
+        player_count: Number of players in every game.
+        workers: Number of worker processes. Defaults to the number of CPUs.
+        games_per_shard: Number of games of each shard.
+        seed: Seed of the run.
+        context: Multiprocessing context of the worker processes. Defaults
+            to the default context.
+
+    Returns:
+        Every finished shard of the directory.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    _drop_torn_line(directory / MANIFEST_NAME)
+    finished = {shard.first_game for shard in read_manifest(directory)}
+    tasks = [
+        _ShardTask(
+            str(directory),
+            first_game,
+            min(games_per_shard, game_count - first_game),
+            player_count,
+            seed,
+            bot_factory,
+        )
+        for first_game in range(0, game_count, games_per_shard)
+        if first_game not in finished
+    ]
+
+    context = context or multiprocessing.get_context()
+    with (
+        context.Pool(workers) as pool,  # type: ignore[attr-defined]
+        (directory / MANIFEST_NAME).open("a") as manifest,
+    ):
+        for shard in pool.imap_unordered(_play_shard, tasks):
+            manifest.write(json.dumps(shard._asdict()) + "\n")
+            manifest.flush()
+
+    return read_manifest(directory)
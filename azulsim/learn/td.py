@@ -0,0 +1,188 @@
+"""Defines a temporal difference learner of n-tuple networks.
+
+The learner plays complete games against itself, every board selecting the
+move after which the network values it highest, or a random move with a
+small probability. After each game, the weights looked up for every board of
+every position of the game are moved towards the position's TD(lambda)
+return: the points the board earned until the next position plus a mix of
+the value of the next position and of its own return, weighted by the trace
+decay. The last return of a board is its final score, including end-of-game
+bonuses.
+
+The network values boards by their score track plus the looked up weights,
+so the weights learn the points a board is still going to earn, and a
+network whose weights are all zero values boards by their score.
+"""
+
+from __future__ import annotations
+import random
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from azulsim.core.game import (
+    FactoryOffer,
+    GameEnd,
+    RoundSetup,
+    WallTiling,
+    new_game,
+)
+from azulsim.eval.ntuple import NTupleEvaluator, NTupleNetwork, board_indices
+from azulsim.search.position import (
+    BoardPosition,
+    Move,
+    Position,
+    legal_moves,
+    play_move,
+)
+
+
+class TDStats(NamedTuple):
+    """Progress of a call to TDLearner.train.
+
+    Attributes:
+        games: Number of games played.
+        positions: Number of positions learned from, summed over the boards.
+        mean_score: Mean final score of the boards.
+        mean_error: Mean absolute difference between the values of the
+            positions and their returns, before the updates.
+        games_per_second: Games played and learned from per second.
+    """
+
+    games: int
+    positions: int
+    mean_score: float
+    mean_error: float
+    games_per_second: float
+
+
+class TDLearner:
+    """Trains an n-tuple network with TD(lambda) from self-play.
+
+    Args:
+        network: Network to train in place. Its weights must be writable.
+        player_count: Number of players of the games played.
+        trace_decay: Lambda of the returns, from zero for one-step temporal
+            difference returns to one for the final scores.
+        learning_rate: Step size of the update of each looked up weight.
+        exploration: Probability of playing a random move.
+        seed: Seed of the games and of the random moves.
+    """
+
+    def __init__(
+        self,
+        network: NTupleNetwork,
+        player_count: int = 2,
+        trace_decay: float = 0.7,
+        learning_rate: float = 0.005,
+        exploration: float = 0.05,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.network = network
+        self._evaluator = NTupleEvaluator(network)
+        self._player_count = player_count
+        self._trace_decay = trace_decay
+        self._learning_rate = learning_rate
+        self._exploration = exploration
+        self._rng = random.Random(seed)
+
+    def train(self, game_count: int) -> TDStats:
+        """Plays games and updates the network after each of them.
+
+        Args:
+            game_count: Number of games to play.
+        """
+        start = time.perf_counter()
+        positions = 0
+        scores: list[float] = []
+        errors: list[float] = []
+        for _ in range(game_count):
+            boards, final_scores = self._play()
+            for board_index, final_score in enumerate(final_scores):
+                error = self._learn(
+                    [position[board_index] for position in boards],
+                    final_score,
+                )
+                positions += len(boards)
+                errors.append(error)
+            scores.extend(final_scores)
+        elapsed = max(time.perf_counter() - start, 1e-9)
+
+        return TDStats(
+            games=game_count,
+            positions=positions,
+            mean_score=float(np.mean(scores)) if scores else 0.0,
+            mean_error=float(np.mean(errors)) if errors else 0.0,
+            games_per_second=game_count / elapsed,
+        )
+
+    def _select_move(self, position: Position) -> Move:
+        moves = legal_moves(position)
+        if self._rng.random() < self._exploration:
+            return self._rng.choice(moves)
+
+        player = position.to_move
+        accumulator = self._evaluator.root(position)
+        return max(
+            moves,
+            key=lambda move: self._evaluator.child(accumulator, position, move)[
+                player
+            ].total,
+        )
+
+    def _play(self) -> tuple[list[tuple[BoardPosition, ...]], list[float]]:
+        # Returns the boards of every position and the final scores.
+        game: FactoryOffer | WallTiling | RoundSetup | GameEnd = new_game(
+            player_count=self._player_count,
+            seed=self._rng.randrange(1 << 31),
+        )
+        boards: list[tuple[BoardPosition, ...]] = []
+        while True:
+            match game:
+                case FactoryOffer():
+                    position = Position.from_game(game)
+                    boards.append(position.boards)
+                    game = play_move(game, self._select_move(position))
+                case WallTiling():
+                    game = game.tile_boards()
+                case RoundSetup():
+                    game = game.round_setup()
+                case GameEnd():
+                    final = game.score_bonuses().boards.boards
+                    return boards, [
+                        float(board.score_track.score) for board in final
+                    ]
+
+    def _learn(self, boards: list[BoardPosition], final_score: float) -> float:
+        # Moves the weights of a board's positions towards their returns and
+        # returns the mean absolute error before the update.
+        weights = self.network.weights
+        indices = np.array([board_indices(board) for board in boards])
+        scores = np.array([board.score for board in boards], np.float32)
+        values = weights[indices].sum(1)
+
+        # Returns of the learned part of the value: the points still to be
+        # earned after each position.
+        targets = np.empty_like(values)
+        following_score = final_score
+        following_value = following_target = 0.0
+        decay = self._trace_decay
+        for step in reversed(range(len(boards))):
+            targets[step] = (
+                following_score
+                - scores[step]
+                + (1.0 - decay) * following_value
+                + decay * following_target
+            )
+            following_score = float(scores[step])
+            following_value = float(values[step])
+            following_target = float(targets[step])
+
+        errors = targets - values
+        np.add.at(
+            weights,
+            indices,
+            (self._learning_rate * errors)[:, None].astype(np.float32),
+        )
+        return float(np.abs(errors).mean())
@@ -0,0 +1,13 @@
+"""Search algorithms operating on compact representations of a game."""
+
+from .accounting import *  # noqa: F403
+from .alphabeta import *  # noqa: F403
+from .book import *  # noqa: F403
+from .cache import *  # noqa: F403
+from .canonical import *  # noqa: F403
+from .position import *  # noqa: F403
+from .solver import *  # noqa: F403
+from .tablebase import *  # noqa: F403
+from .timing import *  # noqa: F403
+from .transposition import *  # noqa: F403
+from .rounds import *  # noqa: F403
@@ -0,0 +1,232 @@
+"""Defines public tile accounting and draw probabilities for the next round.
+
+Every tile in the game is always in exactly one of the bag, the discard, the
+tile pools or a board. The pools and boards are visible to every player, and
+the only tiles which move into the discard are the floor line tiles and the
+surplus tiles of completed pattern lines during wall tiling. Any observer can
+therefore keep the color counts of the bag and discard up to date from the
+phase transitions alone, without seeing the order of the tiles in the bag.
+
+The probabilities of the next round setup are computed exactly from those
+counts by dynamic programming over the drawn tiles, so they are cheap enough
+to query from an evaluation function.
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+from functools import lru_cache
+from typing import Sequence
+
+from azulsim.core.game import FactoryOffer, WallTiling
+from azulsim.core.tiles import TileBag
+
+from .position import COLORS, Position, histogram
+from .rounds import Supply, tile_boards
+
+
+_FACTORY_SIZE = 4
+
+
+def draw_supply(supply: Supply, drawn: Sequence[int]) -> Supply:
+    """Returns the supply after drawing tiles for the factory displays.
+
+    The bag is only refilled from the discard once it runs out of tiles, so
+    the discard is emptied if and only if more tiles were drawn than the bag
+    held.
+
+    Args:
+        supply: Supply before the round setup.
+        drawn: Number of tiles of each color drawn into the factory displays.
+    """
+    if sum(drawn) <= sum(supply.bag):
+        bag = tuple(count - taken for count, taken in zip(supply.bag, drawn))
+        return Supply(bag=bag, discard=supply.discard)
+
+    bag = tuple(
+        count + discarded - taken
+        for count, discarded, taken in zip(supply.bag, supply.discard, drawn)
+    )
+    return Supply(bag=bag, discard=(0,) * len(COLORS))
+
+
+class TileTracker:
+    """Keeps the color counts of the bag and discard of a game up to date
+    from its public phase transitions.
+
+    Args:
+        supply: Supply of the game when tracking starts.
+    """
+
+    def __init__(self, supply: Supply) -> None:
+        self.supply = supply
+
+    @staticmethod
+    def new() -> TileTracker:
+        """Returns a tracker for a game before its first round setup."""
+        bag = histogram(TileBag.default().tiles)
+        return TileTracker(Supply(bag=bag, discard=(0,) * len(COLORS)))
+
+    def round_setup(self, game: FactoryOffer) -> None:
+        """Records the tiles drawn by a round setup.
+
+        Args:
+            game: Factory offer phase returned by the round setup, before any
+                move has been played.
+        """
+        drawn = [0] * len(COLORS)
+        for factory in Position.from_game(game).factories:
+            for color, count in enumerate(factory):
+                drawn[color] += count
+
+        self.supply = draw_supply(self.supply, drawn)
+
+    def wall_tiling(self, game: WallTiling) -> None:
+        """Records the tiles discarded by a wall tiling phase.
+
+        Args:
+            game: Wall tiling phase, before its boards have been tiled.
+        """
+        position = Position.from_state(game.state, 0)
+        _, self.supply, _ = tile_boards(position, self.supply)
+
+
+# Source of the next tile: tiles of the color and tiles of all colors left in
+# the bag, and whether the bag has been refilled from the discard.
+_Source = tuple[int, int, bool]
+
+
+def _draw_tile(
+    source: _Source, discard: tuple[int, int]
+) -> list[tuple[_Source, bool, float]]:
+    color, total, refilled = source
+    if total == 0 and not refilled:
+        color, total, refilled = discard[0], discard[1], True
+    if total == 0:
+        return [(source, False, 1.0)]
+
+    draws: list[tuple[_Source, bool, float]] = []
+    if color > 0:
+        draws.append(((color - 1, total - 1, refilled), True, color / total))
+    if color < total:
+        draws.append(
+            ((color, total - 1, refilled), False, (total - color) / total)
+        )
+    return draws
+
+
+@lru_cache(maxsize=4096)
+def _draw_outcomes(
+    bag: tuple[int, int], discard: tuple[int, int], factory_count: int
+) -> tuple[tuple[int, int, float], ...]:
+    # Returns the number of factories holding the color, the number of tiles
+    # of the color drawn and their probability, as a tuple so that callers
+    # cannot change a cached result.
+
+    # Maps the source, the number of factories holding the color and the
+    # number of tiles of the color drawn so far to their probability.
+    outcomes: dict[tuple[_Source, int, int], float] = {
+        ((bag[0], bag[1], False), 0, 0): 1.0
+    }
+    for _ in range(factory_count):
+        filling = {
+            (source, factories, tiles, False): probability
+            for (source, factories, tiles), probability in outcomes.items()
+        }
+        for _ in range(_FACTORY_SIZE):
+            drawn: defaultdict[
+                tuple[_Source, int, int, bool], float
+            ] = defaultdict(float)
+            for state, probability in filling.items():
+                source, factories, tiles, present = state
+                for next_source, match, chance in _draw_tile(source, discard):
+                    next_state = (
+                        next_source,
+                        factories,
+                        tiles + match,
+                        present or match,
+                    )
+                    drawn[next_state] += probability * chance
+            filling = drawn
+
+        outcomes = defaultdict(float)
+        for (source, factories, tiles, present), probability in filling.items():
+            outcomes[(source, factories + present, tiles)] += probability
+
+    result: defaultdict[tuple[int, int], float] = defaultdict(float)
+    for (_, factories, tiles), probability in outcomes.items():
+        result[(factories, tiles)] += probability
+
+    return tuple(
+        (factories, tiles, probability)
+        for (factories, tiles), probability in result.items()
+    )
+
+
+def _outcomes(
+    supply: Supply, factory_count: int, color: int
+) -> tuple[tuple[int, int, float], ...]:
+    return _draw_outcomes(
+        (supply.bag[color], sum(supply.bag)),
+        (supply.discard[color], sum(supply.discard)),
+        factory_count,
+    )
+
+
+def factory_distribution(
+    supply: Supply, factory_count: int, color: int
+) -> tuple[float, ...]:
+    """Returns the probability distribution of the number of factory displays
+    holding a color after the next round setup.
+
+    Args:
+        supply: Supply before the round setup.
+        factory_count: Number of factory displays to fill.
+        color: Index of the color in COLORS.
+
+    Returns:
+        Probability that exactly n factory displays hold the color, for each
+        n from 0 to factory_count.
+    """
+    distribution = [0.0] * (factory_count + 1)
+    for factories, _, probability in _outcomes(supply, factory_count, color):
+        distribution[factories] += probability
+
+    return tuple(distribution)
+
+
+def tile_distribution(
+    supply: Supply, factory_count: int, color: int
+) -> tuple[float, ...]:
+    """Returns the probability distribution of the number of tiles of a color
+    drawn by the next round setup.
+
+    Args:
+        supply: Supply before the round setup.
+        factory_count: Number of factory displays to fill.
+        color: Index of the color in COLORS.
+
+    Returns:
+        Probability that exactly n tiles of the color are drawn, for each n
+        from 0 to the number of tiles in the factory displays.
+    """
+    distribution = [0.0] * (factory_count * _FACTORY_SIZE + 1)
+    for _, tiles, probability in _outcomes(supply, factory_count, color):
+        distribution[tiles] += probability
+
+    return tuple(distribution)
+
+
+def factory_probability(
+    supply: Supply, factory_count: int, color: int, minimum: int
+) -> float:
+    """Returns the probability that at least a minimum number of factory
+    displays hold a color after the next round setup.
+
+    Args:
+        supply: Supply before the round setup.
+        factory_count: Number of factory displays to fill.
+        color: Index of the color in COLORS.
+        minimum: Minimum number of factory displays holding the color.
+    """
+    distribution = factory_distribution(supply, factory_count, color)
+    return sum(distribution[max(minimum, 0) :])
@@ -0,0 +1,352 @@
+"""Defines a depth-limited alpha-beta searcher for the factory offer phase.
+
+Positions at the depth limit are scored by a pluggable static evaluator, which
+assigns a value to every board. Two ways of extending two-player minimax to
+more boards are supported:
+
+- Paranoid: the board to move at the root maximizes the margin of its value
+  over the best opponent, and every other board is assumed to minimize that
+  margin. This reduces the search to a two-player game, so alpha-beta pruning
+  applies for any number of boards.
+- Max-n: every board maximizes the margin of its own value over the best
+  opponent. This models the opponents more faithfully, but only allows the
+  search to cut off at positions already in its transposition table.
+
+Searches are run with iterative deepening. Moves are ordered by the best move
+of the previous iteration, then by killer moves and the history heuristic,
+then by how few tiles they send to the floor line. The search can be given a
+deadline, in which case it returns the best move of the deepest completed
+iteration once the deadline expires.
+"""
+
+from __future__ import annotations
+from enum import Enum
+from typing import Any, Generic, NamedTuple, Optional, Protocol, TypeVar
+
+from .position import Move, Position, apply_move, legal_moves, placement
+from .rounds import tile_board
+from .timing import Deadline
+
+
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+_INFINITY = float("inf")
+
+# Number of nodes searched between two checks of the deadline.
+_DEADLINE_INTERVAL = 256
+
+_KILLER_COUNT = 2
+
+A = TypeVar("A")
+
+
+class Evaluator(Protocol, Generic[A]):
+    """A static evaluator of positions whose state is updated incrementally.
+
+    The searcher creates an accumulator for the root position and derives
+    the accumulator of every child position from its parent's, so only the
+    parts of the evaluation changed by a move need to be recomputed.
+    """
+
+    def root(self, position: Position) -> A:
+        """Returns the accumulator of a position, computed from scratch."""
+        ...
+
+    def child(self, accumulator: A, position: Position, move: Move) -> A:
+        """Returns the accumulator of the position after playing a move.
+
+        Args:
+            accumulator: Accumulator of the position before the move.
+            position: Position before the move.
+            move: Legal move played in the position.
+        """
+        ...
+
+    def value(self, accumulator: A, position: Position) -> tuple[float, ...]:
+        """Returns the value of each board in a position."""
+        ...
+
+
+class RoundScoreEvaluator:
+    """Evaluates each board by its score if the round ended now.
+
+    The accumulator holds the projected score of every board. A move only
+    changes the board which played it, so only that board is re-tiled.
+    """
+
+    def root(self, position: Position) -> tuple[float, ...]:
+        """Returns the projected score of every board."""
+        return tuple(
+            float(tile_board(board)[0].score) for board in position.boards
+        )
+
+    def child(
+        self, accumulator: tuple[float, ...], position: Position, move: Move
+    ) -> tuple[float, ...]:
+        """Returns the projected scores after a move, re-tiling only the
+        board which played it."""
+        player = position.to_move
+        board = apply_move(position, move).boards[player]
+        score = float(tile_board(board)[0].score)
+        return accumulator[:player] + (score,) + accumulator[player + 1 :]
+
+    def value(
+        self, accumulator: tuple[float, ...], position: Position
+    ) -> tuple[float, ...]:
+        """Returns the projected score of every board."""
+        return accumulator
+
+
+class SearchMode(Enum):
+    """Extension of minimax to more than two boards."""
+
+    PARANOID = "paranoid"
+    MAX_N = "max-n"
+
+
+class SearchResult(NamedTuple):
+    """Result of an alpha-beta search.
+
+    Attributes:
+        move: Best move for the board to move.
+        values: Value of each board at the end of the principal variation.
+        depth: Depth of the deepest completed iteration, in moves.
+        nodes: Number of positions searched.
+    """
+
+    move: Move
+    values: tuple[float, ...]
+    depth: int
+    nodes: int
+
+
+class _Entry(NamedTuple):
+    depth: int
+    value: float
+    bound: int
+    values: tuple[float, ...]
+    move: Optional[Move]
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _margin(values: tuple[float, ...], player: int) -> float:
+    opponents = values[:player] + values[player + 1 :]
+    return values[player] - max(opponents, default=0.0)
+
+
+class AlphaBetaSearcher:
+    """Depth-limited alpha-beta search with iterative deepening.
+
+    Args:
+        evaluator: Static evaluator of the positions at the depth limit and
+            at the end of the round. Defaults to RoundScoreEvaluator.
+        mode: Extension of minimax to more than two boards. Both modes are
+            equivalent for two boards.
+    """
+
+    def __init__(
+        self,
+        evaluator: Optional[Evaluator[Any]] = None,
+        mode: SearchMode = SearchMode.PARANOID,
+    ) -> None:
+        self._evaluator: Evaluator[Any] = evaluator or RoundScoreEvaluator()
+        self._mode = mode
+        self._table: dict[Position, _Entry] = {}
+        self._killers: list[list[Move]] = []
+        self._history: dict[Move, int] = {}
+        self._deadline: Optional[Deadline] = None
+        self._root_player = 0
+        self.nodes = 0
+
+    def search(
+        self,
+        position: Position,
+        max_depth: int = 64,
+        deadline: Optional[Deadline] = None,
+    ) -> SearchResult:
+        """Searches a position with iterative deepening.
+
+        Iterations are searched one move deeper each time, until max_depth
+        is reached, the round ends within the search depth, or the deadline
+        expires. An iteration interrupted by the deadline is discarded.
+
+        Args:
+            position: Position to search.
+            max_depth: Maximum search depth, in moves.
+            deadline: Optional deadline by which the search must return.
+
+        Returns:
+            Result of the deepest completed iteration. If the deadline
+            expires before the first iteration completes, the first move in
+            search order is returned with the static values of the position.
+
+        Raises:
+            ValueError: If the board to move has no legal moves.
+        """
+        moves = legal_moves(position)
+        if not moves:
+            raise ValueError("Board to move has no legal moves.")
+
+        self._table.clear()
+        self._killers = [[] for _ in range(max_depth)]
+        self._history.clear()
+        self._deadline = deadline
+        self._root_player = position.to_move
+        self.nodes = 0
+
+        accumulator = self._evaluator.root(position)
+        result = SearchResult(
+            move=self._ordered_moves(position, moves, 0)[0],
+            values=self._evaluator.value(accumulator, position),
+            depth=0,
+            nodes=0,
+        )
+        for depth in range(1, max_depth + 1):
+            try:
+                _, values, move = self._search(
+                    position, accumulator, depth, 0, -_INFINITY, _INFINITY
+                )
+            except _Timeout:
+                break
+
+            assert move is not None, "Root position must have a best move."
+            result = SearchResult(move, values, depth, self.nodes)
+            if not self._deeper(position, depth):
+                break
+
+        return result._replace(nodes=self.nodes)
+
+    def _deeper(self, position: Position, depth: int) -> bool:
+        # Every move removes at least one colored tile from the pools, so no
+        # line can be longer than the number of tiles left.
+        return depth < position.tile_count()
+
+    def _ordered_moves(
+        self,
+        position: Position,
+        moves: list[Move],
+        ply: int,
+        first: Optional[Move] = None,
+    ) -> list[Move]:
+        killers = self._killers[ply] if ply < len(self._killers) else []
+
+        def order(move: Move) -> tuple[bool, bool, int, int, int]:
+            placed, overflow = placement(position, move)
+            return (
+                move != first,
+                move not in killers,
+                -self._history.get(move, 0),
+                overflow,
+                -placed,
+            )
+
+        return sorted(moves, key=order)
+
+    def _record_cutoff(self, move: Move, depth: int, ply: int) -> None:
+        killers = self._killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[_KILLER_COUNT:]
+        self._history[move] = self._history.get(move, 0) + depth * depth
+
+    def _search(
+        self,
+        position: Position,
+        accumulator: Any,
+        depth: int,
+        ply: int,
+        alpha: float,
+        beta: float,
+    ) -> tuple[float, tuple[float, ...], Optional[Move]]:
+        self.nodes += 1
+        if (
+            self._deadline is not None
+            and self.nodes % _DEADLINE_INTERVAL == 0
+            and self._deadline.expired()
+        ):
+            raise _Timeout()
+
+        paranoid = self._mode == SearchMode.PARANOID
+        entry = self._table.get(position)
+        first: Optional[Move] = None
+        if entry is not None:
+            if entry.depth >= depth and (
+                entry.bound == _EXACT
+                or (entry.bound == _LOWER and entry.value >= beta)
+                or (entry.bound == _UPPER and entry.value <= alpha)
+            ):
+                return entry.value, entry.values, entry.move
+            first = entry.move
+
+        moves = legal_moves(position)
+        if depth == 0 or not moves:
+            values = self._evaluator.value(accumulator, position)
+            value = self._value(values, position)
+            # The end of the round is exact at any depth.
+            leaf_depth = depth if moves else 1 << 16
+            self._table[position] = _Entry(
+                leaf_depth, value, _EXACT, values, None
+            )
+            return value, values, None
+
+        maximizing = not paranoid or position.to_move == self._root_player
+        window = alpha, beta
+        best_value = -_INFINITY if maximizing else _INFINITY
+        best_values: tuple[float, ...] = ()
+        best_move: Optional[Move] = None
+        for move in self._ordered_moves(position, moves, ply, first):
+            child = apply_move(position, move)
+            child_accumulator = self._evaluator.child(
+                accumulator, position, move
+            )
+            if paranoid:
+                value, values, _ = self._search(
+                    child, child_accumulator, depth - 1, ply + 1, alpha, beta
+                )
+            else:
+                _, values, _ = self._search(
+                    child,
+                    child_accumulator,
+                    depth - 1,
+                    ply + 1,
+                    -_INFINITY,
+                    _INFINITY,
+                )
+                value = _margin(values, position.to_move)
+
+            if (maximizing and value > best_value) or (
+                not maximizing and value < best_value
+            ):
+                best_value, best_values, best_move = value, values, move
+            if not paranoid:
+                continue
+
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                self._record_cutoff(move, depth, ply)
+                break
+
+        if not paranoid or window[0] < best_value < window[1]:
+            bound = _EXACT
+        elif best_value <= window[0]:
+            bound = _UPPER
+        else:
+            bound = _LOWER
+        self._table[position] = _Entry(
+            depth, best_value, bound, best_values, best_move
+        )
+
+        return best_value, best_values, best_move
+
+    def _value(self, values: tuple[float, ...], position: Position) -> float:
+        if self._mode == SearchMode.PARANOID:
+            return _margin(values, self._root_player)
+        return _margin(values, position.to_move)
@@ -0,0 +1,253 @@
+"""Defines an opening book of first moves.
+
+At the first move of a game every board is in its default state, the table
+center only holds the starting player marker and every factory display holds
+four tiles, so the position is determined by the player count and the
+multiset of factory display contents. There are 70 possible contents of a
+factory display, and the sorted contents of a game's factory displays are
+ranked with the combinatorial number system, which maps the configurations
+of each player count onto consecutive integers. An opening book file stores
+one packed move per rank in a dense array, so a lookup costs one rank
+computation and one read from the memory-mapped file.
+"""
+
+from __future__ import annotations
+import itertools
+from math import comb
+import mmap
+import os
+import random
+import struct
+from typing import Callable, Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from azulsim.core.board import Board
+
+from .position import (
+    COLORS,
+    BoardPosition,
+    Move,
+    Position,
+    pack_move,
+    unpack_move,
+)
+from .rounds import Supply, setup_round
+
+
+_MAGIC = b"AZULOB01"
+_HEADER = struct.Struct("<8sI")
+_HEADER_SIZE = 16
+_SECTION = struct.Struct("<III")
+_ENTRY = struct.Struct("<H")
+
+_FACTORY_SIZE = 4
+_TILES_PER_COLOR = 20
+
+"""Possible color counts of a full factory display, in sorted order."""
+FACTORY_CONTENTS: tuple[tuple[int, ...], ...] = tuple(
+    sorted(
+        counts
+        for counts in itertools.product(
+            range(_FACTORY_SIZE + 1), repeat=len(COLORS)
+        )
+        if sum(counts) == _FACTORY_SIZE
+    )
+)
+
+_CONTENT_INDEX = {
+    counts: index for index, counts in enumerate(FACTORY_CONTENTS)
+}
+
+_DEFAULT_BOARD = BoardPosition.from_board(Board.default())
+
+
+def configuration_count(player_count: int) -> int:
+    """Returns the number of distinct factory configurations at the first
+    move of a game with the given number of players."""
+    factory_count = player_count + 1
+    return comb(len(FACTORY_CONTENTS) + factory_count - 1, factory_count)
+
+
+def configuration_rank(factories: tuple[tuple[int, ...], ...]) -> int:
+    """Returns the rank of a sorted configuration of full factory displays
+    among all configurations with the same number of factory displays."""
+    return sum(
+        comb(_CONTENT_INDEX[factory] + index, index + 1)
+        for index, factory in enumerate(factories)
+    )
+
+
+def opening_position(factories: tuple[tuple[int, ...], ...]) -> Position:
+    """Returns the position at the first move of a game with the given sorted
+    factory display contents."""
+    return Position(
+        factories=factories,
+        center=(0,) * len(COLORS),
+        center_marker=True,
+        boards=(_DEFAULT_BOARD,) * (len(factories) - 1),
+        to_move=0,
+    )
+
+
+def is_opening(position: Position) -> bool:
+    """Returns a boolean value indicating whether or not a position is the
+    first move of a game."""
+    return (
+        len(position.factories) == len(position.boards) + 1
+        and position.center_marker
+        and not any(position.center)
+        and all(sum(factory) == _FACTORY_SIZE for factory in position.factories)
+        and all(board == _DEFAULT_BOARD for board in position.boards)
+    )
+
+
+def opening_configurations(
+    player_count: int,
+) -> Iterator[tuple[tuple[int, ...], ...]]:
+    """Yields every configuration of factory displays at the first move of a
+    game, in lexicographic order.
+
+    Not every configuration can be drawn from the bag, since the bag holds 20
+    tiles of each color, but every configuration which can be drawn is
+    yielded.
+    """
+    for combination in itertools.combinations_with_replacement(
+        range(len(FACTORY_CONTENTS)), player_count + 1
+    ):
+        yield tuple(FACTORY_CONTENTS[index] for index in combination)
+
+
+def sampled_configurations(
+    player_count: int, count: int, seed: Optional[int] = None
+) -> Iterator[tuple[tuple[int, ...], ...]]:
+    """Yields configurations of factory displays drawn from a full bag, as
+    at the start of a game. Configurations may repeat."""
+    rng = random.Random(seed)
+    boards = (_DEFAULT_BOARD,) * player_count
+    supply = Supply(
+        bag=(_TILES_PER_COLOR,) * len(COLORS), discard=(0,) * len(COLORS)
+    )
+    for _ in range(count):
+        position, _ = setup_round(boards, 0, supply, rng)
+        yield position.factories
+
+
+class _Section(NamedTuple):
+    offset: int
+    size: int
+
+
+class OpeningBook:
+    """Read-only view of an opening book file."""
+
+    def __init__(self, file: mmap.mmap) -> None:
+        magic, section_count = _HEADER.unpack_from(file, 0)
+        if magic != _MAGIC:
+            raise ValueError("File is not an opening book.")
+
+        self._file = file
+        self._sections: dict[int, _Section] = {}
+        for index in range(section_count):
+            player_count, offset, count = _SECTION.unpack_from(
+                file, _HEADER_SIZE + index * _SECTION.size
+            )
+            self._sections[player_count] = _Section(offset, count)
+
+    @staticmethod
+    def open(path: str | os.PathLike[str]) -> OpeningBook:
+        """Returns the opening book stored in a file, memory-mapped for
+        reading."""
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return OpeningBook(mapped)
+
+    def player_counts(self) -> tuple[int, ...]:
+        """Returns the player counts covered by the book."""
+        return tuple(sorted(self._sections))
+
+    def probe(self, position: Position) -> Optional[Move]:
+        """Returns the book move of a position, or None if the position is
+        not the first move of a game or is not in the book."""
+        section = self._sections.get(len(position.boards))
+        if section is None or not is_opening(position):
+            return None
+
+        rank = configuration_rank(position.factories)
+        offset = section.offset + rank * _ENTRY.size
+        (packed,) = _ENTRY.unpack_from(self._file, offset)
+        return unpack_move(packed)
+
+    def close(self) -> None:
+        """Unmaps the opening book file."""
+        self._file.close()
+
+    def __enter__(self) -> OpeningBook:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+def build_opening_book(
+    path: str | os.PathLike[str],
+    configurations: Mapping[int, Iterable[tuple[tuple[int, ...], ...]]],
+    select: Callable[[Position], Move],
+) -> int:
+    """Selects the first move of every given configuration of factory
+    displays and writes them to an opening book file.
+
+    The file holds an entry for every configuration of each player count,
+    whether or not it was given, so configurations which were not given are
+    missing from the book. Complete books can be built from
+    opening_configurations, but the number of configurations grows quickly
+    with the player count, so books for three or four players are usually
+    built from sampled_configurations.
+
+    Args:
+        path: Destination opening book file.
+        configurations: Sorted factory display contents to store, by player
+            count.
+        select: Function selecting the move to store for an opening position,
+            typically a strong search.
+
+    Returns:
+        Number of positions written to the opening book.
+    """
+    player_counts = sorted(configurations)
+    offset = _HEADER_SIZE + len(player_counts) * _SECTION.size
+    sections: dict[int, _Section] = {}
+    for player_count in player_counts:
+        sections[player_count] = _Section(
+            offset, configuration_count(player_count)
+        )
+        offset += configuration_count(player_count) * _ENTRY.size
+
+    buffer = bytearray(b"\xff" * offset)
+    _HEADER.pack_into(buffer, 0, _MAGIC, len(player_counts))
+    buffer[_HEADER.size : _HEADER_SIZE] = bytes(_HEADER_SIZE - _HEADER.size)
+
+    stored: set[tuple[int, int]] = set()
+    for index, player_count in enumerate(player_counts):
+        section = sections[player_count]
+        _SECTION.pack_into(
+            buffer,
+            _HEADER_SIZE + index * _SECTION.size,
+            player_count,
+            section.offset,
+            section.size,
+        )
+        for factories in configurations[player_count]:
+            rank = configuration_rank(factories)
+            if (player_count, rank) in stored:
+                continue
+            stored.add((player_count, rank))
+
+            move = select(opening_position(factories))
+            _ENTRY.pack_into(
+                buffer, section.offset + rank * _ENTRY.size, pack_move(move)
+            )
+
+    with open(path, "wb") as file:
+        file.write(buffer)
+
+    return len(stored)
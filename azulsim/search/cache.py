@@ -0,0 +1,267 @@
+"""Defines a persistent cache of evaluations shared across runs and processes.
+
+The cache is an SQLite database file mapping 64-bit canonical state hashes,
+as returned by state_hash, to the values and best move found for a state.
+It outlives the process which wrote it, so a new run can reuse the
+evaluations of the positions every game passes through, and SQLite's file
+locking makes it safe to read and write from several processes at once.
+
+The number of entries is bounded. When the cache is full, an entry is
+evicted with the CLOCK algorithm, an approximation of least recently used
+eviction which only writes on a lookup the first time an entry is looked up
+after the clock hand passed it. Entries are arranged on the clock in key
+order.
+"""
+
+from __future__ import annotations
+import os
+import sqlite3
+import struct
+from typing import NamedTuple, Optional
+
+from .position import Move, pack_move, unpack_move
+
+
+_SIGN_BIT = 1 << 63
+_MASK64 = (1 << 64) - 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key INTEGER PRIMARY KEY,
+    vals BLOB NOT NULL,
+    depth INTEGER NOT NULL,
+    move INTEGER NOT NULL,
+    referenced INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class CacheEntry(NamedTuple):
+    """Evaluation stored for a state in an evaluation cache.
+
+    Attributes:
+        values: Value of each board.
+        depth: Search depth the values were computed with, or zero for a
+            static evaluation.
+        move: Best move found, if any.
+    """
+
+    values: tuple[float, ...]
+    depth: int
+    move: Optional[Move]
+
+
+def _signed(key: int) -> int:
+    # SQLite integers are signed 64-bit, so hashes are stored in two's
+    # complement.
+    key &= _MASK64
+    return key - (1 << 64) if key & _SIGN_BIT else key
+
+
+def _pack_values(values: tuple[float, ...]) -> bytes:
+    return struct.pack(f"<{len(values)}d", *values)
+
+
+def _unpack_values(packed: bytes) -> tuple[float, ...]:
+    return struct.unpack(f"<{len(packed) // 8}d", packed)
+
+
+class EvaluationCache:
+    """Bounded evaluation cache stored in an SQLite database file.
+
+    Every process should open its own cache object for the file. Cache
+    objects can also be pickled, for example as an argument of
+    multiprocessing.Process, in which case the receiving process opens the
+    file again.
+
+    Args:
+        path: Database file. Created if it does not exist.
+        capacity: Maximum number of entries. Only used when the file is
+            created, after which the capacity stored in the file is used.
+        timeout: Seconds to wait for another process to release the file.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        capacity: int = 1 << 20,
+        timeout: float = 30.0,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be positive.")
+
+        self._path = os.fspath(path)
+        self._timeout = timeout
+        self._connection = sqlite3.connect(
+            self._path, timeout=timeout, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(_SCHEMA)
+        with self._transaction():
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('capacity', ?)",
+                (capacity,),
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('size', 0)"
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('hand', ?)", (-_SIGN_BIT,)
+            )
+
+    @property
+    def capacity(self) -> int:
+        """Returns the maximum number of entries."""
+        return self._meta("capacity")
+
+    def __len__(self) -> int:
+        return self._meta("size")
+
+    def lookup(self, key: int) -> Optional[CacheEntry]:
+        """Returns the entry stored for a state hash, if any, and marks it as
+        recently used."""
+        key = _signed(key)
+        row = self._connection.execute(
+            "SELECT vals, depth, move, referenced FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        values, depth, move, referenced = row
+        if not referenced:
+            self._connection.execute(
+                "UPDATE entries SET referenced = 1 WHERE key = ?", (key,)
+            )
+        return CacheEntry(_unpack_values(values), depth, unpack_move(move))
+
+    def store(
+        self,
+        key: int,
+        values: tuple[float, ...],
+        depth: int = 0,
+        move: Optional[Move] = None,
+    ) -> None:
+        """Stores an entry for a state hash.
+
+        If the state is already stored, the entry is replaced unless it was
+        computed with a deeper search. If the cache is full, another entry
+        is evicted first.
+
+        Args:
+            key: 64-bit canonical hash of the state.
+            values: Value of each board.
+            depth: Search depth the values were computed with.
+            move: Best move found, if any.
+        """
+        key = _signed(key)
+        with self._transaction():
+            row = self._connection.execute(
+                "SELECT depth FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                if depth >= row[0]:
+                    self._connection.execute(
+                        "UPDATE entries SET vals = ?, depth = ?, move = ?,"
+                        " referenced = 1 WHERE key = ?",
+                        (_pack_values(values), depth, pack_move(move), key),
+                    )
+                return
+
+            if self._meta("size") >= self._meta("capacity"):
+                self._evict()
+            else:
+                self._connection.execute(
+                    "UPDATE meta SET value = value + 1 WHERE name = 'size'"
+                )
+            self._connection.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, 1)",
+                (key, _pack_values(values), depth, pack_move(move)),
+            )
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        with self._transaction():
+            self._connection.execute("DELETE FROM entries")
+            self._connection.execute(
+                "UPDATE meta SET value = 0 WHERE name = 'size'"
+            )
+
+    def close(self) -> None:
+        """Closes the database file."""
+        self._connection.close()
+
+    def _evict(self) -> None:
+        # Advances the clock hand past referenced entries, clearing their
+        # reference bits, and evicts the first unreferenced entry.
+        hand = self._meta("hand")
+        victim = self._first_unreferenced(hand)
+        while victim is None:
+            # Clears the rest of the revolution and wraps around. The cache
+            # is full, so the second revolution finds a cleared entry.
+            self._connection.execute(
+                "UPDATE entries SET referenced = 0 WHERE key >= ?", (hand,)
+            )
+            hand = -_SIGN_BIT
+            victim = self._first_unreferenced(hand)
+
+        self._connection.execute(
+            "UPDATE entries SET referenced = 0 WHERE key >= ? AND key < ?",
+            (hand, victim),
+        )
+        self._connection.execute("DELETE FROM entries WHERE key = ?", (victim,))
+        self._connection.execute(
+            "UPDATE meta SET value = ? WHERE name = 'hand'", (victim,)
+        )
+
+    def _first_unreferenced(self, start: int) -> Optional[int]:
+        row = self._connection.execute(
+            "SELECT key FROM entries WHERE key >= ? AND referenced = 0"
+            " ORDER BY key LIMIT 1",
+            (start,),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _meta(self, name: str) -> int:
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0]
+
+    def _transaction(self) -> _Transaction:
+        return _Transaction(self._connection)
+
+    def __enter__(self) -> EvaluationCache:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def __getstate__(self) -> tuple[str, float]:
+        return self._path, self._timeout
+
+    def __setstate__(self, state: tuple[str, float]) -> None:
+        path, timeout = state
+        self.__init__(path, timeout=timeout)  # type: ignore[misc]
+
+
+class _Transaction:
+    # Holds the database write lock from the start of the transaction, so
+    # concurrent writers wait instead of failing on a lock upgrade.
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __enter__(self) -> None:
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, error_type: Optional[type], *_: object) -> None:
+        if error_type is None:
+            self._connection.execute("COMMIT")
+        else:
+            self._connection.execute("ROLLBACK")
@@ -0,0 +1,127 @@
+"""Defines a canonical form and hash for game states.
+
+Many game states differ only in ways which can not affect the rest of the
+game: the order of the factory displays, the order of the tiles within a
+tile pool, the bag, the discard or a floor line, and the identifiers the
+core objects are created with. Every state is mapped to a canonical
+representative of these equivalent states, and to a key and a 64-bit hash
+which are equal for all of them, so caches, tables and training data can
+treat them as one position.
+"""
+
+from __future__ import annotations
+from dataclasses import replace
+from hashlib import blake2b
+from typing import Iterable, Optional
+import uuid
+
+from azulsim.core.board import Boards
+from azulsim.core.factory import (
+    FactoryDisplay,
+    FactoryDisplays,
+    PickedTableCenter,
+    TableCenter,
+    UnpickedTableCenter,
+)
+from azulsim.core.game import State
+from azulsim.core.tiles import ColoredTile, TileBag, TileDiscard
+
+from .position import COLORS, BoardPosition, Position, histogram
+
+
+def _sorted_tiles(tiles: Iterable[ColoredTile]) -> tuple[ColoredTile, ...]:
+    return tuple(sorted(tiles, key=COLORS.index))
+
+
+def canonical_state(state: State) -> State:
+    """Returns the canonical representative of a game state.
+
+    Factory displays are sorted by their color counts, tiles within every
+    collection are sorted by color, and tile pools are given identifiers
+    based on their canonical order. The returned state shares no objects
+    with the argument.
+    """
+    factories = sorted(
+        (_sorted_tiles(factory.tiles) for factory in state.factory_displays),
+        key=histogram,
+    )
+    factory_displays = FactoryDisplays.new(
+        replace(FactoryDisplay.new(tiles), _uid=uuid.UUID(int=index + 1))
+        for index, tiles in enumerate(factories)
+    )
+
+    center_tiles = _sorted_tiles(state.table_center.tiles)
+    table_center: TableCenter
+    if isinstance(state.table_center, UnpickedTableCenter):
+        table_center = UnpickedTableCenter(
+            uid=uuid.UUID(int=0), tiles=center_tiles
+        )
+    else:
+        table_center = PickedTableCenter(
+            uid=uuid.UUID(int=0), tiles=center_tiles
+        )
+
+    boards = Boards.new(
+        [
+            BoardPosition.from_board(board).to_board()
+            for board in state.boards.boards
+        ],
+        state.boards.starting_board_index,
+    )
+
+    return State(
+        boards=boards,
+        factory_displays=factory_displays,
+        table_center=table_center,
+        bag=TileBag.new(_sorted_tiles(state.bag.tiles)),
+        discard=TileDiscard.new(_sorted_tiles(state.discard.tiles)),
+    )
+
+
+def state_key(state: State, to_move: Optional[int] = None) -> bytes:
+    """Returns an encoding of a game state which is equal for all states with
+    the same canonical form.
+
+    Args:
+        state: Game state to encode.
+        to_move: Index of the board to move, if the state is in the factory
+            offer phase.
+    """
+    position = Position.from_state(state, 0 if to_move is None else to_move)
+    key = bytearray(
+        (
+            len(position.boards),
+            255 if to_move is None else to_move,
+            state.boards.starting_board_index,
+            position.center_marker,
+            len(position.factories),
+        )
+    )
+    for factory in position.factories:
+        key.extend(factory)
+    key.extend(position.center)
+    key.extend(histogram(state.bag.tiles))
+    key.extend(histogram(state.discard.tiles))
+
+    for board in position.boards:
+        for count, color in board.lines:
+            key.extend((count, color + 1))
+        key.extend(board.wall.to_bytes(4, "little"))
+        key.extend(board.floor)
+        key.append(board.marker)
+        key.extend(board.score.to_bytes(2, "little"))
+
+    return bytes(key)
+
+
+def state_hash(state: State, to_move: Optional[int] = None) -> int:
+    """Returns a 64-bit hash of a game state which is equal for all states
+    with the same canonical form, and the same in every process.
+
+    Args:
+        state: Game state to hash.
+        to_move: Index of the board to move, if the state is in the factory
+            offer phase.
+    """
+    digest = blake2b(state_key(state, to_move), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
@@ -0,0 +1,404 @@
+"""Defines a compact, hashable representation of the factory offer phase.
+
+The core game objects are validated on construction and mutated in place by
+the phase objects, which makes them unsuitable for search. The types in this
+module hold the same information as plain tuples of integers so positions can
+be copied, hashed and memoized cheaply. Moves generated here follow the same
+rules as the factory_offer phase functions.
+"""
+
+from __future__ import annotations
+from typing import NamedTuple, Optional, Sequence
+
+from azulsim.core.board import (
+    Board,
+    EmptyPatternLine,
+    FloorLine,
+    GameScore,
+    PatternLine,
+    PatternLines,
+    PopulatedPatternLine,
+    PopulatedWallSpace,
+    Wall,
+)
+from azulsim.core.factory import PickableTilePool, UnpickedTableCenter
+from azulsim.core.game import FactoryOffer, State, WallTiling
+from azulsim.core.tiles import ColoredTile, StartingPlayerMarker, Tile
+
+
+"""Colored tiles in the order used to index color counts."""
+COLORS: tuple[ColoredTile, ...] = tuple(ColoredTile)
+
+"""Pool index of the table center in a move."""
+CENTER = -1
+
+_LINE_COUNT = PatternLines.line_count()
+
+"""Line index of the floor line in a move."""
+FLOOR_LINE = _LINE_COUNT
+
+"""Packed value of a missing move, see pack_move."""
+NO_MOVE = 0xFFFF
+
+_MASK64 = (1 << 64) - 1
+
+_WALL_COLUMNS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        next(index for index, space in enumerate(line) if space.color == color)
+        for color in COLORS
+    )
+    for line in Wall.default()
+)
+
+
+def wall_column(line_index: int, color: int) -> int:
+    """Returns the wall column holding the given color index in a wall line."""
+    return _WALL_COLUMNS[line_index][color]
+
+
+def wall_bit(line_index: int, color: int) -> int:
+    """Returns the wall bitmask bit of the space for a color in a wall line."""
+    return 1 << (line_index * 5 + _WALL_COLUMNS[line_index][color])
+
+
+def histogram(tiles: Sequence[ColoredTile]) -> tuple[int, ...]:
+    """Returns the number of tiles of each color in a tile sequence."""
+    return tuple(tiles.count(color) for color in COLORS)
+
+
+class Move(NamedTuple):
+    """A factory offer move.
+
+    Attributes:
+        pool: Index of the factory display in the position's factories, or
+            CENTER for the table center.
+        color: Index of the selected color in COLORS.
+        line: Index of the destination pattern line, or FLOOR_LINE to place
+            all tiles on the floor line.
+    """
+
+    pool: int
+    color: int
+    line: int
+
+
+def pack_move(move: Optional[Move]) -> int:
+    """Returns a move packed into an unsigned 16-bit integer, or NO_MOVE if
+    there is no move."""
+    if move is None:
+        return NO_MOVE
+    return ((move.pool + 1) << 6) | (move.color << 3) | move.line
+
+
+def unpack_move(packed: int) -> Optional[Move]:
+    """Returns the move packed by pack_move, or None for NO_MOVE."""
+    if packed == NO_MOVE:
+        return None
+    return Move((packed >> 6) - 1, (packed >> 3) & 0b111, packed & 0b111)
+
+
+class BoardPosition(NamedTuple):
+    """Compact representation of a board.
+
+    Attributes:
+        lines: Tile count and color index of each pattern line. The color
+            index of an empty pattern line is -1.
+        wall: Bitmask of populated wall spaces, bit line * 5 + column.
+        floor: Number of colored tiles of each color in the floor line.
+        marker: Whether the floor line holds the starting player marker.
+        score: Value of the score track.
+    """
+
+    lines: tuple[tuple[int, int], ...]
+    wall: int
+    floor: tuple[int, ...]
+    marker: bool
+    score: int
+
+    @staticmethod
+    def from_board(board: Board) -> BoardPosition:
+        """Returns the compact representation of a board."""
+        lines: list[tuple[int, int]] = []
+        for line in board.pattern_lines:
+            match line:
+                case PopulatedPatternLine():
+                    lines.append((line.tile_count, COLORS.index(line.color)))
+                case EmptyPatternLine():
+                    lines.append((0, -1))
+
+        wall = 0
+        for line_index, wall_line in enumerate(board.wall):
+            for column, space in enumerate(wall_line):
+                if isinstance(space, PopulatedWallSpace):
+                    wall |= 1 << (line_index * 5 + column)
+
+        floor_tiles = [
+            tile
+            for tile in board.floor_line.tiles
+            if isinstance(tile, ColoredTile)
+        ]
+
+        return BoardPosition(
+            lines=tuple(lines),
+            wall=wall,
+            floor=histogram(floor_tiles),
+            marker=len(floor_tiles) != len(board.floor_line.tiles),
+            score=board.score_track.score,
+        )
+
+    def to_board(self) -> Board:
+        """Returns the board represented by the compact representation."""
+        pattern_lines: list[PatternLine] = [
+            PopulatedPatternLine.new(count, COLORS[color])
+            if count > 0
+            else EmptyPatternLine()
+            for count, color in self.lines
+        ]
+
+        floor_tiles: list[Tile] = [
+            color
+            for color, count in zip(COLORS, self.floor)
+            for _ in range(count)
+        ]
+        if self.marker:
+            floor_tiles.append(StartingPlayerMarker())
+
+        populated = (
+            (line_index, color)
+            for line_index in range(_LINE_COUNT)
+            for color_index, color in enumerate(COLORS)
+            if self.wall & wall_bit(line_index, color_index)
+        )
+
+        return Board.new(
+            GameScore.new(self.score),
+            PatternLines.new(pattern_lines),
+            FloorLine.new(floor_tiles),
+            Wall.with_populated(populated),
+        )
+
+    def floor_count(self) -> int:
+        """Returns the number of tiles in the floor line."""
+        return sum(self.floor) + self.marker
+
+
+class Position(NamedTuple):
+    """Compact representation of a game in the factory offer phase.
+
+    Factory displays are stored as color counts in sorted order, so positions
+    which only differ in the order of factories or of the tiles within a pool
+    compare equal.
+
+    Attributes:
+        factories: Color counts of each factory display, sorted.
+        center: Color counts of the table center.
+        center_marker: Whether the table center still holds the starting
+            player marker.
+        boards: Compact boards in the same order as the game's boards.
+        to_move: Index of the board to move next.
+    """
+
+    factories: tuple[tuple[int, ...], ...]
+    center: tuple[int, ...]
+    center_marker: bool
+    boards: tuple[BoardPosition, ...]
+    to_move: int
+
+    @staticmethod
+    def from_state(state: State, to_move: int) -> Position:
+        """Returns the compact representation of a game state."""
+        return Position(
+            factories=tuple(
+                sorted(
+                    histogram(factory.tiles)
+                    for factory in state.factory_displays
+                )
+            ),
+            center=histogram(state.table_center.tiles),
+            center_marker=isinstance(state.table_center, UnpickedTableCenter),
+            boards=tuple(
+                BoardPosition.from_board(board) for board in state.boards.boards
+            ),
+            to_move=to_move,
+        )
+
+    @staticmethod
+    def from_game(game: FactoryOffer) -> Position:
+        """Returns the compact representation of a factory offer phase."""
+        return Position.from_state(game.state, game.next_board_index())
+
+    def pool(self, index: int) -> tuple[int, ...]:
+        """Returns the color counts of the pool with the given move index."""
+        return self.center if index == CENTER else self.factories[index]
+
+    def tile_count(self) -> int:
+        """Returns the number of colored tiles left in all pools."""
+        return sum(self.center) + sum(sum(f) for f in self.factories)
+
+
+def position_hash(position: Position) -> int:
+    """Returns a 64-bit hash of a position.
+
+    The hash of a position is the same in every process running the same
+    interpreter, so it can key tables shared between processes.
+    """
+    return hash(position) & _MASK64
+
+
+def legal_moves(position: Position) -> list[Move]:
+    """Returns all moves accepted by the factory offer phase in a position.
+
+    Moves from factory displays with identical contents are only generated
+    once, for the first such factory.
+    """
+    board = position.boards[position.to_move]
+    open_lines: list[list[int]] = [[] for _ in COLORS]
+    for line_index, (count, color) in enumerate(board.lines):
+        if count == 0:
+            for targets in open_lines:
+                targets.append(line_index)
+        else:
+            open_lines[color].append(line_index)
+    for targets in open_lines:
+        targets.append(FLOOR_LINE)
+
+    moves: list[Move] = []
+    previous: tuple[int, ...] = ()
+    for pool_index, factory in enumerate(position.factories):
+        if factory == previous:
+            continue
+        previous = factory
+        for color, count in enumerate(factory):
+            if count > 0:
+                moves.extend(
+                    Move(pool_index, color, line) for line in open_lines[color]
+                )
+
+    for color, count in enumerate(position.center):
+        if count > 0:
+            moves.extend(
+                Move(CENTER, color, line) for line in open_lines[color]
+            )
+
+    return moves
+
+
+def placement(position: Position, move: Move) -> tuple[int, int]:
+    """Returns the number of tiles a move places on its pattern line and the
+    number of tiles, including the starting player marker, it sends to the
+    floor line."""
+    count = position.pool(move.pool)[move.color]
+    placed = 0
+    if move.line != FLOOR_LINE:
+        line_count = position.boards[position.to_move].lines[move.line][0]
+        placed = min(move.line + 1 - line_count, count)
+
+    overflow = count - placed
+    if move.pool == CENTER and position.center_marker:
+        overflow += 1
+    return placed, overflow
+
+
+def _place_tiles(
+    board: BoardPosition, line: int, color: int, count: int, marker: bool
+) -> BoardPosition:
+    lines = board.lines
+    placed = 0
+    if line != FLOOR_LINE:
+        tile_count = lines[line][0]
+        placed = min(line + 1 - tile_count, count)
+        lines = (
+            lines[:line] + ((tile_count + placed, color),) + lines[line + 1 :]
+        )
+
+    floor = list(board.floor)
+    floor[color] += count - placed
+
+    return BoardPosition(
+        lines=lines,
+        wall=board.wall,
+        floor=tuple(floor),
+        marker=board.marker or marker,
+        score=board.score,
+    )
+
+
+def apply_move(position: Position, move: Move) -> Position:
+    """Returns the position after playing a legal move.
+
+    The move is not validated; use legal_moves to generate valid moves.
+    """
+    pool = position.pool(move.pool)
+    count = pool[move.color]
+
+    factories = position.factories
+    center = list(position.center)
+    center_marker = position.center_marker
+    marker = False
+    if move.pool == CENTER:
+        center[move.color] = 0
+        marker, center_marker = center_marker, False
+    else:
+        factories = factories[: move.pool] + factories[move.pool + 1 :]
+        for color, pool_count in enumerate(pool):
+            if color != move.color:
+                center[color] += pool_count
+
+    boards = list(position.boards)
+    boards[position.to_move] = _place_tiles(
+        boards[position.to_move], move.line, move.color, count, marker
+    )
+
+    return Position(
+        factories=factories,
+        center=tuple(center),
+        center_marker=center_marker,
+        boards=tuple(boards),
+        to_move=(position.to_move + 1) % len(boards),
+    )
+
+
+def phase_end(position: Position) -> bool:
+    """Returns boolean indicating if the factory offer phase has ended."""
+    return (
+        len(position.factories) == 0
+        and not position.center_marker
+        and sum(position.center) == 0
+    )
+
+
+def engine_move(
+    state: State, move: Move
+) -> tuple[PickableTilePool, ColoredTile, int]:
+    """Returns the arguments of FactoryOffer.factory_offer for a move.
+
+    Args:
+        state: State of the game the move was generated for.
+        move: Move generated from the compact representation of the state.
+
+    Returns:
+        The tile pool, color and pattern line index of the move.
+    """
+    tile_pool: PickableTilePool
+    if move.pool == CENTER:
+        tile_pool = state.table_center
+    else:
+        factories = sorted(
+            state.factory_displays, key=lambda f: histogram(f.tiles)
+        )
+        tile_pool = factories[move.pool]
+
+    return tile_pool, COLORS[move.color], move.line
+
+
+def play_move(game: FactoryOffer, move: Move) -> FactoryOffer | WallTiling:
+    """Plays a move on a factory offer phase and returns the next phase.
+
+    Raises:
+        ValueError: If the game rejects the move.
+    """
+    next_game = game.factory_offer(*engine_move(game.state, move))
+    if next_game is None:
+        raise ValueError(f"Move rejected by factory offer phase: {move}.")
+
+    return next_game
@@ -0,0 +1,244 @@
+"""Defines the wall tiling, round setup and end of game phases for compact
+positions.
+
+These functions follow the same rules as the wall_tiling, round_setup and
+end_of_game phase functions, so searches can simulate games across round
+boundaries without constructing the core game objects.
+"""
+
+from __future__ import annotations
+from itertools import accumulate
+import random
+from typing import NamedTuple, Sequence
+
+from azulsim.core.board import FloorLine
+from azulsim.core.game import State
+
+from .position import (
+    BoardPosition,
+    COLORS,
+    Position,
+    histogram,
+    wall_bit,
+    wall_column,
+)
+
+
+# Floor penalty by number of floor line tiles, up to a full floor line.
+_FULL_FLOOR_PENALTIES = tuple(
+    accumulate(FloorLine.space_penalties(), initial=0)
+)
+
+"""Wall bitmask of each wall line."""
+ROW_MASKS = tuple(0b11111 << (5 * line) for line in range(5))
+
+"""Wall bitmask of each wall column."""
+COLUMN_MASKS = tuple(
+    sum(1 << (5 * line + column) for line in range(5)) for column in range(5)
+)
+
+"""Wall bitmask of the spaces of each color, indexed like COLORS."""
+COLOR_MASKS = tuple(
+    sum(wall_bit(line, color) for line in range(5)) for color in range(5)
+)
+
+_NO_TILES = (0,) * len(COLORS)
+
+
+class Supply(NamedTuple):
+    """Color counts of the tiles which are neither on a board nor in a pool.
+
+    Attributes:
+        bag: Number of tiles of each color in the tile bag.
+        discard: Number of tiles of each color in the tile discard.
+    """
+
+    bag: tuple[int, ...]
+    discard: tuple[int, ...]
+
+    @staticmethod
+    def from_state(state: State) -> Supply:
+        """Returns the tile counts of the bag and discard of a game state.
+
+        Only the counts are kept, so the order of the tiles in the bag is not
+        revealed to a search using the supply.
+        """
+        return Supply(
+            bag=histogram(state.bag.tiles),
+            discard=histogram(state.discard.tiles),
+        )
+
+
+def floor_penalty(tile_count: int) -> int:
+    """Returns the penalty for a floor line holding the given number of tiles."""
+    return _FULL_FLOOR_PENALTIES[
+        min(tile_count, len(_FULL_FLOOR_PENALTIES) - 1)
+    ]
+
+
+"""Floor line penalty by number of floor line tiles. A board can hold at most
+100 tiles on its floor line."""
+FLOOR_PENALTIES: tuple[int, ...] = tuple(
+    floor_penalty(count) for count in range(101)
+)
+
+
+def _run_length(wall: int, line_index: int, column: int) -> tuple[int, int]:
+    horizontal = 1
+    for step in (-1, 1):
+        index = column + step
+        while 0 <= index < 5 and wall & (1 << (5 * line_index + index)):
+            horizontal += 1
+            index += step
+
+    vertical = 1
+    for step in (-1, 1):
+        index = line_index + step
+        while 0 <= index < 5 and wall & (1 << (5 * index + column)):
+            vertical += 1
+            index += step
+
+    return horizontal, vertical
+
+
+def score_tile(wall: int, line_index: int, column: int) -> int:
+    """Returns the points earned by a newly populated wall space."""
+    horizontal, vertical = _run_length(wall, line_index, column)
+    score = (horizontal if horizontal > 1 else 0) + (
+        vertical if vertical > 1 else 0
+    )
+    return max(score, 1)
+
+
+def tile_board(board: BoardPosition) -> tuple[BoardPosition, tuple[int, ...]]:
+    """Moves tiles from completed pattern lines to the wall and scores them.
+
+    Returns:
+        Tiled board and the number of tiles of each color sent to the discard.
+    """
+    wall = board.wall
+    earned = 0
+    discarded = list(board.floor)
+    lines: list[tuple[int, int]] = []
+    for line_index, (count, color) in enumerate(board.lines):
+        if count != line_index + 1:
+            lines.append((count, color))
+            continue
+
+        bit = wall_bit(line_index, color)
+        if wall & bit:
+            discarded[color] += count
+        else:
+            wall |= bit
+            earned += score_tile(
+                wall, line_index, wall_column(line_index, color)
+            )
+            discarded[color] += count - 1
+        lines.append((0, -1))
+
+    score = board.score + earned + floor_penalty(board.floor_count())
+    tiled = BoardPosition(
+        lines=tuple(lines),
+        wall=wall,
+        floor=_NO_TILES,
+        marker=False,
+        score=max(score, 0),
+    )
+    return tiled, tuple(discarded)
+
+
+def tile_boards(
+    position: Position, supply: Supply
+) -> tuple[tuple[BoardPosition, ...], Supply, int]:
+    """Executes the wall tiling phase for a position whose factory offer
+    phase has ended.
+
+    Returns:
+        Tiled boards, updated supply and the index of the board starting the
+        next round. If no board holds the starting player marker, the board
+        to move keeps the first turn.
+    """
+    starting = next(
+        (index for index, board in enumerate(position.boards) if board.marker),
+        position.to_move,
+    )
+
+    boards: list[BoardPosition] = []
+    discard = list(supply.discard)
+    for board in position.boards:
+        tiled, discarded = tile_board(board)
+        boards.append(tiled)
+        for color, count in enumerate(discarded):
+            discard[color] += count
+
+    return tuple(boards), Supply(supply.bag, tuple(discard)), starting
+
+
+def game_end(boards: Sequence[BoardPosition]) -> bool:
+    """Returns a boolean value indicating whether or not the game has ended."""
+    return any(
+        board.wall & mask == mask for board in boards for mask in ROW_MASKS
+    )
+
+
+def score_bonuses(wall: int) -> int:
+    """Returns the end-of-game bonus points for a wall."""
+    rows = sum(wall & mask == mask for mask in ROW_MASKS)
+    columns = sum(wall & mask == mask for mask in COLUMN_MASKS)
+    colors = sum(wall & mask == mask for mask in COLOR_MASKS)
+    return rows * 2 + columns * 7 + colors * 10
+
+
+def final_scores(boards: Sequence[BoardPosition]) -> tuple[int, ...]:
+    """Returns the score of each board including end-of-game bonuses."""
+    return tuple(board.score + score_bonuses(board.wall) for board in boards)
+
+
+def _draw(counts: list[int], rng: random.Random) -> int:
+    pick = rng.randrange(sum(counts))
+    for color, count in enumerate(counts):
+        if pick < count:
+            counts[color] -= 1
+            return color
+        pick -= count
+
+    raise AssertionError("Drawn tile must be in the bag.")
+
+
+def setup_round(
+    boards: tuple[BoardPosition, ...],
+    starting: int,
+    supply: Supply,
+    rng: random.Random,
+) -> tuple[Position, Supply]:
+    """Executes the round setup phase, drawing tiles uniformly at random.
+
+    When the bag runs out of tiles the discard is emptied into the bag. If
+    both are empty the remaining factory displays are left short or empty.
+
+    Returns:
+        Position at the start of the next factory offer phase and the
+        updated supply.
+    """
+    bag = list(supply.bag)
+    discard = list(supply.discard)
+    factories: list[tuple[int, ...]] = []
+    for _ in range(len(boards) + 1):
+        factory = [0] * len(COLORS)
+        for _ in range(4):
+            if sum(bag) == 0:
+                bag, discard = discard, [0] * len(COLORS)
+            if sum(bag) == 0:
+                break
+            factory[_draw(bag, rng)] += 1
+        if any(factory):
+            factories.append(tuple(factory))
+
+    position = Position(
+        factories=tuple(sorted(factories)),
+        center=_NO_TILES,
+        center_marker=True,
+        boards=boards,
+        to_move=starting,
+    )
+    return position, Supply(tuple(bag), tuple(discard))
@@ -0,0 +1,270 @@
+"""Defines an exact solver for the remainder of a factory offer phase.
+
+After round setup no randomness remains until the next round, so the rest of
+the factory offer phase is a game of perfect information which can be searched
+to its end. Each player is assumed to maximize the margin of their round-end
+score delta over the best opponent; every other player is assumed to minimize
+that margin. With two players this is the usual zero-sum game, which allows
+alpha-beta pruning on the margin. A board without legal moves ends the phase
+as it stands.
+
+Solvers in several processes can share their results through a
+SharedTranspositionTable. Only margins and best moves fit in its records, so
+the score deltas of an exact shared result are recovered by replaying its
+principal variation from the shared best moves, and a result whose variation
+cannot be replayed or does not reach the stored margin is treated as a miss.
+"""
+
+from __future__ import annotations
+from typing import NamedTuple, Optional, TYPE_CHECKING
+
+from azulsim.core.game import FactoryOffer
+from azulsim.core.phases import wall_tiling
+from azulsim.core.tiles import TileDiscard
+
+from .position import (
+    BoardPosition,
+    Move,
+    Position,
+    apply_move,
+    legal_moves,
+    placement,
+    position_hash,
+)
+
+if TYPE_CHECKING:
+    from .tablebase import Tablebase
+    from .transposition import SharedTranspositionTable
+
+
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+_INFINITY = 1 << 16
+
+_MASK64 = (1 << 64) - 1
+
+# Odd multiplier mixing the solving player into shared position hashes.
+_PLAYER_MIX = 0x9E3779B97F4A7C15
+
+
+class _Entry(NamedTuple):
+    value: int
+    bound: int
+    deltas: tuple[int, ...]
+    move: Optional[Move]
+
+
+def margin(deltas: tuple[int, ...], player: int) -> int:
+    """Returns the score delta of a player minus the best opponent delta."""
+    opponents = deltas[:player] + deltas[player + 1 :]
+    return deltas[player] - max(opponents, default=0)
+
+
+class RoundSolver:
+    """Searches the remainder of a factory offer phase exhaustively.
+
+    Results are memoized across calls, so a solver can be reused for the
+    positions that follow the one it was first asked to solve.
+
+    Args:
+        tablebase: Optional tablebase probed for positions late in the round.
+        shared: Optional transposition table shared with solvers in other
+            processes, probed and updated alongside the local table.
+    """
+
+    def __init__(
+        self,
+        tablebase: Optional[Tablebase] = None,
+        shared: Optional[SharedTranspositionTable] = None,
+    ) -> None:
+        self._tablebase = tablebase
+        self._shared = shared
+        self._table: dict[tuple[int, Position], _Entry] = {}
+        self._deltas: dict[BoardPosition, int] = {}
+        self.nodes = 0
+        self.shared_hits = 0
+
+    def solve(self, position: Position) -> dict[Move, tuple[int, ...]]:
+        """Returns the round-end score delta of each board under optimal play
+        after each legal move.
+
+        Args:
+            position: Position to solve, from the perspective of the board to
+                move.
+
+        Returns:
+            Score deltas, in board order, for each legal move. Empty if the
+            phase has ended or the board to move has no legal moves.
+        """
+        player = position.to_move
+        results: dict[Move, tuple[int, ...]] = {}
+        for move in self._ordered_moves(position, None):
+            _, deltas = self._search(
+                apply_move(position, move), player, -_INFINITY, _INFINITY
+            )
+            results[move] = deltas
+
+        return results
+
+    def best_move(self, position: Position) -> Optional[Move]:
+        """Returns the move with the best round-end margin for the board to
+        move, or None if there are no legal moves."""
+        results = self.solve(position)
+        return max(
+            results,
+            key=lambda move: margin(results[move], position.to_move),
+            default=None,
+        )
+
+    def round_deltas(self, position: Position) -> tuple[int, ...]:
+        """Returns the score delta of each board if the round ended now."""
+        return tuple(self._board_delta(board) for board in position.boards)
+
+    def _board_delta(self, board: BoardPosition) -> int:
+        delta = self._deltas.get(board)
+        if delta is None:
+            tiled_board, _ = wall_tiling.tile_board(
+                board.to_board(), TileDiscard.default()
+            )
+            delta = tiled_board.score_track.score - board.score
+            self._deltas[board] = delta
+
+        return delta
+
+    def _ordered_moves(
+        self, position: Position, first: Optional[Move]
+    ) -> list[Move]:
+        def order(move: Move) -> tuple[bool, int, int]:
+            placed, overflow = placement(position, move)
+            return move != first, overflow, -placed
+
+        return sorted(legal_moves(position), key=order)
+
+    def _search(
+        self, position: Position, player: int, alpha: int, beta: int
+    ) -> tuple[int, tuple[int, ...]]:
+        self.nodes += 1
+        if self._tablebase is not None and (
+            len(position.boards) == 2 or position.to_move == player
+        ):
+            # Tablebase outcomes are solved for the board to move, which is
+            # equivalent for both boards of a two-player game.
+            solved = self._tablebase.probe(position)
+            if solved is not None:
+                return margin(solved.deltas, player), solved.deltas
+
+        key = (player, position)
+        entry = self._table.get(key)
+        if entry is None and self._shared is not None:
+            entry = self._probe_shared(position, player)
+        first: Optional[Move] = None
+        if entry is not None:
+            if (
+                entry.bound == _EXACT
+                or (entry.bound == _LOWER and entry.value >= beta)
+                or (entry.bound == _UPPER and entry.value <= alpha)
+            ):
+                return entry.value, entry.deltas
+            first = entry.move
+
+        moves = self._ordered_moves(position, first)
+        if not moves:
+            deltas = self.round_deltas(position)
+            value = margin(deltas, player)
+            self._store(key, _Entry(value, _EXACT, deltas, None))
+            return value, deltas
+
+        maximizing = position.to_move == player
+        window = alpha, beta
+        best_value = -_INFINITY if maximizing else _INFINITY
+        best_deltas: tuple[int, ...] = ()
+        best_move = moves[0]
+        for move in moves:
+            value, deltas = self._search(
+                apply_move(position, move), player, alpha, beta
+            )
+            if maximizing and value > best_value:
+                best_value, best_deltas, best_move = value, deltas, move
+                alpha = max(alpha, value)
+            elif not maximizing and value < best_value:
+                best_value, best_deltas, best_move = value, deltas, move
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= window[0]:
+            bound = _UPPER
+        elif best_value >= window[1]:
+            bound = _LOWER
+        else:
+            bound = _EXACT
+        self._store(key, _Entry(best_value, bound, best_deltas, best_move))
+
+        return best_value, best_deltas
+
+    def _store(self, key: tuple[int, Position], entry: _Entry) -> None:
+        self._table[key] = entry
+        if self._shared is None:
+            return
+
+        player, position = key
+        lower = -_INFINITY if entry.bound == _UPPER else entry.value
+        upper = _INFINITY if entry.bound == _LOWER else entry.value
+        # Results are searched to the end of the round, which is at most as
+        # many moves away as there are tiles left in the pools.
+        self._shared.store(
+            _shared_key(position, player),
+            lower,
+            upper,
+            position.tile_count(),
+            entry.move,
+        )
+
+    def _probe_shared(
+        self, position: Position, player: int
+    ) -> Optional[_Entry]:
+        assert self._shared is not None, "Shared table must be set."
+        stored = self._shared.probe(_shared_key(position, player))
+        if stored is None:
+            return None
+
+        if stored.lower == -_INFINITY:
+            return _Entry(int(stored.upper), _UPPER, (), stored.move)
+        if stored.upper == _INFINITY:
+            return _Entry(int(stored.lower), _LOWER, (), stored.move)
+
+        # Bounds are only ever returned with the deltas of a refuted line,
+        # but exact values need the deltas of their principal variation.
+        value = int(stored.lower)
+        deltas = self._principal_deltas(position, player)
+        if deltas is None or margin(deltas, player) != value:
+            return None
+
+        self.shared_hits += 1
+        entry = _Entry(value, _EXACT, deltas, stored.move)
+        self._table[(player, position)] = entry
+        return entry
+
+    def _principal_deltas(
+        self, position: Position, player: int
+    ) -> Optional[tuple[int, ...]]:
+        assert self._shared is not None, "Shared table must be set."
+        while legal_moves(position):
+            stored = self._shared.probe(_shared_key(position, player))
+            if stored is None or stored.move is None:
+                return None
+            position = apply_move(position, stored.move)
+
+        return self.round_deltas(position)
+
+
+def _shared_key(position: Position, player: int) -> int:
+    return position_hash(position) ^ ((player + 1) * _PLAYER_MIX & _MASK64)
+
+
+def solve_round(game: FactoryOffer) -> dict[Move, tuple[int, ...]]:
+    """Returns the round-end score delta of each board under optimal play
+    after each legal move of the board to move in a factory offer phase."""
+    return RoundSolver().solve(Position.from_game(game))
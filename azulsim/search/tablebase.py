@@ -0,0 +1,208 @@
+"""Defines a disk-backed tablebase of solved late-round positions.
+
+A tablebase file is an open-addressing hash table of fixed-size records which
+is memory-mapped for reading, so probing a position costs one hash and a few
+record reads regardless of the size of the table. Positions are keyed by a
+canonical encoding of the pools and of the board state relevant to the
+round-end score deltas. Records hold a 64-bit hash of the key, locating the
+record, and a second 32-bit hash of it, so that two positions whose 64-bit
+hashes collide are told apart and a probe never returns the outcome of
+another position.
+"""
+
+from __future__ import annotations
+from hashlib import blake2b
+import mmap
+import os
+import struct
+from typing import Iterable, NamedTuple, Optional
+
+from .position import Move, Position, apply_move, legal_moves
+from .solver import RoundSolver, margin
+
+
+_MAGIC = b"AZULTB02"
+_HEADER = struct.Struct("<8sIII")
+_HEADER_SIZE = 32
+_RECORD = struct.Struct("<QI4bbBBx")
+_MAX_PLAYERS = 4
+
+# A score track at or above the largest floor penalty can not be clamped at
+# zero, so higher scores do not change round-end score deltas.
+_SCORE_CAP = 14
+
+
+class TablebaseEntry(NamedTuple):
+    """Solved outcome of a position.
+
+    Attributes:
+        deltas: Round-end score delta of each board under optimal play.
+        move: Optimal move for the board to move.
+    """
+
+    deltas: tuple[int, ...]
+    move: Move
+
+
+def round_key(position: Position) -> bytes:
+    """Returns a canonical encoding of the parts of a position which determine
+    the outcome of the rest of its round."""
+    key = bytearray(
+        (len(position.boards), position.to_move, position.center_marker)
+    )
+    key.append(len(position.factories))
+    for factory in position.factories:
+        key.extend(factory)
+    key.extend(position.center)
+
+    for board in position.boards:
+        for count, color in board.lines:
+            key.extend((count, color + 1))
+        key.extend(board.wall.to_bytes(4, "little"))
+        key.extend(
+            (
+                board.floor_count(),
+                board.marker,
+                min(board.score, _SCORE_CAP),
+            )
+        )
+
+    return bytes(key)
+
+
+def _offset(index: int) -> int:
+    return _HEADER_SIZE + index * _RECORD.size
+
+
+def _hashes(key: bytes) -> tuple[int, int]:
+    # Returns the 64-bit hash locating a record, where zero marks an empty
+    # record, and the 32-bit hash verifying it.
+    digest = blake2b(key, digest_size=12).digest()
+    return int.from_bytes(digest[:8], "little") or 1, int.from_bytes(
+        digest[8:], "little"
+    )
+
+
+class Tablebase:
+    """Read-only view of a tablebase file."""
+
+    def __init__(self, file: mmap.mmap) -> None:
+        magic, max_tiles, capacity, count = _HEADER.unpack_from(file, 0)
+        if magic != _MAGIC:
+            raise ValueError("File is not a tablebase.")
+
+        self._file = file
+        self._mask = capacity - 1
+        self._count = count
+        self.max_tiles = max_tiles
+
+    @staticmethod
+    def open(path: str | os.PathLike[str]) -> Tablebase:
+        """Returns the tablebase stored in a file, memory-mapped for reading."""
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return Tablebase(mapped)
+
+    def probe(self, position: Position) -> Optional[TablebaseEntry]:
+        """Returns the solved outcome of a position if it is in the table."""
+        if position.tile_count() > self.max_tiles:
+            return None
+
+        key, check = _hashes(round_key(position))
+        index = key & self._mask
+        while True:
+            record = _RECORD.unpack_from(self._file, _offset(index))
+            if record[0] == 0:
+                return None
+            if record[0] == key and record[1] == check:
+                deltas = record[2 : 2 + len(position.boards)]
+                return TablebaseEntry(deltas=deltas, move=Move(*record[6:]))
+            index = (index + 1) & self._mask
+
+    def close(self) -> None:
+        """Unmaps the tablebase file."""
+        self._file.close()
+
+    def __len__(self) -> int:
+        """Returns the number of positions in the tablebase."""
+        return self._count
+
+    def __enter__(self) -> Tablebase:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+def _solve_reachable(
+    roots: Iterable[Position], max_tiles: int, solver: RoundSolver
+) -> dict[tuple[int, int], TablebaseEntry]:
+    entries: dict[tuple[int, int], TablebaseEntry] = {}
+    visited: set[Position] = set()
+    pending = list(roots)
+    while pending:
+        position = pending.pop()
+        if position in visited:
+            continue
+        visited.add(position)
+
+        moves = legal_moves(position)
+        pending.extend(apply_move(position, move) for move in moves)
+        if not moves or position.tile_count() > max_tiles:
+            continue
+
+        results = solver.solve(position)
+        move = max(
+            results, key=lambda move: margin(results[move], position.to_move)
+        )
+        entries[_hashes(round_key(position))] = TablebaseEntry(
+            deltas=results[move], move=move
+        )
+
+    return entries
+
+
+def build_tablebase(
+    path: str | os.PathLike[str],
+    roots: Iterable[Position],
+    max_tiles: int,
+) -> int:
+    """Solves every position with at most max_tiles tiles left in its pools
+    which is reachable from the root positions and writes them to a file.
+
+    Positions with more tiles left are only traversed, so the roots should
+    already be late in their rounds.
+
+    Args:
+        path: Destination tablebase file.
+        roots: Positions from which to enumerate reachable positions.
+        max_tiles: Largest number of tiles left in the pools of a stored
+            position.
+
+    Returns:
+        Number of positions written to the tablebase.
+    """
+    entries = _solve_reachable(roots, max_tiles, RoundSolver())
+
+    capacity = 1
+    while capacity < 2 * len(entries) + 1:
+        capacity *= 2
+    mask = capacity - 1
+
+    buffer = bytearray(_HEADER_SIZE + capacity * _RECORD.size)
+    _HEADER.pack_into(buffer, 0, _MAGIC, max_tiles, capacity, len(entries))
+    for (key, check), entry in entries.items():
+        index = key & mask
+        while _RECORD.unpack_from(buffer, _offset(index))[0] != 0:
+            index = (index + 1) & mask
+
+        deltas = entry.deltas + (0,) * (_MAX_PLAYERS - len(entry.deltas))
+        _RECORD.pack_into(
+            buffer, _offset(index), key, check, *deltas, *entry.move
+        )
+
+    with open(path, "wb") as file:
+        file.write(buffer)
+
+    return len(entries)
@@ -0,0 +1,164 @@
+"""Defines wall-clock deadlines for anytime searches and a time manager which
+splits a game clock across the moves of a game.
+
+An anytime search keeps a best move ready at all times and checks its
+deadline between units of work, so it returns on time regardless of the
+position it was given. The time manager decides how long each search may run
+from an estimate of the number of moves the player has left to play.
+"""
+
+from __future__ import annotations
+import math
+import time
+from typing import Optional
+
+from .position import COLORS, Position
+
+
+_LINE_COUNT = 5
+_ROW_MASK = 0b11111
+
+
+class Deadline:
+    """A point in wall-clock time by which a search must return.
+
+    Args:
+        end: Value of time.monotonic at which the deadline expires.
+        start: Value of time.monotonic at which the search started. Defaults
+            to now.
+    """
+
+    def __init__(self, end: float, start: Optional[float] = None) -> None:
+        self.start = time.monotonic() if start is None else start
+        self.end = end
+
+    @staticmethod
+    def after(seconds: float) -> Deadline:
+        """Returns a deadline expiring the given number of seconds from now."""
+        now = time.monotonic()
+        return Deadline(now + seconds, start=now)
+
+    def remaining(self) -> float:
+        """Returns the number of seconds left before the deadline, or zero if
+        it has expired."""
+        return max(self.end - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        """Returns a boolean value indicating whether the deadline has passed."""
+        return time.monotonic() >= self.end
+
+    def elapsed(self) -> float:
+        """Returns the number of seconds since the deadline was created."""
+        return time.monotonic() - self.start
+
+
+def moves_left_in_round(position: Position) -> int:
+    """Returns an estimate of the number of moves the board to move has left
+    to play in the current round, including the next one.
+
+    Every factory display is picked exactly once, and every color which is or
+    will be sent to the table center is picked from it once, so the number of
+    moves left for all boards is at most the number of factory displays plus
+    the number of colors left in any pool.
+    """
+    colors = sum(
+        position.center[color] > 0
+        or any(factory[color] > 0 for factory in position.factories)
+        for color in range(len(COLORS))
+    )
+    moves = len(position.factories) + colors
+    return max(math.ceil(moves / len(position.boards)), 1)
+
+
+def rounds_left(position: Position) -> int:
+    """Returns an estimate of the number of rounds left in the game, including
+    the current round.
+
+    The game ends after a wall line has been completed, and a wall line can
+    gain at most one tile per round, so the fullest wall line gives the
+    number of rounds the game can last at least.
+    """
+    fullest = max(
+        (board.wall >> (5 * line)) & _ROW_MASK
+        for board in position.boards
+        for line in range(_LINE_COUNT)
+    )
+    return max(_LINE_COUNT - fullest.bit_count(), 1)
+
+
+def moves_left(position: Position) -> int:
+    """Returns an estimate of the number of moves the board to move has left
+    to play in the game, including the next one."""
+    factory_count = len(position.boards) + 1
+    moves_per_round = math.ceil(
+        (factory_count + len(COLORS)) / len(position.boards)
+    )
+    return (
+        moves_left_in_round(position)
+        + (rounds_left(position) - 1) * moves_per_round
+    )
+
+
+class TimeManager:
+    """Splits the game clock of a player across their moves.
+
+    Each move is given an equal share of the remaining clock over the
+    estimated number of moves left in the game, plus the increment, but never
+    more than a fixed fraction of the remaining clock.
+
+    Args:
+        clock: Seconds on the player's clock at the start of the game.
+        increment: Seconds added to the clock after every move.
+        overhead: Seconds kept back from every move for the time it takes to
+            return and play the selected move.
+        max_fraction: Largest fraction of the remaining clock to give to a
+            single move.
+    """
+
+    def __init__(
+        self,
+        clock: float,
+        increment: float = 0.0,
+        overhead: float = 0.01,
+        max_fraction: float = 0.5,
+    ) -> None:
+        self.remaining = clock
+        self._increment = increment
+        self._overhead = overhead
+        self._max_fraction = max_fraction
+        self._deadline: Optional[Deadline] = None
+
+    def budget(self, position: Position) -> float:
+        """Returns the number of seconds to spend searching a position."""
+        share = self.remaining / moves_left(position) + self._increment
+        budget = min(share, self.remaining * self._max_fraction)
+        return max(budget - self._overhead, 0.0)
+
+    def start(self, position: Position) -> Deadline:
+        """Starts the clock for a move and returns the deadline of its search.
+
+        Raises:
+            ValueError: If the clock is already running.
+        """
+        if self._deadline is not None:
+            raise ValueError("Clock is already running.")
+
+        self._deadline = Deadline.after(self.budget(position))
+        return self._deadline
+
+    def stop(self) -> float:
+        """Stops the clock after a move has been played.
+
+        Returns:
+            Number of seconds the move took.
+
+        Raises:
+            ValueError: If the clock is not running.
+        """
+        if self._deadline is None:
+            raise ValueError("Clock is not running.")
+
+        elapsed = self._deadline.elapsed()
+        self.remaining = max(self.remaining - elapsed, 0.0) + self._increment
+        self._deadline = None
+        return elapsed
@@ -0,0 +1,219 @@
+"""Defines a transposition table shared between search processes.
+
+The table is a fixed-size array of records in a multiprocessing shared memory
+block. Records are grouped into buckets of four, and every bucket is guarded by
+one of a fixed number of striped locks, so concurrent writers only contend
+when they touch buckets which share a stripe. The table can be passed to
+worker processes when they are created, for example as an argument of
+multiprocessing.Process or a Pool initializer.
+"""
+
+from __future__ import annotations
+import multiprocessing
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Lock as LockType
+import struct
+from typing import NamedTuple, Optional
+
+from azulsim.shm import attach_shared_memory
+
+from .position import Move, pack_move, unpack_move
+
+
+_HEADER = struct.Struct("<II")
+_HEADER_SIZE = 16
+_RECORD = struct.Struct("<QffIHBB")
+_BUCKET_SIZE = 4
+
+_MASK64 = (1 << 64) - 1
+
+
+class TableEntry(NamedTuple):
+    """Record stored for a position in a transposition table.
+
+    Attributes:
+        lower: Lower bound of the position value.
+        upper: Upper bound of the position value.
+        visits: Number of times the position has been visited.
+        depth: Search depth the bounds were computed with.
+        move: Best move found, if any.
+    """
+
+    lower: float
+    upper: float
+    visits: int
+    depth: int
+    move: Optional[Move]
+
+
+class SharedTranspositionTable:
+    """Fixed-size transposition table in shared memory keyed by 64-bit
+    position hashes.
+
+    When a bucket is full, a new position replaces the record which is the
+    least valuable to keep: records from an earlier search generation first,
+    then records searched to a lower depth, then records with fewer visits.
+    """
+
+    def __init__(
+        self, memory: SharedMemory, locks: tuple[LockType, ...], owner: bool
+    ) -> None:
+        buffer = memory.buf
+        assert buffer is not None, "Shared memory block must be open."
+        bucket_count, _ = _HEADER.unpack_from(buffer, 0)
+        self._memory = memory
+        self._buffer = buffer
+        self._locks = locks
+        self._owner = owner
+        self._bucket_mask = bucket_count - 1
+
+    @staticmethod
+    def create(
+        capacity: int,
+        stripes: int = 64,
+        context: Optional[BaseContext] = None,
+    ) -> SharedTranspositionTable:
+        """Returns a new, empty table.
+
+        Args:
+            capacity: Minimum number of records. Rounded up to a power of two
+                number of buckets.
+            stripes: Number of locks guarding the buckets.
+            context: Multiprocessing context of the worker processes. Defaults
+                to the default context.
+        """
+        context = context or multiprocessing.get_context()
+        bucket_count = 1
+        while bucket_count * _BUCKET_SIZE < capacity:
+            bucket_count *= 2
+
+        size = _HEADER_SIZE + bucket_count * _BUCKET_SIZE * _RECORD.size
+        memory = SharedMemory(create=True, size=size)
+        assert memory.buf is not None, "Shared memory block must be open."
+        memory.buf[:size] = bytes(size)
+        _HEADER.pack_into(memory.buf, 0, bucket_count, 0)
+
+        locks = tuple(context.Lock() for _ in range(stripes))
+        return SharedTranspositionTable(memory, locks, owner=True)
+
+    @property
+    def generation(self) -> int:
+        """Returns the current search generation."""
+        return _HEADER.unpack_from(self._buffer, 0)[1]
+
+    def new_generation(self) -> None:
+        """Starts a new search generation, marking existing records as old.
+
+        Should only be called while no other process is writing to the table.
+        """
+        bucket_count, generation = _HEADER.unpack_from(self._buffer, 0)
+        _HEADER.pack_into(
+            self._buffer, 0, bucket_count, (generation + 1) & 0xFF
+        )
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        """Returns the record stored for a position hash, if any."""
+        key = key & _MASK64 or 1
+        bucket = key & self._bucket_mask
+        with self._lock(bucket):
+            for offset in self._offsets(bucket):
+                record = _RECORD.unpack_from(self._buffer, offset)
+                if record[0] == key:
+                    _, lower, upper, visits, move, depth, _ = record
+                    return TableEntry(
+                        lower, upper, visits, depth, unpack_move(move)
+                    )
+
+        return None
+
+    def store(
+        self,
+        key: int,
+        lower: float,
+        upper: float,
+        depth: int,
+        move: Optional[Move] = None,
+        visits: int = 1,
+    ) -> None:
+        """Stores a record for a position hash.
+
+        If the position is already stored, the visits are added to the stored
+        visits and the bounds are replaced unless they were computed with a
+        deeper search.
+
+        Args:
+            key: 64-bit hash of the position.
+            lower: Lower bound of the position value.
+            upper: Upper bound of the position value.
+            depth: Search depth the bounds were computed with.
+            move: Best move found, if any.
+            visits: Number of visits to add.
+        """
+        key = key & _MASK64 or 1
+        bucket = key & self._bucket_mask
+        generation = self.generation
+        buffer = self._buffer
+        with self._lock(bucket):
+            target = None
+            target_worth: tuple[bool, int, int] = (True, 256, 1 << 32)
+            for offset in self._offsets(bucket):
+                stored_key, *stored = _RECORD.unpack_from(buffer, offset)
+                stored_lower, stored_upper, stored_visits = stored[:3]
+                stored_move, stored_depth, stored_generation = stored[3:]
+                if stored_key == key:
+                    if depth < stored_depth:
+                        lower, upper = stored_lower, stored_upper
+                        depth = stored_depth
+                    if move is None:
+                        move = unpack_move(stored_move)
+                    visits += stored_visits
+                    target = offset
+                    break
+
+                worth = (
+                    stored_generation == generation,
+                    stored_depth,
+                    stored_visits,
+                )
+                if stored_key == 0:
+                    worth = (False, -1, 0)
+                if worth < target_worth:
+                    target, target_worth = offset, worth
+
+            assert target is not None, "Bucket must have a replaceable record."
+            _RECORD.pack_into(
+                buffer,
+                target,
+                key,
+                lower,
+                upper,
+                min(visits, 0xFFFFFFFF),
+                pack_move(move),
+                min(depth, 0xFF),
+                generation,
+            )
+
+    def close(self) -> None:
+        """Detaches the table from this process."""
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Frees the shared memory block. Only valid in the creating process."""
+        if not self._owner:
+            raise ValueError("Only the creating process can unlink the table.")
+        self._memory.unlink()
+
+    def _lock(self, bucket: int) -> LockType:
+        return self._locks[bucket % len(self._locks)]
+
+    def _offsets(self, bucket: int) -> range:
+        start = _HEADER_SIZE + bucket * _BUCKET_SIZE * _RECORD.size
+        return range(start, start + _BUCKET_SIZE * _RECORD.size, _RECORD.size)
+
+    def __getstate__(self) -> tuple[str, tuple[LockType, ...]]:
+        return self._memory.name, self._locks
+
+    def __setstate__(self, state: tuple[str, tuple[LockType, ...]]) -> None:
+        name, locks = state
+        self.__init__(attach_shared_memory(name), locks, owner=False)  # type: ignore[misc]
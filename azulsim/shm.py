@@ -0,0 +1,13 @@
+"""Defines helpers for shared memory blocks used across processes."""
+
+from multiprocessing.shared_memory import SharedMemory
+import sys
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """Returns an existing shared memory block opened by name, without
+    letting this process unlink it when it exits, which only the creating
+    process may do."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
@@ -0,0 +1,4 @@
+"""Runners playing many complete games."""
+
+from .many import *  # noqa: F403
+from .threads import *  # noqa: F403
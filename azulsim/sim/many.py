@@ -0,0 +1,154 @@
+"""Defines a single entry point playing many games and returning their results
+as columns of NumPy arrays.
+
+Games are split into chunks which are played by a pool of worker processes,
+each chunk with the threaded runner of azulsim.sim.threads, so the games use
+every core with or without the global interpreter lock. Only the compact
+game records cross the process boundary, and they are gathered into one
+array per result.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing.context import BaseContext
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.bots.bot import BotFactory
+
+from .threads import GameRecord, run_games
+
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+_LINE_COUNT = 5
+_CHUNKS_PER_WORKER = 4
+
+
+class SimulationResults(NamedTuple):
+    """Results of many games, one row per game in the order of the seeds.
+
+    Attributes:
+        seeds: Seed of each game, shape (N,).
+        scores: Final score of each seat, shape (N, P).
+        rounds: Number of rounds played, shape (N,).
+        walls: Populated wall spaces of each seat at the end of the game, by
+            wall line and column, shape (N, P, 5, 5).
+        moves: Pool, color and line of every move played, in the order they
+            were played, shape (M, 3), where the pool is an index into the
+            sorted factory displays or -1 for the table center. None unless
+            moves were recorded.
+        move_offsets: Moves of game i are moves[move_offsets[i] :
+            move_offsets[i + 1]], shape (N + 1,). None unless moves were
+            recorded.
+    """
+
+    seeds: IntArray
+    scores: IntArray
+    rounds: IntArray
+    walls: BoolArray
+    moves: Optional[IntArray] = None
+    move_offsets: Optional[IntArray] = None
+
+
+def _play_chunk(
+    seeds: Sequence[int],
+    policies: Sequence[BotFactory],
+    record_moves: bool,
+) -> list[GameRecord]:
+    return run_games(seeds, policies, threads=1, record_moves=record_moves)
+
+
+def _columns(
+    records: Sequence[GameRecord], player_count: int, record_moves: bool
+) -> SimulationResults:
+    walls = np.array(
+        [record.walls for record in records], dtype=np.int64
+    ).reshape(len(records), player_count)
+    bits = (walls[..., None] >> np.arange(_LINE_COUNT**2)) & 1
+    results = SimulationResults(
+        seeds=np.array([record.seed for record in records], dtype=np.int64),
+        scores=np.array(
+            [record.scores for record in records], dtype=np.int64
+        ).reshape(len(records), player_count),
+        rounds=np.array([record.rounds for record in records], dtype=np.int64),
+        walls=bits.reshape(
+            len(records), player_count, _LINE_COUNT, _LINE_COUNT
+        ).astype(np.bool_),
+    )
+    if not record_moves:
+        return results
+
+    counts = [len(record.moves or ()) for record in records]
+    moves = np.array(
+        [move for record in records for move in record.moves or ()],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+    return results._replace(moves=moves, move_offsets=offsets)
+
+
+def simulate_many(
+    seeds: Sequence[int],
+    policies: Sequence[BotFactory],
+    player_count: Optional[int] = None,
+    workers: int = 1,
+    record_moves: bool = False,
+    context: Optional[BaseContext] = None,
+) -> SimulationResults:
+    """Plays a game for each seed and returns the results as arrays.
+
+    Results only depend on the seeds and policies, not on the number of
+    workers.
+
+    Args:
+        seeds: Seed of each game.
+        policies: Returns the player of each seat given a seed, in seat
+            order. Must be picklable when more than one worker is used.
+        player_count: Number of players in every game. Defaults to the
+            number of policies.
+        workers: Number of worker processes. With a single worker, games are
+            played in the calling process.
+        record_moves: Whether to record the moves of every game.
+        context: Multiprocessing context of the worker processes. Defaults
+            to the default context.
+
+    Returns:
+        Results of every game, in the order of the seeds.
+
+    Raises:
+        ValueError: If the number of policies differs from the number of
+            players.
+    """
+    player_count = player_count or len(policies)
+    if len(policies) != player_count:
+        raise ValueError("Every seat must have exactly one policy.")
+
+    seeds = [int(seed) for seed in seeds]
+    if workers <= 1 or len(seeds) <= 1:
+        records = _play_chunk(seeds, policies, record_moves)
+        return _columns(records, player_count, record_moves)
+
+    chunk_size = -(-len(seeds) // (workers * _CHUNKS_PER_WORKER))
+    chunks = [
+        seeds[start : start + chunk_size]
+        for start in range(0, len(seeds), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        workers, mp_context=context or multiprocessing.get_context()
+    ) as pool:
+        records = [
+            record
+            for chunk_records in pool.map(
+                _play_chunk,
+                chunks,
+                [policies] * len(chunks),
+                [record_moves] * len(chunks),
+            )
+            for record in chunk_records
+        ]
+
+    return _columns(records, player_count, record_moves)
@@ -0,0 +1,123 @@
+"""Defines a runner playing complete games in a pool of threads.
+
+Every game owns its phase objects, its random number generator and its
+players, so games share no game state. The module-level caches of the
+search and bots are bounded functools.lru_cache caches of read-only values.
+On builds with the global interpreter lock one thread runs Python code at a
+time. The free-threading workflow in .github/workflows runs the tests and
+apps/thread_scaling.py on python3.13t with the lock disabled, and fails
+unless the games are played at least 1.5 times faster with more threads.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from typing import NamedTuple, Optional, Sequence
+
+from azulsim.bots.bot import Bot, BotFactory
+from azulsim.core.game import (
+    FactoryOffer,
+    GameEnd,
+    RoundSetup,
+    WallTiling,
+    new_game,
+)
+from azulsim.search.position import BoardPosition, Move, play_move
+
+
+class GameRecord(NamedTuple):
+    """Result of a complete game.
+
+    Attributes:
+        seed: Seed of the game.
+        scores: Final score of each board, including end-of-game bonuses.
+        rounds: Number of rounds played.
+        walls: Populated wall spaces of each board at the end of the game,
+            with bit line * 5 + column set for each populated space.
+        moves: Moves played in order, if they were recorded.
+    """
+
+    seed: int
+    scores: tuple[int, ...]
+    rounds: int
+    walls: tuple[int, ...]
+    moves: Optional[tuple[Move, ...]] = None
+
+
+def gil_enabled() -> bool:
+    """Returns whether the global interpreter lock serializes threads."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+def play_game(
+    seed: int, bots: Sequence[Bot], record_moves: bool = False
+) -> GameRecord:
+    """Plays a complete game.
+
+    Args:
+        seed: Seed of the game's tile draws.
+        bots: Player of each board, in board order.
+        record_moves: Whether to record the moves played.
+    """
+    game: FactoryOffer | WallTiling | RoundSetup | GameEnd = new_game(
+        player_count=len(bots), seed=seed
+    )
+    moves: list[Move] = []
+    rounds = 1
+    while True:
+        match game:
+            case FactoryOffer():
+                move = bots[game.next_board_index()].select_move(game)
+                if record_moves:
+                    moves.append(move)
+                game = play_move(game, move)
+            case WallTiling():
+                game = game.tile_boards()
+            case RoundSetup():
+                game = game.round_setup()
+                rounds += 1
+            case GameEnd():
+                boards = game.score_bonuses().boards.boards
+                return GameRecord(
+                    seed=seed,
+                    scores=tuple(board.score_track.score for board in boards),
+                    rounds=rounds,
+                    walls=tuple(
+                        BoardPosition.from_board(board).wall for board in boards
+                    ),
+                    moves=tuple(moves) if record_moves else None,
+                )
+
+
+def run_games(
+    seeds: Sequence[int],
+    bot_factories: Sequence[BotFactory],
+    threads: Optional[int] = None,
+    record_moves: bool = False,
+) -> list[GameRecord]:
+    """Plays a game for each seed in a pool of threads.
+
+    The players of each game are built for that game only, seeded from the
+    seed of the game and their board index, so results do not depend on the
+    number of threads.
+
+    Args:
+        seeds: Seed of each game.
+        bot_factories: Returns the player of each board, in board order.
+        threads: Number of threads. Defaults to the number of CPUs.
+        record_moves: Whether to record the moves played.
+
+    Returns:
+        Record of each game, in the order of the seeds.
+    """
+
+    def play(seed: int) -> GameRecord:
+        bots = [
+            factory(seed * len(bot_factories) + board_index)
+            for board_index, factory in enumerate(bot_factories)
+        ]
+        return play_game(seed, bots, record_moves)
+
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(play, seeds))
@@ -0,0 +1,134 @@
+"""Contains unit tests for the azulsim.batch.features module."""
+
+import copy
+
+import numpy as np
+import pytest
+
+from azulsim.batch import (
+    BatchGame,
+    encode_action,
+    encode_batch,
+    encode_states,
+    feature_count,
+)
+from azulsim.core import FactoryOffer, new_game
+from azulsim.search.position import Position, legal_moves, play_move
+
+
+def _played_batch(player_count: int, steps: int, seed: int) -> BatchGame:
+    batch = BatchGame.new(16, player_count, seed=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(steps):
+        mask = batch.legal_mask()
+        batch.step((rng.random(mask.shape) * mask).argmax(1))
+    return batch
+
+
+@pytest.mark.parametrize("player_count", [2, 3, 4])
+def test_shape_and_range(player_count: int) -> None:
+    """Tests that features have a fixed shape and that board features lie
+    in the unit interval."""
+    batch = _played_batch(player_count, 10, player_count)
+
+    features = encode_batch(batch)
+
+    assert features.dtype == np.float32
+    assert features.shape == (16, feature_count(player_count))
+    assert np.all(features >= 0.0)
+    boards = features[:, : player_count * 58]
+    assert np.all(boards <= 1.0)
+
+
+def test_writes_into_buffer() -> None:
+    """Tests that features are written into a given output buffer."""
+    batch = _played_batch(2, 5, 0)
+    out = np.full((16, feature_count(2)), np.nan, dtype=np.float32)
+
+    features = encode_batch(batch, out)
+
+    assert features is out
+    assert np.array_equal(out, encode_batch(batch))
+
+
+def test_invalid_buffer() -> None:
+    """Tests that an output buffer of the wrong shape or dtype is rejected."""
+    batch = _played_batch(2, 0, 0)
+
+    with pytest.raises(ValueError):
+        encode_batch(batch, np.empty((16, 3), dtype=np.float32))
+    with pytest.raises(ValueError):
+        encode_batch(batch, np.empty((16, feature_count(2)), dtype=np.float64))
+
+
+def test_boards_relative_to_player_to_move() -> None:
+    """Tests that boards are encoded starting with the board to move."""
+    batch = _played_batch(3, 7, 1)
+    features = encode_batch(batch)
+
+    positions = [batch.position(index) for index in range(len(batch))]
+    rotated = BatchGame.from_positions(
+        [
+            position._replace(
+                boards=position.boards[position.to_move :]
+                + position.boards[: position.to_move],
+                to_move=0,
+            )
+            for position in positions
+        ],
+        [batch.supply(index) for index in range(len(batch))],
+    )
+
+    boards = 3 * (25 + 5 + 25 + 3)
+    assert np.array_equal(
+        encode_batch(rotated)[:, :boards], features[:, :boards]
+    )
+
+
+def test_factory_slots_match_actions() -> None:
+    """Tests that the actions of pool k take from the factory display
+    encoded in observation slot k."""
+    player_count = 3
+    batch = _played_batch(player_count, 2, 2)
+    offset = player_count * (25 + 5 + 25 + 3)
+    features = encode_batch(batch)
+    mask = batch.legal_mask()
+
+    for pool in range(batch.factory_count):
+        slot = features[:, offset + 5 * pool : offset + 5 * (pool + 1)]
+        for color in range(5):
+            action = encode_action(pool, color, 5)
+            taken = slot[:, color] * 4
+            assert np.array_equal(mask[:, action], taken > 0)
+            stepped = copy.deepcopy(batch)
+            games = np.flatnonzero(mask[:, action])
+            stepped.step(np.where(mask[:, action], action, mask.argmax(1)))
+            floors = stepped.floors.sum(2)[games] - batch.floors.sum(2)[games]
+            assert np.array_equal(floors.sum(1), taken[games])
+
+
+def test_wall_features() -> None:
+    """Tests that the wall of the board to move is encoded first."""
+    batch = _played_batch(2, 0, 0)
+    batch.walls[0, 0, 2, 3] = True
+
+    features = encode_batch(batch)
+
+    assert features[0, 2 * 5 + 3] == 1.0
+    assert features[0, :25].sum() == 1.0
+
+
+def test_encode_states_matches_batch() -> None:
+    """Tests that game states are encoded like the same games in a batch."""
+    games = [new_game(player_count=2, seed=seed) for seed in range(3)]
+    next_game = play_move(
+        games[2], legal_moves(Position.from_game(games[2]))[0]
+    )
+    assert isinstance(next_game, FactoryOffer)
+    games[2] = next_game
+    states = [game.state for game in games]
+    to_move = [game.next_board_index() for game in games]
+
+    batch = BatchGame.from_games(games)
+
+    assert np.array_equal(encode_states(states, to_move), encode_batch(batch))
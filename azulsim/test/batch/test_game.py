@@ -0,0 +1,153 @@
+"""Contains unit tests for the azulsim.batch.game module."""
+
+import numpy as np
+import pytest
+
+from azulsim.batch import (
+    BatchGame,
+    action_count,
+    decode_action,
+    encode_action,
+)
+from azulsim.core import new_game
+from azulsim.search.position import (
+    Position,
+    apply_move,
+    legal_moves,
+    phase_end,
+)
+from azulsim.search.rounds import (
+    Supply,
+    final_scores,
+    game_end,
+    tile_boards,
+)
+
+
+def test_action_round_trip() -> None:
+    """Tests that every action decodes to the pool, color and line it was
+    encoded from."""
+    actions = [
+        encode_action(pool, color, line)
+        for pool in range(4)
+        for color in range(5)
+        for line in range(6)
+    ]
+
+    assert actions == list(range(action_count(2)))
+    for action in actions:
+        assert encode_action(*decode_action(action)) == action
+
+
+def test_new_games() -> None:
+    """Tests that new games have full factory displays drawn from the bag."""
+    batch = BatchGame.new(16, player_count=3, seed=0)
+
+    assert batch.factories.shape == (16, 4, 5)
+    assert np.all(batch.factories.sum(2) == 4)
+    assert np.all(batch.bag + batch.factories.sum(1) == 20)
+    assert np.all(batch.center_marker)
+    assert not batch.done.any()
+
+
+def test_from_positions_round_trip() -> None:
+    """Tests that a batch holds the compact positions it was created from."""
+    games = [new_game(player_count=2, seed=seed) for seed in range(4)]
+    positions = [Position.from_game(game) for game in games]
+    supplies = [Supply.from_state(game.state) for game in games]
+
+    batch = BatchGame.from_positions(positions, supplies)
+
+    for index, (position, supply) in enumerate(zip(positions, supplies)):
+        assert batch.position(index) == position
+        assert batch.supply(index) == supply
+
+
+def test_legal_mask_matches_legal_moves() -> None:
+    """Tests that the legal actions of a game are the legal moves of its
+    compact position."""
+    batch = BatchGame.new(8, player_count=2, seed=1)
+    rng = np.random.default_rng(1)
+    for _ in range(12):
+        mask = batch.legal_mask()
+        for index in range(len(batch)):
+            position = batch.position(index)
+            moves = {
+                batch.move(index, int(action))
+                for action in np.flatnonzero(mask[index])
+            }
+            assert moves == set(legal_moves(position))
+
+        batch.step((rng.random(mask.shape) * mask).argmax(1))
+
+
+def test_illegal_action() -> None:
+    """Tests that stepping with an illegal action raises."""
+    batch = BatchGame.new(2, player_count=2, seed=0)
+    mask = batch.legal_mask()
+    actions = mask.argmax(1)
+    actions[1] = np.flatnonzero(~mask[1])[0]
+
+    with pytest.raises(ValueError):
+        batch.step(actions)
+
+
+@pytest.mark.parametrize("player_count", [2, 3, 4])
+def test_matches_compact_model(player_count: int) -> None:
+    """Tests that random games follow the rules of the compact model,
+    through round ends and to the end of the game."""
+    batch = BatchGame.new(6, player_count, seed=player_count)
+    rng = np.random.default_rng(player_count)
+    while not batch.done.all():
+        mask = batch.legal_mask()
+        actions = (rng.random(mask.shape) * mask).argmax(1)
+        expected: dict[int, tuple[Position, Supply]] = {}
+        for index in np.flatnonzero(~batch.done).tolist():
+            move = batch.move(index, int(actions[index]))
+            expected[index] = (
+                apply_move(batch.position(index), move),
+                batch.supply(index),
+            )
+
+        ended = batch.step(actions)
+
+        for index, (position, supply) in expected.items():
+            if not phase_end(position) and legal_moves(position):
+                assert batch.position(index) == position
+                assert batch.supply(index) == supply
+                continue
+
+            boards, supply, starting = tile_boards(position, supply)
+            if game_end(boards):
+                assert ended[index]
+                assert tuple(batch.scores[index]) == final_scores(boards)
+                continue
+
+            assert not ended[index]
+            next_position = batch.position(index)
+            assert next_position.boards == boards
+            assert next_position.to_move == starting
+            drawn = batch.factories[index].sum(0)
+            assert tuple(
+                batch.bag[index] + batch.discard[index] + drawn
+            ) == tuple(
+                bag + discard
+                for bag, discard in zip(supply.bag, supply.discard)
+            )
+
+
+def test_reset_finished_games() -> None:
+    """Tests that resetting with the finished games mask starts new games."""
+    batch = BatchGame.new(4, player_count=2, seed=3)
+    rng = np.random.default_rng(3)
+    while not batch.done.any():
+        mask = batch.legal_mask()
+        batch.step((rng.random(mask.shape) * mask).argmax(1))
+    finished = batch.done.copy()
+
+    batch.reset(batch.done)
+
+    assert not batch.done.any()
+    assert np.all(batch.scores[finished] == 0)
+    assert not batch.walls[finished].any()
+    assert np.all(batch.factories[finished].sum(2) == 4)
@@ -0,0 +1,52 @@
+"""Contains unit tests for the azulsim.batch.packing module."""
+
+import numpy as np
+import pytest
+
+from azulsim.batch import BatchGame, pack_games, packed_dtype, unpack_games
+
+
+@pytest.mark.parametrize("player_count", [2, 3, 4])
+def test_round_trip(player_count: int) -> None:
+    """Tests that unpacking packed games restores every array of the
+    batch."""
+    batch = BatchGame.new(32, player_count, seed=player_count)
+    rng = np.random.default_rng(player_count)
+    for _ in range(60):
+        mask = batch.legal_mask()
+        batch.step((rng.random(mask.shape) * mask).argmax(1))
+
+    unpacked = unpack_games(pack_games(batch))
+
+    for name in (
+        "bag",
+        "discard",
+        "factories",
+        "center",
+        "center_marker",
+        "line_counts",
+        "line_colors",
+        "walls",
+        "floors",
+        "markers",
+        "scores",
+        "to_move",
+        "done",
+    ):
+        assert np.array_equal(getattr(unpacked, name), getattr(batch, name))
+    assert np.array_equal(unpacked.legal_mask(), batch.legal_mask())
+
+
+def test_record_size() -> None:
+    """Tests that a packed game of two players fits in 77 bytes."""
+    assert packed_dtype(2).itemsize == 77
+
+
+def test_invalid_buffer() -> None:
+    """Tests that an output array of the wrong shape or dtype is rejected."""
+    batch = BatchGame.new(4, 2, seed=0)
+
+    with pytest.raises(ValueError):
+        pack_games(batch, np.empty(3, dtype=packed_dtype(2)))
+    with pytest.raises(ValueError):
+        pack_games(batch, np.empty(4, dtype=packed_dtype(3)))
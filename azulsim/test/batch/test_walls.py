@@ -0,0 +1,193 @@
+"""Contains unit tests for the azulsim.batch.walls module."""
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.batch import game_end, score_bonuses, tile_boards
+from azulsim.core.phases import end_of_game, wall_tiling
+from azulsim.core.tiles import TileDiscard
+from azulsim.search.position import BoardPosition, histogram
+from azulsim.search.rounds import game_end as scalar_game_end
+from azulsim.search.rounds import tile_board
+
+
+def _random_boards(
+    count: int, seed: int
+) -> tuple[
+    npt.NDArray[np.bool_],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.bool_],
+]:
+    rng = np.random.default_rng(seed)
+    walls = rng.random((count, 5, 5)) < rng.random((count, 1, 1))
+    capacities = np.arange(1, 6)
+    # Half of the pattern lines are complete.
+    line_counts = np.where(
+        rng.random((count, 5)) < 0.5,
+        capacities,
+        rng.integers(0, capacities, size=(count, 5)),
+    )
+    line_colors = np.where(
+        line_counts > 0, rng.integers(0, 5, size=(count, 5)), -1
+    )
+    floors = np.zeros((count, 5), dtype=np.int64)
+    for _ in range(6):
+        floors[np.arange(count), rng.integers(0, 5, size=count)] += (
+            rng.random(count) < 0.5
+        )
+    markers = rng.random(count) < 0.3
+    return walls, line_counts, line_colors, floors, markers
+
+
+def _board(
+    wall: npt.NDArray[np.bool_],
+    line_counts: npt.NDArray[np.int64],
+    line_colors: npt.NDArray[np.int64],
+    floor: npt.NDArray[np.int64],
+    marker: bool,
+    score: int,
+) -> BoardPosition:
+    return BoardPosition(
+        lines=tuple(
+            (int(count), int(color))
+            for count, color in zip(line_counts, line_colors)
+        ),
+        wall=sum(1 << int(index) for index in np.flatnonzero(wall.reshape(-1))),
+        floor=tuple(int(count) for count in floor),
+        marker=bool(marker),
+        score=score,
+    )
+
+
+def test_tile_boards_matches_scalar() -> None:
+    """Tests that random boards are tiled as by the scalar wall tiling."""
+    walls, line_counts, line_colors, floors, markers = _random_boards(300, 0)
+    scores = np.random.default_rng(1).integers(0, 30, size=300)
+
+    result = tile_boards(walls, line_counts, line_colors, floors, markers)
+
+    for index in range(len(walls)):
+        board = _board(
+            walls[index],
+            line_counts[index],
+            line_colors[index],
+            floors[index],
+            markers[index],
+            int(scores[index]),
+        )
+        expected, discarded = tile_board(board)
+        tiled = _board(
+            result.walls[index],
+            result.line_counts[index],
+            result.line_colors[index],
+            np.zeros(5, dtype=np.int64),
+            False,
+            max(int(scores[index] + result.score_deltas[index]), 0),
+        )
+        assert tiled == expected
+        assert tuple(result.discard[index]) == discarded
+        assert result.game_end[index] == scalar_game_end([expected])
+
+
+def test_tile_boards_matches_engine() -> None:
+    """Tests that random boards are tiled as by the engine's wall tiling."""
+    walls, line_counts, line_colors, floors, markers = _random_boards(40, 2)
+
+    result = tile_boards(walls, line_counts, line_colors, floors, markers)
+
+    for index in range(len(walls)):
+        board = _board(
+            walls[index],
+            line_counts[index],
+            line_colors[index],
+            floors[index],
+            markers[index],
+            50,
+        )
+        tiled, discard = wall_tiling.tile_board(
+            board.to_board(), TileDiscard.default()
+        )
+        compact = BoardPosition.from_board(tiled)
+        assert (
+            compact.wall
+            == _board(
+                result.walls[index],
+                line_counts[index],
+                line_colors[index],
+                floors[index],
+                False,
+                0,
+            ).wall
+        )
+        assert compact.lines == tuple(
+            zip(
+                result.line_counts[index].tolist(),
+                result.line_colors[index].tolist(),
+            )
+        )
+        assert compact.score == 50 + result.score_deltas[index]
+        assert histogram(discard.tiles) == tuple(result.discard[index])
+
+
+def test_arbitrary_leading_axes() -> None:
+    """Tests that boards batched over several axes are tiled like a flat
+    batch."""
+    walls, line_counts, line_colors, floors, markers = _random_boards(24, 3)
+
+    flat = tile_boards(walls, line_counts, line_colors, floors, markers)
+    nested = tile_boards(
+        walls.reshape(4, 6, 5, 5),
+        line_counts.reshape(4, 6, 5),
+        line_colors.reshape(4, 6, 5),
+        floors.reshape(4, 6, 5),
+        markers.reshape(4, 6),
+    )
+
+    for flat_array, nested_array in zip(flat, nested):
+        assert nested_array.shape[:2] == (4, 6)
+        assert np.array_equal(
+            nested_array.reshape(flat_array.shape), flat_array
+        )
+
+
+def test_arguments_unchanged() -> None:
+    """Tests that tiling does not modify its arguments."""
+    walls, line_counts, line_colors, floors, markers = _random_boards(10, 4)
+    copies = [array.copy() for array in (walls, line_counts, line_colors)]
+
+    tile_boards(walls, line_counts, line_colors, floors, markers)
+
+    for array, copy in zip((walls, line_counts, line_colors), copies):
+        assert np.array_equal(array, copy)
+
+
+def test_score_bonuses_matches_engine() -> None:
+    """Tests that the bonuses of random walls match the engine's end of game
+    scoring."""
+    rng = np.random.default_rng(5)
+    walls = rng.random((200, 5, 5)) < rng.random((200, 1, 1)) ** 0.3
+
+    bonuses = score_bonuses(walls)
+
+    for wall, bonus in zip(walls, bonuses):
+        board = _board(
+            wall,
+            np.zeros(5, dtype=np.int64),
+            np.full(5, -1),
+            np.zeros(5, dtype=np.int64),
+            False,
+            0,
+        ).to_board()
+        expected = end_of_game.score_bonuses(board.wall, board.score_track)
+        assert bonus == expected.score
+
+
+def test_full_wall_bonus() -> None:
+    """Tests that a full wall earns every bonus."""
+    walls = np.ones((1, 5, 5), dtype=np.bool_)
+
+    assert score_bonuses(walls)[0] == 5 * 2 + 5 * 7 + 5 * 10
+    assert game_end(walls)[0]
+    assert not game_end(np.zeros((1, 5, 5), dtype=np.bool_))[0]
@@ -0,0 +1 @@
+"""Contains unit tests for the azulsim.bots package."""
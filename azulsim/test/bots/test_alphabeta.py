@@ -0,0 +1,61 @@
+"""Contains unit tests for the azulsim.bots.alphabeta module."""
+
+from pathlib import Path
+
+import pytest
+
+from azulsim.bots import AlphaBetaBot
+from azulsim.core import new_game
+from azulsim.search.alphabeta import SearchMode
+from azulsim.search.cache import EvaluationCache
+from azulsim.search.canonical import state_hash
+from azulsim.search.position import CENTER, Move, Position, legal_moves
+from azulsim.test.games import late_round_game
+
+
+@pytest.mark.parametrize("mode", list(SearchMode))
+def test_select_move_is_legal(mode: SearchMode) -> None:
+    """Tests that the selected move is legal in the searched game."""
+    game = new_game(player_count=3, seed=0)
+
+    move = AlphaBetaBot(depth=2, mode=mode).select_move(game)
+
+    assert move in legal_moves(Position.from_game(game))
+
+
+def test_cached_move_reused(tmp_path: Path) -> None:
+    """Tests that a move found by a search is reused from the cache."""
+    game = new_game(player_count=2, seed=0)
+    path = tmp_path / "cache.sqlite"
+
+    with EvaluationCache(path) as cache:
+        move = AlphaBetaBot(depth=2, cache=cache).select_move(game)
+        assert len(cache) == 1
+
+    key = state_hash(game.state, game.next_board_index())
+    with EvaluationCache(path) as cache:
+        entry = cache.lookup(key)
+        assert entry is not None
+        assert entry.move == move
+        cache.store(key, entry.values, entry.depth, Move(CENTER, 0, 0))
+
+        assert AlphaBetaBot(depth=2, cache=cache).select_move(game) == Move(
+            CENTER, 0, 0
+        )
+
+
+def test_cached_move_reused_at_round_end(tmp_path: Path) -> None:
+    """Tests that a move searched to the end of the round is reused from the cache by a deeper player."""
+    game = late_round_game(2, seed=1, tiles_left=3)
+    key = state_hash(game.state, game.next_board_index())
+
+    with EvaluationCache(tmp_path / "cache.sqlite") as cache:
+        AlphaBetaBot(depth=8, cache=cache).select_move(game)
+        entry = cache.lookup(key)
+        assert entry is not None
+        assert entry.depth < 8
+        cache.store(key, entry.values, entry.depth, Move(CENTER, 0, 0))
+
+        assert AlphaBetaBot(depth=8, cache=cache).select_move(game) == Move(
+            CENTER, 0, 0
+        )
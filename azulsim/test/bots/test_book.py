@@ -0,0 +1,28 @@
+"""Contains unit tests for the azulsim.bots.book module."""
+
+from pathlib import Path
+
+from azulsim.bots import BookBot, GreedyBot, RandomBot
+from azulsim.core import FactoryOffer, new_game
+from azulsim.search.book import OpeningBook, build_opening_book
+from azulsim.search.position import Position, play_move
+
+
+def test_book_move_then_fallback(tmp_path: Path) -> None:
+    """Tests that the book move is played first and the fallback player afterwards."""
+    game = new_game(player_count=2, seed=0)
+    factories = Position.from_game(game).factories
+    path = tmp_path / "openings.bin"
+    build_opening_book(path, {2: [factories]}, GreedyBot().choose)
+
+    with OpeningBook.open(path) as book:
+        bot = BookBot(book, RandomBot(seed=0))
+
+        move = bot.select_move(game)
+        assert move == GreedyBot().choose(Position.from_game(game))
+
+        next_game = play_move(game, move)
+        assert isinstance(next_game, FactoryOffer)
+        assert bot.select_move(next_game) == RandomBot(seed=0).select_move(
+            next_game
+        )
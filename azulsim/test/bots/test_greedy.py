@@ -0,0 +1,126 @@
+"""Contains unit tests for the azulsim.bots.greedy module."""
+
+import pytest
+
+from azulsim.bots import Bot, GreedyBot, GreedyWeights, RandomBot
+from azulsim.bots.greedy import move_scores
+from azulsim.core import FactoryOffer, GameEnd, RoundSetup, WallTiling, new_game
+from azulsim.search.position import (
+    CENTER,
+    FLOOR_LINE,
+    Position,
+    apply_move,
+    legal_moves,
+    play_move,
+    wall_bit,
+    wall_column,
+)
+from azulsim.search.rounds import floor_penalty, score_tile
+
+
+def _expected_score(
+    position: Position, move_index: int, weights: GreedyWeights
+) -> float:
+    move = legal_moves(position)[move_index]
+    board = position.boards[position.to_move]
+    after = apply_move(position, move).boards[position.to_move]
+
+    score = weights.floor * (
+        floor_penalty(after.floor_count()) - floor_penalty(board.floor_count())
+    )
+    if move.pool == CENTER and position.center_marker:
+        score += weights.marker
+    if move.line == FLOOR_LINE:
+        return score
+
+    before_count = board.lines[move.line][0]
+    after_count, color = after.lines[move.line]
+    points = score_tile(
+        board.wall | wall_bit(move.line, color),
+        move.line,
+        wall_column(move.line, color),
+    )
+    if after_count == move.line + 1 and before_count < after_count:
+        return score + weights.completion * points
+    placed = after_count - before_count
+    return score + weights.progress * points * placed / (move.line + 1)
+
+
+def _play(bots: list[Bot], seed: int) -> tuple[int, ...]:
+    game: FactoryOffer | WallTiling | RoundSetup | GameEnd = new_game(
+        player_count=len(bots), seed=seed
+    )
+    while not isinstance(game, GameEnd):
+        match game:
+            case FactoryOffer():
+                bot = bots[game.next_board_index()]
+                game = play_move(game, bot.select_move(game))
+            case WallTiling():
+                game = game.tile_boards()
+            case RoundSetup():
+                game = game.round_setup()
+
+    state = game.score_bonuses()
+    return tuple(board.score_track.score for board in state.boards.boards)
+
+
+@pytest.mark.parametrize("player_count, seed", [(2, 0), (3, 1), (4, 2)])
+def test_move_scores_match_scalar_features(
+    player_count: int, seed: int
+) -> None:
+    """Tests that vectorized move scores match features computed move by move."""
+    weights = GreedyWeights(
+        completion=1.0, progress=0.5, floor=2.0, marker=-1.0
+    )
+    bot = RandomBot(seed)
+    game = new_game(player_count=player_count, seed=seed)
+    while True:
+        position = Position.from_game(game)
+        moves = legal_moves(position)
+        scores = move_scores(position, moves, weights)
+
+        assert scores.tolist() == pytest.approx(
+            [
+                _expected_score(position, index, weights)
+                for index in range(len(moves))
+            ]
+        )
+
+        next_game = play_move(game, bot.select_move(game))
+        if not isinstance(next_game, FactoryOffer):
+            break
+        game = next_game
+
+
+def test_choose_best_move() -> None:
+    """Tests that the greedy player selects the move with the highest score."""
+    position = Position.from_game(new_game(player_count=2, seed=0))
+    moves = legal_moves(position)
+    scores = move_scores(position, moves)
+
+    move = GreedyBot().choose(position)
+
+    assert scores[moves.index(move)] == scores.max()
+
+
+def test_softmax_selection() -> None:
+    """Tests that softmax selection is legal and reproducible with a seed."""
+    position = Position.from_game(new_game(player_count=3, seed=0))
+
+    moves = [
+        [GreedyBot(temperature=1.0, seed=1).choose(position) for _ in range(5)]
+        for _ in range(2)
+    ]
+
+    assert moves[0] == moves[1]
+    assert all(move in legal_moves(position) for move in moves[0])
+
+
+def test_beats_random_player() -> None:
+    """Tests that the greedy player outscores a random player."""
+    wins = 0
+    for seed in range(6):
+        scores = _play([GreedyBot(), RandomBot(seed)], seed)
+        wins += scores[0] > scores[1]
+
+    assert wins >= 5
@@ -0,0 +1,148 @@
+"""Contains unit tests for the azulsim.bots.ismcts module."""
+
+import time
+
+import pytest
+
+from azulsim.bots import ISMCTSBot
+from azulsim.core import new_game
+from azulsim.search.position import (
+    CENTER,
+    BoardPosition,
+    Position,
+    legal_moves,
+    wall_bit,
+)
+from azulsim.search.rounds import Supply
+from azulsim.search.solver import RoundSolver, margin
+from azulsim.search.timing import Deadline
+from azulsim.test.games import late_round_game
+
+
+@pytest.mark.parametrize("player_count", [2, 3, 4])
+def test_select_move_is_legal(player_count: int) -> None:
+    """Tests that the selected move is legal in the searched game."""
+    game = new_game(player_count=player_count, seed=player_count)
+    bot = ISMCTSBot(iterations=50, seed=0)
+
+    move = bot.select_move(game)
+
+    assert move in legal_moves(Position.from_game(game))
+
+
+def test_search_is_reproducible() -> None:
+    """Tests that searches with the same seed select the same move."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)
+    supply = Supply.from_state(game.state)
+
+    moves = [
+        ISMCTSBot(iterations=100, seed=3).search(position, supply)
+        for _ in range(2)
+    ]
+
+    assert moves[0] == moves[1]
+
+
+def test_search_finds_best_round_end() -> None:
+    """Tests that a search limited to the current round finds a move with the optimal margin."""
+    game = late_round_game(2, seed=1, tiles_left=4)
+    position = Position.from_game(game)
+    results = RoundSolver().solve(position)
+    best = max(margin(deltas, position.to_move) for deltas in results.values())
+
+    bot = ISMCTSBot(iterations=2000, rounds=1, seed=0)
+    move = bot.search(position, Supply.from_state(game.state))
+
+    assert margin(results[move], position.to_move) == best
+
+
+def _next_round_position() -> tuple[Position, Supply]:
+    # Both boards complete their last wall row with the only tile of the
+    # next round, which goes to the board taking the starting player marker
+    # from the table center now, at the cost of a floor penalty.
+    board = BoardPosition(
+        lines=((0, -1),) * 4 + ((4, 2),),
+        wall=sum(wall_bit(4, color) for color in (0, 1, 3, 4)),
+        floor=(0,) * 5,
+        marker=False,
+        score=10,
+    )
+    position = Position(
+        factories=((0, 0, 0, 1, 0),),
+        center=(0, 0, 0, 0, 1),
+        center_marker=True,
+        boards=(board, board),
+        to_move=0,
+    )
+    return position, Supply(bag=(0, 0, 1, 0, 0), discard=(0,) * 5)
+
+
+def test_search_looks_past_round_end() -> None:
+    """Tests that the selected move depends on the play of the next round."""
+    position, supply = _next_round_position()
+
+    round_move = ISMCTSBot(iterations=500, rounds=1, seed=0).search(
+        position, supply
+    )
+    move = ISMCTSBot(iterations=500, rounds=2, seed=0).search(position, supply)
+
+    assert round_move.pool != CENTER
+    assert move.pool == CENTER
+
+
+def test_tree_continues_past_round_end() -> None:
+    """Tests that the tree grows into the next round once the round end is explored."""
+    position, supply = _next_round_position()
+    single_round = ISMCTSBot(iterations=500, rounds=1, seed=0)
+    two_rounds = ISMCTSBot(iterations=500, rounds=2, seed=0)
+
+    single_round.search(position, supply)
+    two_rounds.search(position, supply)
+
+    assert two_rounds.nodes > single_round.nodes
+
+
+def test_search_continues_tree() -> None:
+    """Tests that searching a position again continues the tree of the previous search."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)
+    supply = Supply.from_state(game.state)
+    bot = ISMCTSBot(iterations=100, seed=0)
+
+    bot.search(position, supply)
+    first_nodes = bot.nodes
+    bot.search(position, supply)
+
+    assert bot.nodes > first_nodes
+
+
+def test_search_without_moves() -> None:
+    """Tests that searching a position without legal moves raises an error."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)._replace(
+        factories=(), center=(0,) * 5, center_marker=False
+    )
+
+    with pytest.raises(ValueError):
+        ISMCTSBot(iterations=10).search(position, Supply.from_state(game.state))
+
+
+def test_search_returns_by_deadline() -> None:
+    """Tests that a search without an iteration limit returns once its deadline expires."""
+    game = new_game(player_count=4, seed=0)
+    bot = ISMCTSBot(iterations=None, seed=0)
+
+    start = time.monotonic()
+    move = bot.select_move(game, Deadline.after(0.2))
+
+    assert time.monotonic() - start < 0.3
+    assert move in legal_moves(Position.from_game(game))
+
+
+def test_search_requires_limit() -> None:
+    """Tests that a search without an iteration limit or deadline raises an error."""
+    game = new_game(player_count=2, seed=0)
+
+    with pytest.raises(ValueError):
+        ISMCTSBot(iterations=None).select_move(game)
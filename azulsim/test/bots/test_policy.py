@@ -0,0 +1,111 @@
+"""Contains unit tests for the azulsim.bots.policy module."""
+
+import asyncio
+
+import numpy as np
+import numpy.typing as npt
+
+from azulsim.batch import (
+    BatchGame,
+    action_count,
+    encode_action,
+    feature_count,
+)
+from azulsim.bots import PolicyBot
+from azulsim.core import FactoryOffer, new_game
+from azulsim.env import AzulEnv
+from azulsim.learn import BatchEvaluator
+from azulsim.search.position import Move, Position, histogram, legal_moves
+
+
+def _preferring(action: int) -> BatchEvaluator:
+    def model(
+        observations: npt.NDArray[np.float32],
+    ) -> npt.NDArray[np.float32]:
+        logits = np.zeros((len(observations), action_count(2)), np.float32)
+        logits[:, action] = 1.0
+        return logits
+
+    return BatchEvaluator(model, feature_count(2))
+
+
+def test_selects_preferred_legal_move() -> None:
+    """Tests that the legal action with the highest logit is played."""
+    game = new_game(player_count=2, seed=0)
+    batch = BatchGame.from_games([game])
+    action = int(np.flatnonzero(batch.legal_mask()[0])[-1])
+
+    with _preferring(action) as evaluator:
+        move = PolicyBot(evaluator).select_move(game)
+
+    assert move == batch.move(0, action)
+
+
+def test_ignores_illegal_logits() -> None:
+    """Tests that a move is legal even if the model prefers an illegal
+    action."""
+    game = new_game(player_count=2, seed=1)
+    # Nothing can be taken from the empty table center in the first move.
+    with _preferring(encode_action(3, 0, 0)) as evaluator:
+        bot = PolicyBot(evaluator, temperature=1.0, seed=0)
+        moves = [bot.select_move(game) for _ in range(5)]
+
+    legal = legal_moves(Position.from_game(game))
+    assert all(move in legal for move in moves)
+
+
+def test_concurrent_games() -> None:
+    """Tests that coroutines of many games share model calls."""
+    games = [new_game(player_count=2, seed=seed) for seed in range(16)]
+
+    with _preferring(0) as evaluator:
+        bot = PolicyBot(evaluator)
+
+        async def select_all() -> list[Move]:
+            return await asyncio.gather(
+                *(bot.select_move_async(game) for game in games)
+            )
+
+        moves = asyncio.run(select_all())
+        assert evaluator.mean_batch_size > 1.0
+
+    for game, move in zip(games, moves):
+        assert move in legal_moves(Position.from_game(game))
+
+
+def test_actions_match_env() -> None:
+    """Tests that the model observes the environment's observation, and that
+    the move played for an action takes the same tiles as the action in the
+    environment, throughout a game."""
+
+    def taken(action: int) -> tuple[object, ...]:
+        pool, color, line = env.engine_move(action)
+        return type(pool), histogram(pool.tiles), color, line
+
+    preferred = [0]
+    observed: list[npt.NDArray[np.float32]] = []
+
+    def model(
+        observations: npt.NDArray[np.float32],
+    ) -> npt.NDArray[np.float32]:
+        observed.extend(observations.copy())
+        logits = np.zeros((len(observations), action_count(3)), np.float32)
+        logits[:, preferred[0]] = 1.0
+        return logits
+
+    env = AzulEnv(3)
+    rng = np.random.default_rng(0)
+    timestep = env.reset(seed=4)
+    with BatchEvaluator(model, feature_count(3)) as evaluator:
+        bot = PolicyBot(evaluator)
+        while not timestep.done:
+            game = env.game
+            assert isinstance(game, FactoryOffer)
+            action = int(rng.choice(np.flatnonzero(timestep.legal_mask)))
+            preferred[0] = action
+
+            move = bot.select_move(game)
+
+            assert np.array_equal(observed.pop(), timestep.observation)
+            assert taken(env.action(move)) == taken(action)
+            timestep = env.step(action)
@@ -0,0 +1,118 @@
+"""Contains unit tests for the azulsim.bots.ponder module."""
+
+import threading
+import time
+from typing import Optional
+
+import pytest
+
+from azulsim.bots import GreedyBot, ISMCTSBot, Ponderer
+from azulsim.bots.ponder import predicted_moves
+from azulsim.core import new_game
+from azulsim.search.position import Move, Position, apply_move, legal_moves
+from azulsim.search.rounds import Supply
+from azulsim.search.timing import Deadline
+
+
+def _greedy_search(
+    position: Position, supply: Supply, deadline: Optional[Deadline] = None
+) -> Move:
+    return GreedyBot().choose(position)
+
+
+def test_predicted_moves_best_first() -> None:
+    """Tests that the greedy player's move is predicted first."""
+    position = Position.from_game(new_game(player_count=2, seed=0))
+
+    moves = predicted_moves(position, 3)
+    assert len(moves) == 3
+    assert len(set(moves)) == 3
+    assert moves[0] == GreedyBot().choose(position)
+    assert set(moves) <= set(legal_moves(position))
+
+
+def test_reply_to_predicted_move() -> None:
+    """Tests that the reply to a predicted move is available after pondering."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)
+    supply = Supply.from_state(game.state)
+    ponderer = Ponderer(_greedy_search, 1, lambda _: 1.0, candidates=2)
+
+    ponderer.start(position, supply)
+    assert ponderer.wait(timeout=10.0)
+    for move in predicted_moves(position, 2):
+        child = apply_move(position, move)
+        reply = ponderer.reply(child)
+        assert reply is not None and reply.complete
+        assert reply.move == GreedyBot().choose(child)
+
+
+def test_reply_to_unpredicted_move() -> None:
+    """Tests that no reply is available for a move which was not predicted."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)
+    ponderer = Ponderer(_greedy_search, 1, lambda _: 1.0, candidates=1)
+
+    ponderer.start(position, Supply.from_state(game.state))
+    assert ponderer.wait(timeout=10.0)
+    predicted = predicted_moves(position, 1)[0]
+    move = next(move for move in legal_moves(position) if move != predicted)
+    assert ponderer.reply(apply_move(position, move)) is None
+
+
+def test_stop_interrupts_search() -> None:
+    """Tests that stopping a ponderer interrupts a long search promptly."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)
+    bot = ISMCTSBot(iterations=None, seed=0)
+    ponderer = Ponderer(bot.search, 1, lambda _: 60.0)
+
+    ponderer.start(position, Supply.from_state(game.state))
+    deadline = Deadline.after(0.0)
+    ponderer.stop()
+    assert deadline.elapsed() < 5.0
+
+
+def test_stopped_search_is_kept() -> None:
+    """Tests that the reply of a search interrupted by stopping is kept."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)
+    started = threading.Event()
+
+    def search(
+        position: Position, supply: Supply, deadline: Optional[Deadline] = None
+    ) -> Move:
+        started.set()
+        while deadline is not None and not deadline.expired():
+            time.sleep(0.001)
+        return legal_moves(position)[0]
+
+    ponderer = Ponderer(search, 1, lambda _: 60.0)
+    ponderer.start(position, Supply.from_state(game.state))
+    assert started.wait(timeout=10.0)
+    child = apply_move(position, predicted_moves(position, 1)[0])
+    reply = ponderer.reply(child)
+
+    assert reply is not None and not reply.complete
+    assert reply.move == legal_moves(child)[0]
+    assert 0.0 <= reply.seconds < 60.0
+
+
+def test_budget_split_between_candidates() -> None:
+    """Tests that the search time of a reply is split between the predicted moves."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)
+    budgets: list[float] = []
+
+    def search(
+        position: Position, supply: Supply, deadline: Optional[Deadline] = None
+    ) -> Move:
+        assert deadline is not None
+        budgets.append(deadline.end - deadline.start)
+        return legal_moves(position)[0]
+
+    ponderer = Ponderer(search, 1, lambda _: 2.0, candidates=4)
+    ponderer.start(position, Supply.from_state(game.state))
+    assert ponderer.wait(timeout=10.0)
+
+    assert budgets == pytest.approx([0.5] * 4)
@@ -179,3 +179,17 @@ def test_populated_pattern_line_overflow() -> None:
         assert isinstance(result.pattern_lines[line_index], EmptyPatternLine)
 
     assert result.floor_line.tiles == (ColoredTile.BLACK,)
+
+
+def test_floor_line() -> None:
+    """Tests that output is valid when placing tiles directly on the floor line."""
+    board = _build_populated_board(2, ColoredTile.RED, 1)
+    tiles = [ColoredTile.BLACK] * 3
+    result = factory_offer.place_tiles(board, PatternLines.line_count(), tiles)
+
+    assert result is not None
+
+    assert result.score_track == board.score_track
+    assert result.pattern_lines == board.pattern_lines
+    assert result.wall == Wall.default()
+    assert result.floor_line.tiles == (ColoredTile.BLACK,) * 3
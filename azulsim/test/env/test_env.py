@@ -0,0 +1,220 @@
+"""Contains unit tests for the azulsim.env.env module."""
+
+import numpy as np
+import pytest
+
+from azulsim.batch import (
+    BatchGame,
+    action_count,
+    decode_action,
+    encode_batch,
+    encode_states,
+    feature_count,
+)
+from azulsim.core import (
+    FactoryOffer,
+    Game,
+    GameEnd,
+    RoundSetup,
+    WallTiling,
+    new_game,
+)
+from azulsim.core.factory import FactoryDisplay
+from azulsim.env import AzulEnv, Timestep
+from azulsim.search.position import (
+    COLORS,
+    Position,
+    histogram,
+    legal_moves,
+)
+
+
+def _random_action(timestep: Timestep, rng: np.random.Generator) -> int:
+    return int(rng.choice(np.flatnonzero(timestep.legal_mask)))
+
+
+def test_sizes() -> None:
+    """Tests that the sizes of observations and actions match the batch
+    encoding."""
+    env = AzulEnv(3)
+    timestep = env.reset(seed=0)
+
+    assert env.observation_size == feature_count(3)
+    assert env.action_count == action_count(3)
+    assert timestep.observation.shape == (feature_count(3),)
+    assert timestep.legal_mask.shape == (action_count(3),)
+    assert timestep.rewards.shape == (3,)
+
+
+@pytest.mark.parametrize("player_count", [2, 3, 4])
+def test_rewards_sum_to_final_scores(player_count: int) -> None:
+    """Tests that random games end with rewards summing to the final
+    scores."""
+    env = AzulEnv(player_count)
+    rng = np.random.default_rng(player_count)
+    timestep = env.reset(seed=player_count)
+    totals = timestep.rewards.copy()
+
+    steps = 0
+    while not timestep.done:
+        timestep = env.step(_random_action(timestep, rng))
+        totals += timestep.rewards
+        steps += 1
+
+    assert steps > 0
+    assert not timestep.legal_mask.any()
+    scores = [board.score_track.score for board in env.game.state.boards.boards]
+    assert totals.tolist() == scores
+
+
+def test_final_observation() -> None:
+    """Tests that the last timestep of a game observes its final scores."""
+    env = AzulEnv(3)
+    rng = np.random.default_rng(5)
+    timestep = env.reset(seed=5)
+    while not timestep.done:
+        timestep = env.step(_random_action(timestep, rng))
+
+    scores = [board.score_track.score for board in env.game.state.boards.boards]
+    observed = timestep.observation[57 : 3 * 58 : 58] * 100
+    expected = np.roll(scores, -timestep.to_move)
+    assert np.allclose(observed, expected)
+    assert not timestep.legal_mask.any()
+
+
+def _engine_position(game: FactoryOffer) -> Position:
+    # Compact position of a game with its factory displays in state order.
+    return Position.from_game(game)._replace(
+        factories=tuple(
+            histogram(factory.tiles) for factory in game.state.factory_displays
+        )
+    )
+
+
+def test_reset_matches_new_game() -> None:
+    """Tests that a reset game draws the same tiles as new_game with the same
+    seed, and that its actions take from the pools of BatchGame.load_game."""
+    env = AzulEnv(3)
+    timestep = env.reset(seed=7)
+    game = new_game(player_count=3, seed=7)
+    batch = BatchGame(1, 3)
+    batch.load_game(0, game)
+
+    built = env.game
+    assert isinstance(built, FactoryOffer)
+    assert [factory.tiles for factory in built.state.factory_displays] == [
+        factory.tiles for factory in game.state.factory_displays
+    ]
+    assert built.state.bag == game.state.bag
+    assert np.array_equal(timestep.observation, encode_batch(batch)[0])
+    assert np.array_equal(timestep.legal_mask, batch.legal_mask()[0])
+    for move in legal_moves(Position.from_game(game)):
+        assert env.action(move) == batch.action(0, move)
+
+
+def test_follows_engine() -> None:
+    """Tests that the legal actions, board to move, observation and
+    transitions match a game of the engine with the same seed throughout the
+    game, and that the actions of pool k take from the factory display shown
+    in observation slot k."""
+    env = AzulEnv(3)
+    rng = np.random.default_rng(0)
+    timestep = env.reset(seed=7)
+    game: Game = new_game(player_count=3, seed=7)
+    slots = slice(3 * 58, 3 * 58 + 4 * 5)
+
+    while not timestep.done:
+        assert isinstance(game, FactoryOffer)
+        to_move = game.next_board_index()
+        position = Position.from_game(game)
+
+        actions = set()
+        for action in np.flatnonzero(timestep.legal_mask).tolist():
+            pool, color, line = env.engine_move(action)
+            is_factory = isinstance(pool, FactoryDisplay)
+            if is_factory:
+                pool_index = decode_action(action)[0]
+                factory = game.state.factory_displays.factories[pool_index]
+                assert pool.tiles == factory.tiles
+                slot = timestep.observation[slots].reshape(4, 5)[pool_index]
+                assert tuple((slot * 4).astype(int)) == histogram(pool.tiles)
+            actions.add((is_factory, histogram(pool.tiles), color, line))
+        moves = {
+            (
+                move.pool >= 0,
+                position.pool(move.pool),
+                COLORS[move.color],
+                move.line,
+            )
+            for move in legal_moves(position)
+        }
+
+        assert actions == moves
+        assert timestep.to_move == to_move
+        assert np.array_equal(
+            timestep.observation, encode_states([game.state], [to_move])[0]
+        )
+
+        action = _random_action(timestep, rng)
+        pool_index, color_index, line = decode_action(action)
+        pool = (
+            game.state.table_center
+            if pool_index == 3 + 1
+            else game.state.factory_displays.factories[pool_index]
+        )
+        next_game = game.factory_offer(pool, COLORS[color_index], line)
+        assert next_game is not None
+        timestep = env.step(action)
+        game = next_game
+        if isinstance(game, WallTiling):
+            game = game.tile_boards()
+        if isinstance(game, RoundSetup):
+            game = game.round_setup()
+
+        if isinstance(game, FactoryOffer):
+            built = env.game
+            assert isinstance(built, FactoryOffer)
+            assert _engine_position(built) == _engine_position(game)
+            assert built.state.bag == game.state.bag
+            assert built.state.discard == game.state.discard
+
+    assert isinstance(game, GameEnd)
+    boards = game.score_bonuses().boards.boards
+    assert [board.score_track.score for board in boards] == [
+        board.score_track.score for board in env.game.state.boards.boards
+    ]
+
+
+def test_reset_is_reproducible() -> None:
+    """Tests that games reset with the same seed and played with the same
+    actions are identical, whether or not their game phases are built."""
+    env = AzulEnv(2)
+    observations = []
+    for build_games in (False, True):
+        rng = np.random.default_rng(3)
+        timestep = env.reset(seed=11)
+        for _ in range(30):
+            if build_games:
+                assert isinstance(env.game, FactoryOffer)
+            timestep = env.step(_random_action(timestep, rng))
+        observations.append(timestep.observation.copy())
+
+    assert np.array_equal(observations[0], observations[1])
+
+
+def test_illegal_action() -> None:
+    """Tests that illegal actions and steps outside a game are rejected."""
+    env = AzulEnv(2)
+    with pytest.raises(ValueError):
+        env.step(0)
+
+    timestep = env.reset(seed=0)
+    illegal = int(np.flatnonzero(~timestep.legal_mask)[0])
+    with pytest.raises(ValueError):
+        env.step(illegal)
+
+    rng = np.random.default_rng(0)
+    while not timestep.done:
+        timestep = env.step(_random_action(timestep, rng))
+    with pytest.raises(ValueError):
+        env.step(0)
@@ -0,0 +1,101 @@
+"""Contains unit tests for the azulsim.env.vector module."""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from azulsim.batch import action_count, feature_count
+from azulsim.env import VectorEnv
+
+
+def _random_actions(
+    legal_masks: npt.NDArray[np.bool_], rng: np.random.Generator
+) -> npt.NDArray[np.int64]:
+    return (rng.random(legal_masks.shape) * legal_masks).argmax(1)
+
+
+def test_reset() -> None:
+    """Tests that a reset starts a game in every environment."""
+    with VectorEnv(5, player_count=3, workers=2) as env:
+        timestep = env.reset()
+
+        assert env.observation_size == feature_count(3)
+        assert env.action_count == action_count(3)
+        assert timestep.observations.shape == (5, feature_count(3))
+        assert timestep.rewards.shape == (5, 3)
+        assert timestep.legal_masks.any(axis=1).all()
+        assert not timestep.dones.any()
+        assert not timestep.rewards.any()
+
+
+def test_auto_reset() -> None:
+    """Tests that environments start a new game when their game ends."""
+    rng = np.random.default_rng(0)
+    with VectorEnv(4, workers=2, seed=1) as env:
+        timestep = env.reset()
+        totals = np.zeros((4, 2))
+        finished = []
+        for _ in range(300):
+            timestep = env.step(_random_actions(timestep.legal_masks, rng))
+            totals += timestep.rewards
+            assert timestep.legal_masks.any(axis=1).all()
+            for index in np.flatnonzero(timestep.dones).tolist():
+                finished.append(totals[index].copy())
+                totals[index] = 0.0
+
+    assert len(finished) >= 4
+    assert all((scores >= 0).all() for scores in finished)
+
+
+def test_same_seed_same_games() -> None:
+    """Tests that vectors with the same seed play the same games."""
+    observations = []
+    for _ in range(2):
+        rng = np.random.default_rng(2)
+        with VectorEnv(3, workers=1, seed=5) as env:
+            timestep = env.reset()
+            for _ in range(20):
+                timestep = env.step(_random_actions(timestep.legal_masks, rng))
+            observations.append(timestep.observations.copy())
+
+    assert np.array_equal(observations[0], observations[1])
+
+
+def test_invalid_actions() -> None:
+    """Tests that illegal actions and actions of the wrong shape are
+    rejected."""
+    with VectorEnv(2, workers=2) as env:
+        timestep = env.reset()
+        actions = np.argmax(~timestep.legal_masks, axis=1)
+        with pytest.raises(ValueError):
+            env.step(actions)
+        with pytest.raises(ValueError):
+            env.step(np.zeros(3, dtype=np.int64))
+
+
+def test_close_frees_memory() -> None:
+    """Tests that closing the vector frees its shared memory block."""
+    env = VectorEnv(2, workers=1)
+    name = env._memory.name
+    env.close()
+    env.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_independent_of_workers() -> None:
+    """Tests that the games played do not depend on the number of
+    workers."""
+    observations = []
+    for workers in (1, 3):
+        rng = np.random.default_rng(4)
+        with VectorEnv(3, workers=workers, seed=6) as env:
+            timestep = env.reset()
+            for _ in range(70):
+                timestep = env.step(_random_actions(timestep.legal_masks, rng))
+            observations.append(timestep.observations.copy())
+
+    assert np.array_equal(observations[0], observations[1])
@@ -0,0 +1,113 @@
+"""Contains unit tests for the azulsim.eval.heuristic module."""
+
+import random
+
+import pytest
+
+from azulsim.bots import RandomBot
+from azulsim.core import FactoryOffer, RoundSetup, WallTiling, new_game
+from azulsim.core.board import Board
+from azulsim.eval.heuristic import HeuristicEvaluator, Weights, unseen_tiles
+from azulsim.search.alphabeta import AlphaBetaSearcher
+from azulsim.search.position import (
+    BoardPosition,
+    Position,
+    apply_move,
+    legal_moves,
+    play_move,
+    wall_bit,
+)
+from azulsim.search.rounds import Supply
+
+
+@pytest.mark.parametrize("player_count, seed", [(2, 0), (3, 1), (4, 2)])
+def test_child_matches_root(player_count: int, seed: int) -> None:
+    """Tests that incrementally updated accumulators match accumulators computed from scratch."""
+    rng = random.Random(seed)
+    evaluator = HeuristicEvaluator()
+    position = Position.from_game(new_game(player_count, seed))
+    accumulator = evaluator.root(position)
+    while moves := legal_moves(position):
+        move = rng.choice(moves)
+        accumulator = evaluator.child(accumulator, position, move)
+        position = apply_move(position, move)
+
+        expected = evaluator.root(position)
+        assert accumulator.unseen == expected.unseen
+        for terms, expected_terms in zip(accumulator.boards, expected.boards):
+            assert terms.lines == pytest.approx(expected_terms.lines)
+            assert terms.floor == pytest.approx(expected_terms.floor)
+            assert terms.wall == pytest.approx(expected_terms.wall)
+            assert terms.total == pytest.approx(expected_terms.total)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_unseen_tiles_match_supply(seed: int) -> None:
+    """Tests that the unseen tiles are the tiles in the bag and discard."""
+    bot = RandomBot(seed)
+    game: FactoryOffer | WallTiling = new_game(player_count=2, seed=seed)
+    for _ in range(20):
+        if isinstance(game, WallTiling):
+            round_setup = game.tile_boards()
+            assert isinstance(round_setup, RoundSetup)
+            game = round_setup.round_setup()
+        supply = Supply.from_state(game.state)
+        expected = tuple(
+            bag + discard for bag, discard in zip(supply.bag, supply.discard)
+        )
+
+        assert unseen_tiles(Position.from_game(game)) == expected
+        game = play_move(game, bot.select_move(game))
+
+
+def test_board_terms() -> None:
+    """Tests the terms of a board with complete and incomplete pattern lines."""
+    board = BoardPosition.from_board(Board.default())._replace(
+        lines=((1, 0), (1, 2), (0, -1), (0, -1), (0, -1)),
+        floor=(0, 0, 0, 2, 0),
+        score=5,
+    )
+    weights = Weights(row_bonus=0.0, column_bonus=0.0, color_bonus=0.0)
+    evaluator = HeuristicEvaluator(weights)
+
+    terms = evaluator.board_terms(board, unseen=(10, 10, 3, 10, 10))
+
+    assert terms.lines == pytest.approx((1.0, 0.5 * 0.5 * 3 / 4, 0, 0, 0))
+    assert terms.floor == -2.0
+    assert terms.wall == 5.0
+    assert terms.total == pytest.approx(sum(terms.lines) - 2.0 + 5.0)
+
+
+def test_blocked_line_terms() -> None:
+    """Tests that a pattern line whose color is already on its wall line is worth nothing."""
+    board = BoardPosition.from_board(Board.default())._replace(
+        lines=((0, -1), (2, 1), (1, 3), (0, -1), (0, -1)),
+        wall=wall_bit(1, 1) | wall_bit(2, 3),
+    )
+
+    terms = HeuristicEvaluator().board_terms(board, unseen=(10,) * 5)
+
+    assert terms.lines == (0.0,) * 5
+
+
+def test_evaluate_state() -> None:
+    """Tests that a state is evaluated for every board."""
+    game = new_game(player_count=3, seed=0)
+    evaluator = HeuristicEvaluator()
+
+    values = evaluator.evaluate(game.state)
+
+    assert values == evaluator.value(
+        evaluator.root(Position.from_game(game)), Position.from_game(game)
+    )
+    assert len(values) == 3
+
+
+def test_search_with_heuristic() -> None:
+    """Tests that the evaluator can be plugged into the alpha-beta searcher."""
+    position = Position.from_game(new_game(player_count=2, seed=0))
+
+    result = AlphaBetaSearcher(HeuristicEvaluator()).search(position, 2)
+
+    assert result.move in legal_moves(position)
+    assert len(result.values) == 2
@@ -0,0 +1,95 @@
+"""Contains unit tests for the azulsim.eval.ntuple module."""
+
+from pathlib import Path
+import random
+
+import numpy as np
+import pytest
+
+from azulsim.core import new_game
+from azulsim.eval.ntuple import (
+    TUPLE_COUNT,
+    WEIGHT_COUNT,
+    NTupleEvaluator,
+    NTupleNetwork,
+    board_indices,
+)
+from azulsim.search.alphabeta import AlphaBetaSearcher
+from azulsim.search.position import Position, apply_move, legal_moves
+
+
+def _random_network(seed: int) -> NTupleNetwork:
+    rng = np.random.default_rng(seed)
+    return NTupleNetwork(rng.standard_normal(WEIGHT_COUNT).astype(np.float32))
+
+
+@pytest.mark.parametrize("player_count, seed", [(2, 0), (3, 1), (4, 2)])
+def test_child_matches_root(player_count: int, seed: int) -> None:
+    """Tests that incrementally updated accumulators match accumulators computed from scratch."""
+    rng = random.Random(seed)
+    network = _random_network(seed)
+    evaluator = NTupleEvaluator(network)
+    position = Position.from_game(new_game(player_count, seed))
+    accumulator = evaluator.root(position)
+    while moves := legal_moves(position):
+        move = rng.choice(moves)
+        accumulator = evaluator.child(accumulator, position, move)
+        position = apply_move(position, move)
+
+        values = evaluator.value(accumulator, position)
+        assert values == pytest.approx(
+            evaluator.value(evaluator.root(position), position), abs=1e-4
+        )
+        assert values == pytest.approx(
+            [network.board_value(board) for board in position.boards],
+            abs=1e-4,
+        )
+
+
+def test_board_indices() -> None:
+    """Tests that a board looks up one weight in each table."""
+    position = Position.from_game(new_game(2, 3))
+    position = apply_move(position, legal_moves(position)[0])
+
+    for board in position.boards:
+        indices = board_indices(board)
+        assert len(indices) == TUPLE_COUNT
+        assert indices == tuple(sorted(set(indices)))
+        assert all(0 <= index < WEIGHT_COUNT for index in indices)
+
+
+def test_zero_network_values_scores() -> None:
+    """Tests that a network without weights values boards by their score."""
+    game = new_game(2, 4)
+
+    values = NTupleEvaluator(NTupleNetwork.new()).evaluate(game.state)
+
+    assert values == tuple(
+        float(board.score_track.score) for board in game.state.boards.boards
+    )
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Tests that saved weights are memory-mapped read-only when loaded."""
+    network = _random_network(5)
+    path = tmp_path / "ntuple.npy"
+
+    network.save(path)
+    loaded = NTupleNetwork.load(path)
+
+    assert np.array_equal(loaded.weights, network.weights)
+    assert not loaded.weights.flags.writeable
+    with pytest.raises(ValueError):
+        NTupleNetwork(np.zeros(WEIGHT_COUNT + 1, dtype=np.float32))
+
+
+def test_searches_with_network() -> None:
+    """Tests that an alpha-beta search can evaluate its leaves with the
+    network."""
+    position = Position.from_game(new_game(2, 6))
+    searcher = AlphaBetaSearcher(NTupleEvaluator(_random_network(6)))
+
+    result = searcher.search(position, max_depth=3)
+
+    assert result.move in legal_moves(position)
+    assert result.depth == 3
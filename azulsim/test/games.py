@@ -0,0 +1,22 @@
+"""Contains game builders shared by the unit tests."""
+
+import random
+
+from azulsim.core import FactoryOffer, new_game
+from azulsim.search.position import Position, legal_moves, play_move
+
+
+def late_round_game(
+    player_count: int, seed: int, tiles_left: int
+) -> FactoryOffer:
+    """Returns a game played with random moves until at most a number of
+    tiles are left in the pools of its first round."""
+    rng = random.Random(seed)
+    game = new_game(player_count=player_count, seed=seed)
+    while Position.from_game(game).tile_count() > tiles_left:
+        moves = legal_moves(Position.from_game(game))
+        next_game = play_move(game, rng.choice(moves))
+        assert isinstance(next_game, FactoryOffer)
+        game = next_game
+
+    return game
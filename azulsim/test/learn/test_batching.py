@@ -0,0 +1,122 @@
+"""Contains unit tests for the azulsim.learn.batching module."""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from azulsim.learn import BatchEvaluator
+
+
+class _CountingModel:
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, observations: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float32]:
+        with self._lock:
+            self.batch_sizes.append(len(observations))
+        return observations * 2.0
+
+
+def test_results_scattered() -> None:
+    """Tests that every request is resolved with its own outputs."""
+    model = _CountingModel()
+    with BatchEvaluator(model, 3, max_batch=8, max_wait=0.05) as evaluator:
+        futures = [
+            evaluator.submit(np.full(3, index, dtype=np.float32))
+            for index in range(20)
+        ]
+        results = [future.result() for future in futures]
+
+    for index, result in enumerate(results):
+        assert result.tolist() == [2.0 * index] * 3
+    assert sum(model.batch_sizes) == 20
+    assert max(model.batch_sizes) <= 8
+    assert len(model.batch_sizes) < 20
+
+
+def test_threads_share_batches() -> None:
+    """Tests that requests from many threads are evaluated together."""
+    model = _CountingModel()
+    with BatchEvaluator(model, 2, max_batch=16, max_wait=0.02) as evaluator:
+        with ThreadPoolExecutor(16) as pool:
+            results = list(
+                pool.map(
+                    lambda index: evaluator.evaluate(
+                        np.array([index, 1.0], dtype=np.float32)
+                    ),
+                    range(64),
+                )
+            )
+
+        assert [result[0] for result in results] == [
+            2.0 * index for index in range(64)
+        ]
+        assert evaluator.mean_batch_size > 1.0
+
+
+def test_coroutines() -> None:
+    """Tests that coroutines awaiting evaluations are batched."""
+    model = _CountingModel()
+
+    async def evaluate_all(evaluator: BatchEvaluator) -> list[float]:
+        results = await asyncio.gather(
+            *(
+                evaluator.evaluate_async(np.array([index], dtype=np.float32))
+                for index in range(32)
+            )
+        )
+        return [float(result[0]) for result in results]
+
+    with BatchEvaluator(model, 1, max_batch=32, max_wait=0.05) as evaluator:
+        results = asyncio.run(evaluate_all(evaluator))
+
+    assert results == [2.0 * index for index in range(32)]
+    assert len(model.batch_sizes) < 32
+
+
+def test_model_error() -> None:
+    """Tests that an error of the model is raised by every request of the
+    batch."""
+
+    def failing(
+        observations: npt.NDArray[np.float32],
+    ) -> npt.NDArray[np.float32]:
+        raise RuntimeError("model failed")
+
+    with BatchEvaluator(failing, 1) as evaluator:
+        with pytest.raises(RuntimeError):
+            evaluator.evaluate(np.zeros(1, dtype=np.float32))
+
+    with pytest.raises(ValueError):
+        evaluator.submit(np.zeros(1, dtype=np.float32))
+
+
+def test_close_while_submitting() -> None:
+    """Tests that every request accepted while the evaluator closes is
+    resolved, and that later requests raise."""
+    evaluator = BatchEvaluator(_CountingModel(), 1)
+    started = threading.Barrier(5)
+
+    def submit_until_closed() -> list[Future[npt.NDArray[np.float32]]]:
+        futures = []
+        started.wait()
+        while True:
+            try:
+                futures.append(evaluator.submit(np.ones(1, dtype=np.float32)))
+            except ValueError:
+                return futures
+
+    with ThreadPoolExecutor(4) as executor:
+        results = [executor.submit(submit_until_closed) for _ in range(4)]
+        started.wait()
+        evaluator.close()
+        futures = [future for result in results for future in result.result()]
+
+    assert all(future.done() for future in futures)
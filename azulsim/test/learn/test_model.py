@@ -0,0 +1,79 @@
+"""Contains unit tests for the azulsim.learn.model module."""
+
+from pathlib import Path
+
+import numpy as np
+
+from azulsim.batch import BatchGame, action_count, encode_batch
+from azulsim.learn import PolicyValueModel
+
+
+def test_outputs() -> None:
+    """Tests that the model returns the logits followed by the values."""
+    model = PolicyValueModel.new(3, hidden=16, seed=0)
+    observations = encode_batch(BatchGame.new(5, 3, seed=0))
+
+    logits, values, hidden = model.forward(observations)
+    outputs = model(observations)
+
+    assert model.player_count == 3
+    assert hidden.shape == (5, 16)
+    assert outputs.shape == (5, action_count(3) + 3)
+    assert np.array_equal(outputs[:, : action_count(3)], logits)
+    assert np.array_equal(outputs[:, action_count(3) :], values)
+
+
+def test_gradients_match_finite_differences() -> None:
+    """Tests that backward returns the gradients of a loss of the
+    outputs."""
+    model = PolicyValueModel.new(2, hidden=6, seed=1)
+    model.parameters = {
+        name: value.astype(np.float64)
+        for name, value in model.parameters.items()
+    }
+    rng = np.random.default_rng(2)
+    observations = rng.random((4, model.parameters["hidden_w"].shape[0]))
+    logit_weights = rng.standard_normal((4, action_count(2)))
+    value_weights = rng.standard_normal((4, 2))
+
+    def loss() -> float:
+        logits, values, _ = model.forward(observations)
+        return float(
+            (logits * logit_weights).sum() + (values * value_weights).sum()
+        )
+
+    gradients = model.backward(
+        observations,
+        model.forward(observations),
+        logit_weights,
+        value_weights,
+    )
+
+    for name, parameter in model.parameters.items():
+        flat = parameter.reshape(-1)
+        for index in rng.choice(
+            flat.size, size=min(flat.size, 5), replace=False
+        ):
+            original = flat[index]
+            flat[index] = original + 1e-6
+            above = loss()
+            flat[index] = original - 1e-6
+            below = loss()
+            flat[index] = original
+            expected = (above - below) / 2e-6
+            assert np.isclose(
+                gradients[name].reshape(-1)[index], expected, atol=1e-5
+            )
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Tests that a saved model is loaded with the same parameters."""
+    model = PolicyValueModel.new(2, hidden=8, seed=3)
+    path = tmp_path / "model.npz"
+
+    model.save(path)
+    loaded = PolicyValueModel.load(path)
+
+    assert loaded.parameters.keys() == model.parameters.keys()
+    for name, value in model.parameters.items():
+        assert np.array_equal(loaded.parameters[name], value)
@@ -0,0 +1,149 @@
+"""Contains unit tests for the azulsim.learn.replay module."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from azulsim.batch import BatchGame, action_count, pack_games, unpack_games
+from azulsim.learn import ReplayBuffer
+
+
+def _append_steps(buffer: ReplayBuffer, steps: int, seed: int) -> BatchGame:
+    batch = BatchGame.new(8, buffer.player_count, seed=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(steps):
+        mask = batch.legal_mask()
+        actions = (rng.random(mask.shape) * mask).argmax(1)
+        buffer.append(
+            pack_games(batch), actions, mask, rng.random((8, 2)), None
+        )
+        batch.step(actions)
+    return batch
+
+
+def test_gather_round_trip() -> None:
+    """Tests that gathered transitions hold the appended values."""
+    buffer = ReplayBuffer(100)
+    batch = BatchGame.new(4, 2, seed=0)
+    mask = batch.legal_mask()
+    actions = mask.argmax(1)
+    rewards = np.arange(8, dtype=np.float32).reshape(4, 2)
+    outcomes = rewards + 10
+
+    indices = buffer.append(pack_games(batch), actions, mask, rewards, outcomes)
+    transitions = buffer.gather(indices[::-1])
+
+    assert len(buffer) == 4
+    assert np.array_equal(transitions.actions, actions[::-1])
+    assert np.array_equal(transitions.legal_masks, mask[::-1])
+    assert np.array_equal(transitions.rewards, rewards[::-1])
+    assert np.array_equal(transitions.outcomes, outcomes[::-1])
+    assert np.array_equal(
+        unpack_games(transitions.states).factories, batch.factories[::-1]
+    )
+
+
+def test_ring_overwrites_oldest() -> None:
+    """Tests that a full buffer overwrites its oldest transitions."""
+    buffer = ReplayBuffer(20)
+    _append_steps(buffer, 3, 0)
+
+    assert len(buffer) == 20
+    # The third append of eight wrapped around to the first four records.
+    actions = buffer.gather(np.arange(20)).actions
+    indices = buffer.append(
+        pack_games(BatchGame.new(1, 2, seed=1)),
+        [7],
+        np.ones((1, action_count(2)), dtype=np.bool_),
+        [[0.0, 0.0]],
+    )
+    assert indices.tolist() == [4]
+    assert buffer.gather([4]).actions[0] == 7
+    assert np.array_equal(buffer.gather(np.arange(4)).actions, actions[:4])
+
+
+def test_set_outcomes() -> None:
+    """Tests that outcomes can be set after the transitions were appended."""
+    buffer = ReplayBuffer(16)
+    _append_steps(buffer, 1, 2)
+
+    buffer.set_outcomes([1, 3], [[5.0, 6.0], [7.0, 8.0]])
+
+    outcomes = buffer.gather([0, 1, 3]).outcomes
+    assert outcomes.tolist() == [[0.0, 0.0], [5.0, 6.0], [7.0, 8.0]]
+
+
+def test_uniform_sampling() -> None:
+    """Tests that uniform samples only hold stored transitions."""
+    buffer = ReplayBuffer(64)
+    rng = np.random.default_rng(0)
+    with pytest.raises(ValueError):
+        buffer.sample(4, rng)
+
+    _append_steps(buffer, 2, 3)
+    indices = buffer.sample(1000, rng)
+
+    assert set(indices.tolist()) == set(range(16))
+
+
+def test_prioritized_sampling() -> None:
+    """Tests that transitions are sampled in proportion to their
+    priorities."""
+    buffer = ReplayBuffer(10)
+    _append_steps(buffer, 1, 4)
+    priorities = np.array([0.0, 1.0, 3.0, 0.0, 0.0, 0.0, 0.0, 4.0])
+    buffer.update_priorities(np.arange(8), priorities)
+
+    indices, probabilities = buffer.sample_prioritized(
+        20000, np.random.default_rng(1)
+    )
+
+    frequencies = np.bincount(indices, minlength=8) / len(indices)
+    assert np.allclose(frequencies, priorities / 8.0, atol=0.02)
+    assert np.allclose(probabilities, priorities[indices] / 8.0)
+
+
+def test_memory_mapped(tmp_path: Path) -> None:
+    """Tests that a memory-mapped buffer is reopened with its transitions."""
+    path = tmp_path / "replay.npy"
+    buffer = ReplayBuffer(12, path=path)
+    _append_steps(buffer, 2, 5)
+    buffer.update_priorities([0], [9.0])
+    buffer.flush()
+    expected = buffer.gather(np.arange(12))
+    del buffer
+
+    reopened = ReplayBuffer(12, path=path)
+
+    assert len(reopened) == 12
+    transitions = reopened.gather(np.arange(12))
+    assert np.array_equal(transitions.actions, expected.actions)
+    assert np.array_equal(transitions.states, expected.states)
+    # Appends continue after the most recent record.
+    assert reopened.append(
+        expected.states[:1],
+        expected.actions[:1],
+        expected.legal_masks[:1],
+        expected.rewards[:1],
+    ).tolist() == [4]
+    indices, _ = reopened.sample_prioritized(10, np.random.default_rng(0))
+    assert len(indices) == 10
+
+    with pytest.raises(ValueError):
+        ReplayBuffer(13, path=path)
+
+
+def test_prioritized_sampling_edge_cases() -> None:
+    """Tests that prioritized sampling rejects an empty buffer and returns
+    empty samples for a count of zero."""
+    buffer = ReplayBuffer(10)
+    rng = np.random.default_rng(0)
+    with pytest.raises(ValueError):
+        buffer.sample_prioritized(4, rng)
+
+    _append_steps(buffer, 1, 5)
+    indices, probabilities = buffer.sample_prioritized(0, rng)
+
+    assert indices.shape == (0,) and indices.dtype == np.int64
+    assert probabilities.shape == (0,) and probabilities.dtype == np.float32
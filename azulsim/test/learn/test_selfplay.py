@@ -0,0 +1,89 @@
+"""Contains unit tests for the azulsim.learn.selfplay module."""
+
+from pathlib import Path
+
+import numpy as np
+
+from azulsim.batch import action_count, feature_count
+from azulsim.bots import RandomBot
+from azulsim.learn import (
+    MANIFEST_NAME,
+    generate_selfplay,
+    load_shards,
+    read_manifest,
+)
+
+
+def test_shards(tmp_path: Path) -> None:
+    """Tests that every game is written to a shard listed in the
+    manifest."""
+    shards = generate_selfplay(
+        tmp_path, 5, RandomBot, workers=2, games_per_shard=2
+    )
+
+    assert sorted(shard.first_game for shard in shards) == [0, 2, 4]
+    assert sum(shard.game_count for shard in shards) == 5
+    for shard, arrays in zip(shards, load_shards(tmp_path)):
+        moves = shard.move_count
+        assert arrays["observations"].shape == (moves, feature_count(2))
+        assert arrays["policies"].shape == (moves, action_count(2))
+        assert np.all(arrays["policies"].sum(1) == 1.0)
+        assert np.all(arrays["legal_masks"][arrays["policies"] > 0])
+        games = arrays["games"]
+        assert set(games.tolist()) == set(
+            range(shard.first_game, shard.first_game + shard.game_count)
+        )
+        for game in set(games.tolist()):
+            scores = arrays["scores"][games == game]
+            assert np.all(scores == scores[0])
+
+
+def test_resume(tmp_path: Path) -> None:
+    """Tests that running again only plays the shards missing from the
+    manifest."""
+    generate_selfplay(tmp_path, 2, RandomBot, workers=1, games_per_shard=2)
+    first = read_manifest(tmp_path)
+
+    shards = generate_selfplay(
+        tmp_path, 4, RandomBot, workers=1, games_per_shard=2
+    )
+
+    assert shards[0] == first[0]
+    assert [shard.first_game for shard in shards] == [0, 2]
+
+
+def test_torn_manifest_line(tmp_path: Path) -> None:
+    """Tests that a manifest line torn by an interruption is ignored and
+    that its shard is played again."""
+    generate_selfplay(tmp_path, 4, RandomBot, workers=1, games_per_shard=2)
+    manifest = tmp_path / MANIFEST_NAME
+    lines = manifest.read_text().splitlines(keepends=True)
+    manifest.write_text(lines[0] + lines[1][: len(lines[1]) // 2])
+
+    assert len(read_manifest(tmp_path)) == 1
+
+    shards = generate_selfplay(
+        tmp_path, 4, RandomBot, workers=1, games_per_shard=2
+    )
+
+    assert sorted(shard.first_game for shard in shards) == [0, 2]
+    assert manifest.read_text().count("\n") == 2
+
+
+def test_independent_of_workers(tmp_path: Path) -> None:
+    """Tests that the games played do not depend on the number of
+    workers."""
+    runs = []
+    for workers in (1, 2):
+        directory = tmp_path / str(workers)
+        generate_selfplay(
+            directory, 3, RandomBot, workers=workers, games_per_shard=1, seed=4
+        )
+        shards = sorted(
+            zip(read_manifest(directory), load_shards(directory)),
+            key=lambda pair: pair[0].first_game,
+        )
+        runs.append([arrays["policies"].argmax(1) for _, arrays in shards])
+
+    for first, second in zip(*runs):
+        assert np.array_equal(first, second)
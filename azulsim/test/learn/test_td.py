@@ -0,0 +1,32 @@
+"""Contains unit tests for the azulsim.learn.td module."""
+
+import numpy as np
+
+from azulsim.eval import NTupleNetwork
+from azulsim.learn import TDLearner
+
+
+def test_training_stats() -> None:
+    """Tests that training reports the games it played and updates the
+    weights."""
+    network = NTupleNetwork.new()
+
+    stats = TDLearner(network, player_count=3, seed=0).train(4)
+
+    assert stats.games == 4
+    assert stats.positions > 4 * 3 * 5
+    assert stats.mean_score >= 0.0 and stats.mean_error > 0.0
+    assert stats.games_per_second > 0.0
+    assert np.count_nonzero(network.weights) > 0
+    assert np.all(np.isfinite(network.weights))
+
+
+def test_play_improves() -> None:
+    """Tests that training raises the scores of self-play games."""
+    learner = TDLearner(NTupleNetwork.new(), seed=1)
+
+    first = learner.train(40)
+    learner.train(80)
+    last = learner.train(40)
+
+    assert last.mean_score > first.mean_score + 3.0
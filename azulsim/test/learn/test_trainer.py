@@ -0,0 +1,64 @@
+"""Contains unit tests for the azulsim.learn.trainer module."""
+
+import numpy as np
+import pytest
+
+from azulsim.batch import decode_action
+from azulsim.learn import ActorCriticTrainer, PolicyValueModel, TrainerConfig
+
+
+def test_training_stats() -> None:
+    """Tests that training reports the steps and updates it ran."""
+    model = PolicyValueModel.new(3, hidden=16, seed=0)
+    initial = {name: value.copy() for name, value in model.parameters.items()}
+    config = TrainerConfig(game_count=16, rollout_steps=4)
+
+    stats = ActorCriticTrainer(model, config, seed=0).train(30)
+
+    assert stats.steps == 30 * 4 * 16
+    assert stats.updates == 30
+    assert stats.games > 0
+    assert stats.steps_per_second > 0 and stats.updates_per_second > 0
+    assert np.isfinite(stats.value_loss) and stats.entropy > 0
+    for name, value in model.parameters.items():
+        assert np.all(np.isfinite(value))
+        assert not np.array_equal(value, initial[name])
+
+
+def test_requires_opponents() -> None:
+    """Tests that a model of single-player games is rejected."""
+    model = PolicyValueModel.new(1, hidden=8, seed=0)
+
+    with pytest.raises(ValueError):
+        ActorCriticTrainer(model)
+
+
+def test_policy_improves() -> None:
+    """Tests that training raises the scores of self-play games."""
+    model = PolicyValueModel.new(2, hidden=32, seed=1)
+    config = TrainerConfig(game_count=128, learning_rate=3e-3)
+    trainer = ActorCriticTrainer(model, config, seed=1)
+
+    first = trainer.train(20)
+    trainer.train(40)
+    last = trainer.train(20)
+
+    assert last.mean_score > first.mean_score + 1.0
+
+
+def test_rollout_actions_match_observations() -> None:
+    """Tests that every action of a rollout takes a color shown in the pool
+    of its observation."""
+    model = PolicyValueModel.new(3, hidden=16, seed=2)
+    config = TrainerConfig(game_count=32, rollout_steps=8)
+    trainer = ActorCriticTrainer(model, config, seed=2)
+
+    trainer._rollout()
+
+    pools = trainer._observations[..., 3 * 58 : 3 * 58 + 5 * 5].reshape(
+        8, 32, 5, 5
+    )
+    for step in range(8):
+        for game, action in enumerate(trainer._actions[step].tolist()):
+            pool, color, _ = decode_action(action)
+            assert pools[step, game, pool, color] > 0
@@ -0,0 +1,122 @@
+"""Contains unit tests for the azulsim.search.accounting module."""
+
+from collections import Counter
+import itertools
+
+import pytest
+
+from azulsim.bots import RandomBot
+from azulsim.core import FactoryOffer, GameEnd, RoundSetup, WallTiling, new_game
+from azulsim.search.accounting import (
+    TileTracker,
+    draw_supply,
+    factory_distribution,
+    factory_probability,
+    tile_distribution,
+)
+from azulsim.search.position import COLORS, play_move
+from azulsim.search.rounds import Supply
+
+
+def _tiles(counts: tuple[int, ...]) -> list[int]:
+    return [color for color, count in enumerate(counts) for _ in range(count)]
+
+
+def _enumerate_draws(
+    supply: Supply, factory_count: int, color: int
+) -> tuple[Counter[int], Counter[int], int]:
+    factories: Counter[int] = Counter()
+    tiles: Counter[int] = Counter()
+    total = 0
+    slots = factory_count * 4
+    for bag in itertools.permutations(_tiles(supply.bag)):
+        for discard in itertools.permutations(_tiles(supply.discard)):
+            drawn = list(bag[:slots])
+            if len(drawn) < slots:
+                drawn.extend(discard[: slots - len(drawn)])
+            groups = [drawn[i : i + 4] for i in range(0, slots, 4)]
+            factories[sum(color in group for group in groups)] += 1
+            tiles[drawn.count(color)] += 1
+            total += 1
+
+    return factories, tiles, total
+
+
+@pytest.mark.parametrize("player_count, seed", [(2, 0), (3, 1), (4, 2)])
+def test_tracker_matches_engine(player_count: int, seed: int) -> None:
+    """Tests that the tracked supply matches the bag and discard over a whole game."""
+    bot = RandomBot(seed)
+    tracker = TileTracker.new()
+    game: FactoryOffer | WallTiling | RoundSetup | GameEnd = new_game(
+        player_count=player_count, seed=seed
+    )
+    assert isinstance(game, FactoryOffer)
+    tracker.round_setup(game)
+    assert tracker.supply == Supply.from_state(game.state)
+
+    while not isinstance(game, GameEnd):
+        match game:
+            case FactoryOffer():
+                game = play_move(game, bot.select_move(game))
+            case WallTiling():
+                tracker.wall_tiling(game)
+                game = game.tile_boards()
+                assert tracker.supply == Supply.from_state(game.state)
+            case RoundSetup():
+                game = game.round_setup()
+                tracker.round_setup(game)
+                assert tracker.supply == Supply.from_state(game.state)
+
+
+def test_draw_supply_refills_bag() -> None:
+    """Tests that drawing more tiles than the bag holds empties the discard into the bag."""
+    supply = Supply(bag=(1, 1, 0, 0, 0), discard=(2, 0, 3, 0, 0))
+
+    assert draw_supply(supply, (1, 1, 0, 0, 0)) == Supply(
+        bag=(0, 0, 0, 0, 0), discard=(2, 0, 3, 0, 0)
+    )
+    assert draw_supply(supply, (2, 1, 1, 0, 0)) == Supply(
+        bag=(1, 0, 2, 0, 0), discard=(0, 0, 0, 0, 0)
+    )
+
+
+@pytest.mark.parametrize(
+    "supply, factory_count",
+    [
+        (Supply(bag=(2, 1, 2, 1, 0), discard=(0, 0, 0, 0, 0)), 1),
+        (Supply(bag=(1, 0, 2, 0, 0), discard=(1, 2, 0, 1, 1)), 2),
+        (Supply(bag=(1, 1, 0, 0, 0), discard=(1, 0, 1, 1, 0)), 2),
+    ],
+)
+def test_distributions_match_enumeration(
+    supply: Supply, factory_count: int
+) -> None:
+    """Tests that the draw distributions match an enumeration of every draw order."""
+    for color in range(len(COLORS)):
+        factories, tiles, total = _enumerate_draws(supply, factory_count, color)
+
+        assert factory_distribution(supply, factory_count, color) == (
+            pytest.approx(
+                [factories[n] / total for n in range(factory_count + 1)]
+            )
+        )
+        assert tile_distribution(supply, factory_count, color) == (
+            pytest.approx(
+                [tiles[n] / total for n in range(factory_count * 4 + 1)]
+            )
+        )
+
+
+def test_factory_probability() -> None:
+    """Tests the probability of a color appearing in at least a number of factory displays."""
+    supply = Supply(bag=(20, 20, 20, 20, 20), discard=(0, 0, 0, 0, 0))
+    distribution = factory_distribution(supply, 5, 0)
+
+    assert factory_probability(supply, 5, 0, 0) == pytest.approx(1.0)
+    assert factory_probability(supply, 5, 0, 2) == pytest.approx(
+        sum(distribution[2:])
+    )
+    assert factory_probability(supply, 5, 0, 6) == 0.0
+
+    missing = Supply(bag=(0, 20, 20, 20, 20), discard=(5, 0, 0, 0, 0))
+    assert factory_probability(missing, 5, 0, 1) == 0.0
@@ -0,0 +1,133 @@
+"""Contains unit tests for the azulsim.search.alphabeta module."""
+
+import time
+
+import pytest
+
+from azulsim.core import new_game
+from azulsim.search.alphabeta import (
+    AlphaBetaSearcher,
+    RoundScoreEvaluator,
+    SearchMode,
+)
+from azulsim.search.position import (
+    Position,
+    apply_move,
+    legal_moves,
+)
+from azulsim.search.solver import RoundSolver, margin
+from azulsim.search.timing import Deadline
+from azulsim.test.games import late_round_game
+
+
+def _margin(values: tuple[float, ...], player: int) -> float:
+    return values[player] - max(values[:player] + values[player + 1 :])
+
+
+def _paranoid(position: Position, depth: int, player: int) -> float:
+    moves = legal_moves(position)
+    if depth == 0 or not moves:
+        evaluator = RoundScoreEvaluator()
+        return _margin(evaluator.root(position), player)
+
+    values = [
+        _paranoid(apply_move(position, move), depth - 1, player)
+        for move in moves
+    ]
+    return max(values) if position.to_move == player else min(values)
+
+
+def _max_n(position: Position, depth: int) -> tuple[float, ...]:
+    moves = legal_moves(position)
+    if depth == 0 or not moves:
+        return RoundScoreEvaluator().root(position)
+
+    outcomes = [_max_n(apply_move(position, move), depth - 1) for move in moves]
+    return max(outcomes, key=lambda values: _margin(values, position.to_move))
+
+
+def test_evaluator_child_matches_root() -> None:
+    """Tests that the incremental accumulator matches one computed from scratch."""
+    position = Position.from_game(late_round_game(3, seed=0, tiles_left=12))
+    evaluator = RoundScoreEvaluator()
+    accumulator = evaluator.root(position)
+
+    for move in legal_moves(position):
+        child = evaluator.child(accumulator, position, move)
+        assert child == evaluator.root(apply_move(position, move))
+
+
+@pytest.mark.parametrize("player_count, seed", [(2, 0), (3, 1), (4, 2)])
+def test_paranoid_matches_minimax(player_count: int, seed: int) -> None:
+    """Tests that the pruned paranoid search returns the plain minimax value."""
+    position = Position.from_game(
+        late_round_game(player_count, seed, tiles_left=9)
+    )
+    searcher = AlphaBetaSearcher(mode=SearchMode.PARANOID)
+
+    result = searcher.search(position, max_depth=3)
+
+    expected = _paranoid(position, 3, position.to_move)
+    assert result.depth == 3
+    assert _margin(result.values, position.to_move) == expected
+    assert (
+        _paranoid(apply_move(position, result.move), 2, position.to_move)
+        == expected
+    )
+
+
+@pytest.mark.parametrize("player_count, seed", [(3, 3), (4, 4)])
+def test_max_n_matches_plain_search(player_count: int, seed: int) -> None:
+    """Tests that the max-n search returns the values of a plain max-n search."""
+    position = Position.from_game(
+        late_round_game(player_count, seed, tiles_left=9)
+    )
+    searcher = AlphaBetaSearcher(mode=SearchMode.MAX_N)
+
+    result = searcher.search(position, max_depth=3)
+
+    expected = _max_n(position, 3)
+    assert _margin(result.values, position.to_move) == _margin(
+        expected, position.to_move
+    )
+
+
+def test_full_depth_matches_solver() -> None:
+    """Tests that a search to the end of the round finds the solver's best margin."""
+    game = late_round_game(2, seed=5, tiles_left=8)
+    position = Position.from_game(game)
+    results = RoundSolver().solve(position)
+    best = max(margin(deltas, position.to_move) for deltas in results.values())
+
+    result = AlphaBetaSearcher().search(position)
+
+    scores = [board.score for board in position.boards]
+    other = 1 - position.to_move
+    assert margin(results[result.move], position.to_move) == best
+    assert _margin(result.values, position.to_move) == (
+        best + scores[position.to_move] - scores[other]
+    )
+    assert result.depth <= position.tile_count()
+
+
+def test_search_returns_by_deadline() -> None:
+    """Tests that a search stops at its deadline with a legal move."""
+    position = Position.from_game(new_game(player_count=4, seed=0))
+    searcher = AlphaBetaSearcher()
+
+    start = time.monotonic()
+    result = searcher.search(position, deadline=Deadline.after(0.2))
+
+    assert time.monotonic() - start < 0.4
+    assert result.move in legal_moves(position)
+    assert result.depth < position.tile_count()
+
+
+def test_search_without_moves() -> None:
+    """Tests that searching a position without legal moves raises an error."""
+    position = Position.from_game(new_game(player_count=2, seed=0))._replace(
+        factories=(), center=(0,) * 5, center_marker=False
+    )
+
+    with pytest.raises(ValueError):
+        AlphaBetaSearcher().search(position)
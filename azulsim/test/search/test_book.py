@@ -0,0 +1,69 @@
+"""Contains unit tests for the azulsim.search.book module."""
+
+from pathlib import Path
+
+from azulsim.bots import GreedyBot
+from azulsim.core import FactoryOffer, new_game
+from azulsim.search.book import (
+    OpeningBook,
+    build_opening_book,
+    configuration_count,
+    configuration_rank,
+    is_opening,
+    opening_configurations,
+    opening_position,
+    sampled_configurations,
+)
+from azulsim.search.position import Position, legal_moves, play_move
+
+
+def test_configuration_ranks_are_dense() -> None:
+    """Tests that configurations are ranked onto consecutive integers."""
+    ranks = [
+        configuration_rank(factories)
+        for factories in opening_configurations(player_count=2)
+    ]
+
+    assert configuration_count(2) == 59640
+    assert sorted(ranks) == list(range(configuration_count(2)))
+
+
+def test_new_game_is_opening() -> None:
+    """Tests that only the first move of a game is recognized as an opening."""
+    game = new_game(player_count=3, seed=0)
+    position = Position.from_game(game)
+
+    assert is_opening(position)
+    assert position == opening_position(position.factories)
+
+    next_game = play_move(game, legal_moves(position)[0])
+    assert isinstance(next_game, FactoryOffer)
+    assert not is_opening(Position.from_game(next_game))
+
+
+def test_build_and_probe(tmp_path: Path) -> None:
+    """Tests that a built book returns the selected move of every stored configuration."""
+    path = tmp_path / "openings.bin"
+    bot = GreedyBot()
+    configurations = {
+        2: list(sampled_configurations(2, 20, seed=0)),
+        4: list(sampled_configurations(4, 5, seed=1)),
+    }
+
+    count = build_opening_book(path, configurations, bot.choose)
+
+    assert count == len(set(configurations[2])) + len(set(configurations[4]))
+    with OpeningBook.open(path) as book:
+        assert book.player_counts() == (2, 4)
+        for factories in configurations[2] + configurations[4]:
+            position = opening_position(factories)
+            assert book.probe(position) == bot.choose(position)
+
+        missing = next(
+            factories
+            for factories in opening_configurations(2)
+            if factories not in configurations[2]
+        )
+        assert book.probe(opening_position(missing)) is None
+        three_players = Position.from_game(new_game(player_count=3, seed=0))
+        assert book.probe(three_players) is None
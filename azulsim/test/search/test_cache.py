@@ -0,0 +1,160 @@
+"""Contains unit tests for the azulsim.search.cache module."""
+
+import multiprocessing
+from pathlib import Path
+import pickle
+
+import pytest
+
+from azulsim.search.cache import EvaluationCache
+from azulsim.search.position import CENTER, Move
+
+
+def _store_range(cache: EvaluationCache, keys: range) -> None:
+    for key in keys:
+        cache.store(key, (float(key), -float(key)), depth=1)
+    cache.close()
+
+
+def test_lookup_missing(tmp_path: Path) -> None:
+    """Tests that looking up a state which was never stored returns None."""
+    with EvaluationCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.lookup(12345) is None
+
+
+def test_store_and_lookup(tmp_path: Path) -> None:
+    """Tests that a stored entry can be looked up with the same key."""
+    with EvaluationCache(tmp_path / "cache.sqlite") as cache:
+        cache.store(12345, (1.5, -2.0, 3.25), depth=4, move=Move(CENTER, 4, 2))
+
+        entry = cache.lookup(12345)
+        assert entry is not None
+        assert entry.values == (1.5, -2.0, 3.25)
+        assert entry.depth == 4
+        assert entry.move == Move(CENTER, 4, 2)
+
+
+def test_full_64_bit_keys(tmp_path: Path) -> None:
+    """Tests that keys using the highest bit are stored and kept apart."""
+    high = (1 << 64) - 1
+    with EvaluationCache(tmp_path / "cache.sqlite") as cache:
+        cache.store(high, (1.0,))
+        cache.store(high >> 1, (2.0,))
+
+        assert cache.lookup(high) == ((1.0,), 0, None)
+        assert cache.lookup(high >> 1) == ((2.0,), 0, None)
+
+
+def test_shallower_store_ignored(tmp_path: Path) -> None:
+    """Tests that an entry is not replaced by a shallower search."""
+    with EvaluationCache(tmp_path / "cache.sqlite") as cache:
+        cache.store(1, (5.0,), depth=4)
+        cache.store(1, (1.0,), depth=2)
+        cache.store(2, (5.0,), depth=2)
+        cache.store(2, (1.0,), depth=4)
+
+        assert cache.lookup(1) == ((5.0,), 4, None)
+        assert cache.lookup(2) == ((1.0,), 4, None)
+        assert len(cache) == 2
+
+
+def test_persists_across_opens(tmp_path: Path) -> None:
+    """Tests that entries and capacity are kept when the file is reopened."""
+    path = tmp_path / "cache.sqlite"
+    with EvaluationCache(path, capacity=10) as cache:
+        cache.store(7, (7.0,), depth=3)
+
+    with EvaluationCache(path, capacity=99) as cache:
+        assert cache.capacity == 10
+        assert cache.lookup(7) == ((7.0,), 3, None)
+
+
+def test_size_bounded(tmp_path: Path) -> None:
+    """Tests that the number of entries never exceeds the capacity."""
+    with EvaluationCache(tmp_path / "cache.sqlite", capacity=8) as cache:
+        for key in range(50):
+            cache.store(key, (float(key),))
+            assert len(cache) == min(key + 1, 8)
+
+        stored = sum(cache.lookup(key) is not None for key in range(50))
+        assert stored == 8
+        assert cache.lookup(49) is not None
+
+
+def test_recently_used_kept(tmp_path: Path) -> None:
+    """Tests that an entry looked up since the clock hand passed it survives
+    eviction over unreferenced entries."""
+    with EvaluationCache(tmp_path / "cache.sqlite", capacity=4) as cache:
+        for key in range(4):
+            cache.store(key, (float(key),))
+        # The first eviction sweeps the clock once, clearing every bit.
+        cache.store(4, (4.0,))
+        cache.lookup(1)
+
+        cache.store(5, (5.0,))
+        cache.store(6, (6.0,))
+
+        assert cache.lookup(1) is not None
+        assert cache.lookup(0) is None
+        assert cache.lookup(2) is None
+
+
+def test_evict_after_wrap(tmp_path: Path) -> None:
+    """Tests that eviction succeeds when every entry is referenced after the
+    clock hand wraps around."""
+    with EvaluationCache(tmp_path / "cache.sqlite", capacity=2) as cache:
+        for key in (10, 20, 30):
+            cache.store(key, (float(key),))
+        cache.lookup(20)
+        for key in (5, 6, 7):
+            cache.store(key, (float(key),))
+
+        assert len(cache) == 2
+        assert cache.lookup(7) is not None
+
+
+def test_clear(tmp_path: Path) -> None:
+    """Tests that clearing the cache removes every entry."""
+    with EvaluationCache(tmp_path / "cache.sqlite") as cache:
+        cache.store(1, (1.0,))
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.lookup(1) is None
+
+
+def test_invalid_capacity(tmp_path: Path) -> None:
+    """Tests that a cache must have room for at least one entry."""
+    with pytest.raises(ValueError):
+        EvaluationCache(tmp_path / "cache.sqlite", capacity=0)
+
+
+def test_pickle_reopens(tmp_path: Path) -> None:
+    """Tests that an unpickled cache reads the same file."""
+    with EvaluationCache(tmp_path / "cache.sqlite") as cache:
+        cache.store(3, (3.0,))
+
+        with pickle.loads(pickle.dumps(cache)) as copy:
+            assert copy.lookup(3) == ((3.0,), 0, None)
+
+
+def test_concurrent_processes(tmp_path: Path) -> None:
+    """Tests that entries stored by several processes are all kept."""
+    path = tmp_path / "cache.sqlite"
+    with EvaluationCache(path, capacity=1000) as cache:
+        processes = [
+            multiprocessing.Process(
+                target=_store_range,
+                args=(cache, range(index * 50, (index + 1) * 50)),
+            )
+            for index in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+
+        assert len(cache) == 200
+        for key in range(200):
+            assert cache.lookup(key) == ((float(key), -float(key)), 1, None)
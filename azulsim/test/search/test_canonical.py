@@ -0,0 +1,83 @@
+"""Contains unit tests for the azulsim.search.canonical module."""
+
+import random
+
+from azulsim.bots import RandomBot
+from azulsim.core import FactoryOffer, new_game
+from azulsim.core.factory import FactoryDisplay, FactoryDisplays
+from azulsim.core.tiles import TileBag
+from azulsim.search.canonical import canonical_state, state_hash, state_key
+from azulsim.search.position import Position, legal_moves, play_move
+
+
+def _mid_round_game(seed: int) -> FactoryOffer:
+    bot = RandomBot(seed)
+    game = new_game(player_count=3, seed=seed)
+    for _ in range(2):
+        next_game = play_move(game, bot.select_move(game))
+        assert isinstance(next_game, FactoryOffer)
+        game = next_game
+
+    return game
+
+
+def _shuffled(game: FactoryOffer, seed: int) -> None:
+    rng = random.Random(seed)
+    state = game.state
+    factories = list(state.factory_displays)
+    rng.shuffle(factories)
+    state.factory_displays = FactoryDisplays.new(
+        FactoryDisplay.new(rng.sample(factory.tiles, 4))
+        for factory in factories
+    )
+    state.table_center = state.table_center.__class__.new(
+        rng.sample(state.table_center.tiles, len(state.table_center.tiles))
+    )
+    state.bag = TileBag.new(rng.sample(state.bag.tiles, len(state.bag.tiles)))
+
+
+def test_equivalent_states_share_canonical_form() -> None:
+    """Tests that states differing in pool and tile order have the same key and hash."""
+    game = _mid_round_game(seed=0)
+    shuffled = _mid_round_game(seed=0)
+    _shuffled(shuffled, seed=1)
+    to_move = game.next_board_index()
+
+    assert state_key(game.state, to_move) == state_key(shuffled.state, to_move)
+    assert state_hash(game.state, to_move) == state_hash(
+        shuffled.state, to_move
+    )
+
+    canonical = canonical_state(game.state)
+    canonical_shuffled = canonical_state(shuffled.state)
+    assert canonical.factory_displays == canonical_shuffled.factory_displays
+    assert canonical.table_center == canonical_shuffled.table_center
+    assert canonical.bag == canonical_shuffled.bag
+    assert state_key(canonical, to_move) == state_key(game.state, to_move)
+
+
+def test_different_states_have_different_hashes() -> None:
+    """Tests that hashes tell apart states which differ in the turn or the tiles."""
+    game = _mid_round_game(seed=0)
+    to_move = game.next_board_index()
+    hashes = {
+        state_hash(game.state),
+        state_hash(game.state, to_move),
+        state_hash(game.state, (to_move + 1) % 3),
+        state_hash(_mid_round_game(seed=1).state, to_move),
+    }
+
+    assert len(hashes) == 4
+
+
+def test_canonical_state_is_playable() -> None:
+    """Tests that the canonical state accepts the same moves as the original state."""
+    game = _mid_round_game(seed=2)
+    canonical = FactoryOffer.new(canonical_state(game.state))
+    position = Position.from_game(game)._replace(
+        to_move=canonical.next_board_index()
+    )
+
+    assert Position.from_game(canonical) == position
+    for move in legal_moves(position):
+        play_move(FactoryOffer.new(canonical_state(game.state)), move)
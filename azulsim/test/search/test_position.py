@@ -0,0 +1,164 @@
+"""Contains unit tests for the azulsim.search.position module."""
+
+import random
+
+import pytest
+
+from azulsim.core import FactoryOffer, new_game
+from azulsim.core.board import Board
+from azulsim.core.phases import factory_offer
+from azulsim.search.position import (
+    BoardPosition,
+    CENTER,
+    FLOOR_LINE,
+    NO_MOVE,
+    Move,
+    Position,
+    apply_move,
+    engine_move,
+    legal_moves,
+    phase_end,
+    pack_move,
+    play_move,
+    position_hash,
+    unpack_move,
+)
+
+
+def _engine_accepts(game: FactoryOffer, move: Move) -> bool:
+    tile_pool, color, line_index = engine_move(game.state, move)
+    result = factory_offer.select_tiles(
+        game.state.factory_displays, game.state.table_center, tile_pool, color
+    )
+    if result is None:
+        return False
+
+    board = game.state.boards[game.next_board_index()]
+    return (
+        factory_offer.place_tiles(board, line_index, result.tiles) is not None
+    )
+
+
+def test_board_position_round_trip() -> None:
+    """Tests that a compact board converted to a board and back is unchanged."""
+    board = BoardPosition(
+        lines=((1, 2), (0, -1), (2, 4), (0, -1), (5, 0)),
+        wall=0b10000_00000_00100_00000_00011,
+        floor=(1, 0, 0, 2, 0),
+        marker=True,
+        score=12,
+    )
+
+    assert BoardPosition.from_board(board.to_board()) == board
+
+
+@pytest.mark.parametrize("player_count", [1, 2, 3, 4])
+def test_moves_match_engine(player_count: int) -> None:
+    """Tests that generated moves are accepted by the factory offer phase and lead to the same position."""
+    rng = random.Random(player_count)
+    game = new_game(player_count=player_count, seed=player_count)
+    assert isinstance(game, FactoryOffer)
+
+    position = Position.from_game(game)
+    while not phase_end(position):
+        moves = legal_moves(position)
+        if not moves:
+            break
+        assert all(_engine_accepts(game, move) for move in moves)
+
+        move = rng.choice(moves)
+        next_position = apply_move(position, move)
+        next_game = play_move(game, move)
+
+        assert Position.from_state(next_game.state, next_position.to_move) == (
+            next_position
+        )
+        if not isinstance(next_game, FactoryOffer):
+            assert phase_end(next_position)
+            break
+
+        assert next_game.next_board_index() == next_position.to_move
+        game, position = next_game, next_position
+
+
+def test_identical_factories_generate_moves_once() -> None:
+    """Tests that factories with identical contents only generate moves once."""
+    board = BoardPosition.from_board(Board.default())
+    position = Position(
+        factories=((4, 0, 0, 0, 0), (4, 0, 0, 0, 0)),
+        center=(0, 0, 0, 0, 0),
+        center_marker=True,
+        boards=(board, board),
+        to_move=0,
+    )
+
+    moves = legal_moves(position)
+
+    assert moves == [Move(0, 0, line) for line in range(FLOOR_LINE + 1)]
+
+
+def test_center_move_takes_marker() -> None:
+    """Tests that the first move from the table center moves the starting player marker to the floor line."""
+    board = BoardPosition.from_board(Board.default())
+    position = Position(
+        factories=(),
+        center=(0, 2, 0, 0, 1),
+        center_marker=True,
+        boards=(board, board),
+        to_move=1,
+    )
+
+    next_position = apply_move(position, Move(CENTER, 1, 0))
+
+    assert next_position.center == (0, 0, 0, 0, 1)
+    assert not next_position.center_marker
+    assert next_position.to_move == 0
+    moved_board = next_position.boards[1]
+    assert moved_board.lines[0] == (1, 1)
+    assert moved_board.floor == (0, 1, 0, 0, 0)
+    assert moved_board.marker
+    assert moved_board.floor_count() == 2
+
+
+def test_position_hash() -> None:
+    """Tests that equal positions have equal 64-bit hashes."""
+    game = new_game(player_count=2, seed=0)
+    position = Position.from_game(game)
+    copied = Position.from_state(game.state, game.next_board_index())
+
+    assert position_hash(position) == position_hash(copied)
+    assert 0 <= position_hash(position) < 1 << 64
+
+
+def test_floor_line_move() -> None:
+    """Tests that a move to the floor line places every tile on the floor line."""
+    board = BoardPosition.from_board(Board.default())
+    position = Position(
+        factories=((0, 0, 3, 1, 0),),
+        center=(0, 0, 0, 0, 0),
+        center_marker=True,
+        boards=(board, board),
+        to_move=0,
+    )
+
+    next_position = apply_move(position, Move(0, 2, FLOOR_LINE))
+
+    assert next_position.center == (0, 0, 0, 1, 0)
+    assert next_position.boards[0].lines == board.lines
+    assert next_position.boards[0].floor == (0, 0, 3, 0, 0)
+
+
+def test_pack_move() -> None:
+    """Tests that packed moves fit in 16 bits and unpack to the same move."""
+    moves = [
+        Move(pool, color, line)
+        for pool in range(CENTER, 9)
+        for color in range(5)
+        for line in range(FLOOR_LINE + 1)
+    ]
+
+    for move in moves:
+        assert 0 <= pack_move(move) < NO_MOVE
+        assert unpack_move(pack_move(move)) == move
+    assert pack_move(None) == NO_MOVE
+    assert unpack_move(NO_MOVE) is None
@@ -0,0 +1,114 @@
+"""Contains unit tests for the azulsim.search.rounds module."""
+
+import random
+
+import pytest
+
+from azulsim.core import (
+    FactoryOffer,
+    GameEnd,
+    RoundSetup,
+    WallTiling,
+    new_game,
+)
+from azulsim.core.board import (
+    Board,
+    FloorLine,
+    GameScore,
+    PatternLines,
+    Wall,
+)
+from azulsim.core.phases import end_of_game
+from azulsim.search.position import (
+    BoardPosition,
+    COLORS,
+    Position,
+    legal_moves,
+    play_move,
+)
+from azulsim.search.rounds import (
+    Supply,
+    final_scores,
+    game_end,
+    score_bonuses,
+    setup_round,
+    tile_boards,
+)
+
+
+@pytest.mark.parametrize("player_count, seed", [(2, 0), (3, 1), (4, 2)])
+def test_rounds_match_engine(player_count: int, seed: int) -> None:
+    """Tests that wall tiling and end of game scoring match the core phases over whole games."""
+    rng = random.Random(seed)
+    game = new_game(player_count=player_count, seed=seed)
+    rounds = 0
+    while isinstance(game, FactoryOffer) and rounds < 8:
+        position = Position.from_game(game)
+        moves = legal_moves(position)
+        if not moves:
+            break
+        next_game = play_move(game, rng.choice(moves))
+        if not isinstance(next_game, WallTiling):
+            game = next_game
+            continue
+
+        final_position = Position.from_game(game)
+        position = Position.from_state(
+            next_game.state, (final_position.to_move + 1) % player_count
+        )
+        supply = Supply.from_state(next_game.state)
+        boards, supply, starting = tile_boards(position, supply)
+
+        tiled_game = next_game.tile_boards()
+        expected = Position.from_state(tiled_game.state, 0)
+        assert boards == expected.boards
+        assert supply == Supply.from_state(tiled_game.state)
+        assert starting == tiled_game.state.boards.starting_board_index
+        assert game_end(boards) == isinstance(tiled_game, GameEnd)
+
+        if isinstance(tiled_game, GameEnd):
+            final_state = tiled_game.score_bonuses()
+            assert final_scores(boards) == tuple(
+                board.score_track.score for board in final_state.boards.boards
+            )
+            break
+
+        assert isinstance(tiled_game, RoundSetup)
+        game = tiled_game.round_setup()
+        rounds += 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_score_bonuses_matches_engine(seed: int) -> None:
+    """Tests that bonuses for randomly populated walls match the end of game phase."""
+    rng = random.Random(seed)
+    spaces = [(line, color) for line in range(5) for color in COLORS]
+    populated = rng.sample(spaces, rng.randrange(10, len(spaces) + 1))
+    wall = Wall.with_populated(populated)
+
+    board = Board.new(
+        GameScore.default(),
+        PatternLines.default(),
+        FloorLine.default(),
+        wall,
+    )
+
+    expected = end_of_game.score_bonuses(wall, GameScore.default())
+
+    assert score_bonuses(BoardPosition.from_board(board).wall) == (
+        expected.score
+    )
+
+
+def test_setup_round_refills_bag() -> None:
+    """Tests that round setup empties the discard into the bag when the bag runs out."""
+    board = BoardPosition.from_board(Board.default())
+    supply = Supply(bag=(1, 0, 1, 0, 0), discard=(0, 20, 0, 0, 0))
+
+    position, supply = setup_round((board, board), 1, supply, random.Random(0))
+
+    assert len(position.factories) == 3
+    assert all(sum(factory) == 4 for factory in position.factories)
+    assert position.center_marker
+    assert position.to_move == 1
+    assert supply == Supply(bag=(0, 10, 0, 0, 0), discard=(0, 0, 0, 0, 0))
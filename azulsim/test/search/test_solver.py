@@ -0,0 +1,125 @@
+"""Contains unit tests for the azulsim.search.solver module."""
+
+
+import multiprocessing
+
+import pytest
+
+from azulsim.core import WallTiling
+from azulsim.search.position import (
+    Position,
+    apply_move,
+    legal_moves,
+    play_move,
+)
+from azulsim.search.solver import RoundSolver, margin, solve_round
+from azulsim.search.transposition import SharedTranspositionTable
+from azulsim.test.games import late_round_game
+
+
+def _minimax(
+    solver: RoundSolver, position: Position, player: int
+) -> tuple[int, ...]:
+    moves = legal_moves(position)
+    if not moves:
+        return solver.round_deltas(position)
+
+    outcomes = [
+        _minimax(solver, apply_move(position, move), player) for move in moves
+    ]
+    if position.to_move == player:
+        return max(outcomes, key=lambda deltas: margin(deltas, player))
+    return min(outcomes, key=lambda deltas: margin(deltas, player))
+
+
+def _solve_shared(table: SharedTranspositionTable, position: Position) -> None:
+    RoundSolver(shared=table).solve(position)
+    table.close()
+
+
+def test_margin() -> None:
+    """Tests that the margin is relative to the best opponent."""
+    assert margin((3, 5, 1), 0) == -2
+    assert margin((3, 5, 1), 1) == 2
+    assert margin((4,), 0) == 4
+
+
+@pytest.mark.parametrize(
+    "player_count, seed", [(2, 0), (2, 1), (2, 2), (3, 3), (4, 4)]
+)
+def test_solve_matches_minimax(player_count: int, seed: int) -> None:
+    """Tests that the pruned search returns the same margins as a plain minimax search."""
+    game = late_round_game(player_count, seed, tiles_left=6)
+    position = Position.from_game(game)
+    player = position.to_move
+    solver = RoundSolver()
+
+    results = solver.solve(position)
+
+    assert set(results) == set(legal_moves(position))
+    for move, deltas in results.items():
+        expected = _minimax(solver, apply_move(position, move), player)
+        assert margin(deltas, player) == margin(expected, player)
+
+
+def test_solve_round_end() -> None:
+    """Tests that the deltas of moves ending the round match the wall tiling phase."""
+    results = solve_round(late_round_game(2, seed=1, tiles_left=2))
+
+    assert len(results) > 0
+    for move, deltas in results.items():
+        game = late_round_game(2, seed=1, tiles_left=2)
+        scores = [board.score_track.score for board in game.state.boards.boards]
+        wall_tiling = play_move(game, move)
+        assert isinstance(wall_tiling, WallTiling)
+
+        round_setup = wall_tiling.tile_boards()
+        tiled_scores = [
+            board.score_track.score for board in round_setup.state.boards.boards
+        ]
+        assert deltas == tuple(
+            tiled - score for tiled, score in zip(tiled_scores, scores)
+        )
+
+
+def test_best_move() -> None:
+    """Tests that the best move maximizes the margin of the board to move."""
+    game = late_round_game(2, seed=6, tiles_left=8)
+    position = Position.from_game(game)
+    solver = RoundSolver()
+
+    results = solver.solve(position)
+    best = solver.best_move(position)
+
+    assert best is not None
+    best_margin = margin(results[best], position.to_move)
+    assert all(
+        margin(deltas, position.to_move) <= best_margin
+        for deltas in results.values()
+    )
+
+
+def test_shared_table_between_processes() -> None:
+    """Tests that a solver reuses the results another process stored in a shared table."""
+    context = multiprocessing.get_context("spawn")
+    table = SharedTranspositionTable.create(1 << 16, context=context)
+    position = Position.from_game(late_round_game(2, seed=6, tiles_left=8))
+    player = position.to_move
+    worker = context.Process(  # type: ignore[attr-defined]
+        target=_solve_shared, args=(table, position)
+    )
+    worker.start()
+    worker.join()
+
+    plain = RoundSolver()
+    expected = plain.solve(position)
+    solver = RoundSolver(shared=table)
+    results = solver.solve(position)
+    table.close()
+    table.unlink()
+
+    assert solver.shared_hits > 0
+    assert solver.nodes < plain.nodes
+    assert set(results) == set(expected)
+    for move, deltas in results.items():
+        assert margin(deltas, player) == margin(expected[move], player)
@@ -0,0 +1,107 @@
+"""Contains unit tests for the azulsim.search.tablebase module."""
+
+from pathlib import Path
+
+import pytest
+
+from azulsim.search.position import (
+    Position,
+    apply_move,
+    legal_moves,
+)
+from azulsim.search.solver import RoundSolver, margin
+from azulsim.search.tablebase import Tablebase, build_tablebase, round_key
+from azulsim.test.games import late_round_game
+
+
+def test_round_key_ignores_floor_colors_and_high_scores() -> None:
+    """Tests that the round key ignores state which does not change round-end deltas."""
+    position = Position.from_game(late_round_game(2, seed=0, tiles_left=6))
+    board = position.boards[0]._replace(score=20)
+    position = position._replace(boards=(board, position.boards[1]))
+    changed = position._replace(
+        boards=(
+            board._replace(floor=tuple(reversed(board.floor)), score=40),
+            position.boards[1],
+        )
+    )
+    other = position._replace(to_move=1 - position.to_move)
+
+    assert round_key(position) == round_key(changed)
+    assert round_key(position) != round_key(other)
+
+
+@pytest.mark.parametrize("player_count, seed", [(2, 1), (3, 2)])
+def test_probe_matches_solver(
+    tmp_path: Path, player_count: int, seed: int
+) -> None:
+    """Tests that every stored position holds the outcome computed by the solver."""
+    root = Position.from_game(late_round_game(player_count, seed, tiles_left=6))
+    path = tmp_path / "endings.tb"
+
+    count = build_tablebase(path, [root], max_tiles=4)
+
+    solver = RoundSolver()
+    probed = 0
+    with Tablebase.open(path) as tablebase:
+        assert len(tablebase) == count
+        pending = [root]
+        while pending:
+            position = pending.pop()
+            moves = legal_moves(position)
+            pending.extend(apply_move(position, move) for move in moves)
+
+            entry = tablebase.probe(position)
+            if not moves or position.tile_count() > 4:
+                assert entry is None
+                continue
+
+            assert entry is not None
+            probed += 1
+            results = solver.solve(position)
+            best = max(
+                margin(deltas, position.to_move) for deltas in results.values()
+            )
+            assert entry.move in results
+            assert margin(entry.deltas, position.to_move) == best
+
+    assert probed > 0
+
+
+def test_solver_with_tablebase(tmp_path: Path) -> None:
+    """Tests that a solver probing a tablebase returns the same margins as one without."""
+    root = Position.from_game(late_round_game(2, seed=3, tiles_left=8))
+    path = tmp_path / "endings.tb"
+    build_tablebase(path, [root], max_tiles=5)
+
+    expected = RoundSolver().solve(root)
+    with Tablebase.open(path) as tablebase:
+        solver = RoundSolver(tablebase=tablebase)
+        results = solver.solve(root)
+
+    assert results.keys() == expected.keys()
+    for move, deltas in results.items():
+        assert margin(deltas, root.to_move) == margin(
+            expected[move], root.to_move
+        )
+
+
+def test_probe_verifies_records(tmp_path: Path) -> None:
+    """Tests that a record whose verification hash does not match the
+    position is treated as a miss."""
+    root = Position.from_game(late_round_game(2, seed=0, tiles_left=4))
+    path = tmp_path / "endings.tb"
+    build_tablebase(path, [root], max_tiles=4)
+    with Tablebase.open(path) as tablebase:
+        assert tablebase.probe(root) is not None
+
+    # Flips the verification hash of every record, as if each record had
+    # been written for another position with the same 64-bit hash.
+    data = bytearray(path.read_bytes())
+    for offset in range(32, len(data), 20):
+        if any(data[offset : offset + 8]):
+            data[offset + 8] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with Tablebase.open(path) as tablebase:
+        assert tablebase.probe(root) is None
@@ -0,0 +1,79 @@
+"""Contains unit tests for the azulsim.search.timing module."""
+
+import time
+
+import pytest
+
+from azulsim.core import new_game
+from azulsim.search.position import Position, wall_bit
+from azulsim.search.timing import (
+    Deadline,
+    TimeManager,
+    moves_left,
+    moves_left_in_round,
+    rounds_left,
+)
+
+
+def test_deadline() -> None:
+    """Tests that a deadline expires after the given number of seconds."""
+    deadline = Deadline.after(0.05)
+
+    assert not deadline.expired()
+    assert 0.0 < deadline.remaining() <= 0.05
+
+    time.sleep(0.06)
+
+    assert deadline.expired()
+    assert deadline.remaining() == 0.0
+    assert deadline.elapsed() >= 0.05
+
+
+def test_moves_left_at_game_start() -> None:
+    """Tests the estimated number of moves left at the start of a game."""
+    position = Position.from_game(new_game(player_count=2, seed=0))
+
+    assert moves_left_in_round(position) == 4
+    assert rounds_left(position) == 5
+    assert moves_left(position) == 20
+
+
+def test_rounds_left_uses_fullest_wall_line() -> None:
+    """Tests that the number of rounds left shrinks as a wall line fills."""
+    position = Position.from_game(new_game(player_count=2, seed=0))
+    wall = sum(wall_bit(2, color) for color in range(4))
+    board = position.boards[1]._replace(wall=wall)
+    position = position._replace(boards=(position.boards[0], board))
+
+    assert rounds_left(position) == 1
+
+
+def test_time_manager_budget() -> None:
+    """Tests that the time manager splits the clock across the moves left."""
+    position = Position.from_game(new_game(player_count=2, seed=0))
+    manager = TimeManager(50.0, increment=1.0, overhead=0.0)
+
+    assert manager.budget(position) == pytest.approx(50.0 / 20 + 1.0)
+
+    manager.remaining = 1.0
+    assert manager.budget(position) == pytest.approx(0.5)
+
+
+def test_time_manager_clock() -> None:
+    """Tests that stopping the clock deducts the elapsed time and adds the increment."""
+    position = Position.from_game(new_game(player_count=2, seed=0))
+    manager = TimeManager(10.0, increment=0.5)
+
+    deadline = manager.start(position)
+    with pytest.raises(ValueError):
+        manager.start(position)
+    time.sleep(0.01)
+    elapsed = manager.stop()
+
+    assert elapsed >= 0.01
+    assert deadline.end - deadline.start == pytest.approx(
+        10.0 / 20 + 0.5 - 0.01
+    )
+    assert manager.remaining == pytest.approx(10.0 - elapsed + 0.5)
+    with pytest.raises(ValueError):
+        manager.stop()
@@ -0,0 +1,103 @@
+"""Contains unit tests for the azulsim.search.transposition module."""
+
+import multiprocessing
+from typing import Generator
+
+import pytest
+
+from azulsim.search.position import CENTER, Move
+from azulsim.search.transposition import SharedTranspositionTable
+
+
+@pytest.fixture
+def table() -> Generator[SharedTranspositionTable, None, None]:
+    table = SharedTranspositionTable.create(capacity=64, stripes=4)
+    yield table
+    table.close()
+    table.unlink()
+
+
+def _add_visits(
+    table: SharedTranspositionTable, keys: range, repeats: int
+) -> None:
+    for _ in range(repeats):
+        for key in keys:
+            table.store(key, 0.0, 1.0, depth=1, visits=1)
+    table.close()
+
+
+def test_probe_missing(table: SharedTranspositionTable) -> None:
+    """Tests that probing a position which was never stored returns None."""
+    assert table.probe(12345) is None
+
+
+def test_store_and_probe(table: SharedTranspositionTable) -> None:
+    """Tests that a stored record can be probed with the same key."""
+    move = Move(CENTER, 4, 2)
+    table.store(12345, -3.0, 5.0, depth=4, move=move)
+
+    entry = table.probe(12345)
+
+    assert entry is not None
+    assert (entry.lower, entry.upper) == (-3.0, 5.0)
+    assert entry.depth == 4
+    assert entry.visits == 1
+    assert entry.move == move
+
+
+def test_store_keeps_deeper_bounds(table: SharedTranspositionTable) -> None:
+    """Tests that bounds from a deeper search are not replaced by shallower ones."""
+    table.store(7, 1.0, 2.0, depth=6, move=Move(1, 0, 0))
+    table.store(7, -9.0, 9.0, depth=2)
+
+    entry = table.probe(7)
+
+    assert entry is not None
+    assert (entry.lower, entry.upper) == (1.0, 2.0)
+    assert entry.depth == 6
+    assert entry.visits == 2
+    assert entry.move == Move(1, 0, 0)
+
+
+def test_replacement_prefers_old_generation(
+    table: SharedTranspositionTable,
+) -> None:
+    """Tests that a full bucket replaces records of an earlier generation first."""
+    buckets = 64 // 4
+    keys = [1 + bucket * buckets for bucket in range(4)]
+    table.store(keys[0], 0.0, 0.0, depth=9)
+    table.new_generation()
+    for key in keys[1:]:
+        table.store(key, 0.0, 0.0, depth=1)
+
+    table.store(1 + 4 * buckets, 0.0, 0.0, depth=1)
+
+    assert table.probe(keys[0]) is None
+    assert all(table.probe(key) is not None for key in keys[1:])
+    assert table.probe(1 + 4 * buckets) is not None
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_concurrent_writers(start_method: str) -> None:
+    """Tests that visits stored concurrently from several processes are not lost."""
+    context = multiprocessing.get_context(start_method)
+    table = SharedTranspositionTable.create(64, stripes=4, context=context)
+    keys = range(1, 9)
+    workers = [
+        context.Process(  # type: ignore[attr-defined]
+            target=_add_visits, args=(table, keys, 50)
+        )
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    for key in keys:
+        entry = table.probe(key)
+        assert entry is not None
+        assert entry.visits == 200
+
+    table.close()
+    table.unlink()
@@ -0,0 +1,50 @@
+"""Contains unit tests for the azulsim.sim.many module."""
+
+import numpy as np
+import pytest
+
+from azulsim.bots import RandomBot
+from azulsim.sim import play_game, simulate_many
+
+
+def test_matches_single_games() -> None:
+    """Tests that the columns hold the results of each game."""
+    seeds = [4, 9, 2]
+
+    results = simulate_many(seeds, [RandomBot, RandomBot], record_moves=True)
+
+    assert results.seeds.tolist() == seeds
+    assert results.scores.shape == (3, 2)
+    assert results.walls.shape == (3, 2, 5, 5)
+    assert results.moves is not None and results.move_offsets is not None
+    for index, seed in enumerate(seeds):
+        record = play_game(
+            seed, [RandomBot(seed * 2), RandomBot(seed * 2 + 1)], True
+        )
+        assert results.scores[index].tolist() == list(record.scores)
+        assert results.rounds[index] == record.rounds
+        for board_index, wall in enumerate(record.walls):
+            bits = results.walls[index, board_index].reshape(-1)
+            assert sum(1 << int(bit) for bit in np.flatnonzero(bits)) == wall
+        start, stop = results.move_offsets[index : index + 2]
+        assert [tuple(move) for move in results.moves[start:stop]] == [
+            tuple(move) for move in record.moves or ()
+        ]
+
+
+def test_workers() -> None:
+    """Tests that results do not depend on the number of workers."""
+    seeds = list(range(10))
+
+    single = simulate_many(seeds, [RandomBot] * 3)
+    pooled = simulate_many(seeds, [RandomBot] * 3, workers=2)
+
+    assert single.moves is None
+    for name in ("seeds", "scores", "rounds", "walls"):
+        assert np.array_equal(getattr(single, name), getattr(pooled, name))
+
+
+def test_policy_count() -> None:
+    """Tests that every seat must have a policy."""
+    with pytest.raises(ValueError):
+        simulate_many([0], [RandomBot], player_count=2)
@@ -0,0 +1,47 @@
+"""Contains unit tests for the azulsim.sim.threads module."""
+
+from azulsim.bots import BotFactory, GreedyBot, RandomBot
+from azulsim.search.rounds import score_bonuses
+from azulsim.sim import play_game, run_games
+
+
+def test_play_game() -> None:
+    """Tests that a game is played to its end."""
+    record = play_game(3, [RandomBot(0), RandomBot(1)], record_moves=True)
+
+    assert record.seed == 3
+    assert record.rounds >= 5
+    assert record.moves is not None and len(record.moves) >= 5 * 5
+    # The game ends once a wall has a complete line.
+    assert any(
+        (wall >> (line * 5)) & 0b11111 == 0b11111
+        for wall in record.walls
+        for line in range(5)
+    )
+    assert all(
+        score >= score_bonuses(wall)
+        for score, wall in zip(record.scores, record.walls)
+    )
+
+
+def test_independent_of_threads() -> None:
+    """Tests that results do not depend on the number of threads."""
+    seeds = list(range(12))
+    factories: list[BotFactory] = [
+        RandomBot,
+        lambda seed: GreedyBot(temperature=1.0, seed=seed),
+    ]
+
+    single = run_games(seeds, factories, threads=1, record_moves=True)
+    pooled = run_games(seeds, factories, threads=6, record_moves=True)
+
+    assert single == pooled
+    assert [record.seed for record in pooled] == seeds
+
+
+def test_concurrent_games_share_no_state() -> None:
+    """Tests that games with the same seed played concurrently are
+    identical."""
+    records = run_games([5] * 16, [RandomBot] * 3, threads=8)
+
+    assert all(record == records[0] for record in records)